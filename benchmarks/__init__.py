@@ -0,0 +1,128 @@
+"""Micro-benchmarks for Reinhard's hot paths.
+
+Run these with `python -m benchmarks`, see `python -m benchmarks --help` for the available options.
+
+Each run is compared against the results stored in `benchmarks/baseline.json`. Timings are only comparable on the
+same machine, so regenerate the baseline locally with `python -m benchmarks --save-baseline` from the commit you
+want to compare against before benchmarking a change.
+"""
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["Benchmark", "BenchmarkResult", "as_benchmark", "BENCHMARKS", "compare", "run"]
+
+import platform
+import statistics
+import sys
+import time
+import timeit
+import typing
+
+SetupT = typing.Callable[..., typing.Callable[[], typing.Any]]
+
+
+class Benchmark:
+    __slots__: typing.Sequence[str] = ("group", "name", "number", "parameters", "setup")
+
+    def __init__(
+        self, group: str, name: str, setup: SetupT, /, *, number: int, parameters: typing.Mapping[str, typing.Any]
+    ) -> None:
+        self.group = group
+        self.name = name
+        self.number = number
+        self.parameters = parameters
+        self.setup = setup
+
+    @property
+    def full_name(self) -> str:
+        parameters = ",".join(f"{key}={value}" for key, value in self.parameters.items())
+        return f"{self.group}.{self.name}[{parameters}]" if parameters else f"{self.group}.{self.name}"
+
+
+class BenchmarkResult:
+    __slots__: typing.Sequence[str] = ("best", "median", "name", "number", "repeat")
+
+    def __init__(self, name: str, /, *, best: float, median: float, number: int, repeat: int) -> None:
+        self.best = best
+        self.median = median
+        self.name = name
+        self.number = number
+        self.repeat = repeat
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {"best": self.best, "median": self.median, "number": self.number, "repeat": self.repeat}
+
+
+BENCHMARKS: typing.List[Benchmark] = []
+
+
+def as_benchmark(
+    group: str,
+    /,
+    *,
+    number: int = 1_000,
+    parameters: typing.Optional[typing.Mapping[str, typing.Iterable[typing.Any]]] = None,
+) -> typing.Callable[[SetupT], SetupT]:
+    """Register a benchmark setup function.
+
+    The decorated function is called (with each combination of `parameters` as keyword arguments) to get the
+    callable which will be timed, this lets any setup cost be kept out of the timings.
+    """
+
+    def decorator(setup: SetupT, /) -> SetupT:
+        combinations: typing.List[typing.Dict[str, typing.Any]] = [{}]
+        for key, values in (parameters or {}).items():
+            combinations = [{**combination, key: value} for combination in combinations for value in values]
+
+        for combination in combinations:
+            BENCHMARKS.append(Benchmark(group, setup.__name__, setup, number=number, parameters=combination))
+
+        return setup
+
+    return decorator
+
+
+def run(
+    benchmarks: typing.Iterable[Benchmark], /, *, repeat: int = 5, scale: float = 1.0
+) -> typing.Iterator[BenchmarkResult]:
+    """Run benchmarks, yielding the per-call timings (in seconds) for each of them."""
+    for benchmark in benchmarks:
+        callback = benchmark.setup(**benchmark.parameters)
+        number = max(1, round(benchmark.number * scale))
+        timings = [timing / number for timing in timeit.Timer(callback).repeat(repeat=repeat, number=number)]
+        yield BenchmarkResult(
+            benchmark.full_name, best=min(timings), median=statistics.median(timings), number=number, repeat=repeat
+        )
+
+
+def environment() -> typing.Dict[str, typing.Any]:
+    return {
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "timestamp": time.time(),
+    }
+
+
+def compare(
+    results: typing.Mapping[str, typing.Mapping[str, float]],
+    baseline: typing.Mapping[str, typing.Mapping[str, float]],
+    /,
+) -> typing.Dict[str, float]:
+    """Get the ratio of each result's best timing to its baseline's best timing.
+
+    Values above `1.0` mean the benchmark has gotten slower.
+    """
+    return {
+        name: result["best"] / baseline[name]["best"]
+        for name, result in results.items()
+        if name in baseline and baseline[name]["best"]
+    }
+
+
+def load_all() -> None:
+    # These are imported here as registering benchmarks is a side effect of importing their modules.
+    from benchmarks import bench_cache  # noqa: F401 - Unused import
+    from benchmarks import bench_help  # noqa: F401 - Unused import
+    from benchmarks import bench_ratelimiter  # noqa: F401 - Unused import
+    from benchmarks import bench_util  # noqa: F401 - Unused import
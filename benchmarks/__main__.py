@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import pathlib
+import sys
+import typing
+
+import benchmarks
+
+DEFAULT_BASELINE: typing.Final[pathlib.Path] = pathlib.Path(__file__).parent / "baseline.json"
+
+
+def _parse_args(args: typing.Optional[typing.Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run Reinhard's micro-benchmarks.")
+    parser.add_argument("-k", "--filter", default="*", help="A glob pattern used to select benchmarks by name.")
+    parser.add_argument("-o", "--output", type=pathlib.Path, default=None, help="Where to write the JSON results.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="How many times to repeat each benchmark.")
+    parser.add_argument(
+        "-s", "--scale", type=float, default=1.0, help="A multiplier for how many calls are made per repeat."
+    )
+    parser.add_argument(
+        "-b", "--baseline", type=pathlib.Path, default=DEFAULT_BASELINE, help="The baseline results to compare against."
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Overwrite the baseline with these results rather than comparing."
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="How much slower (as a fraction) a benchmark can get before it's reported as a regression.",
+    )
+    parser.add_argument("--list", action="store_true", help="List the available benchmarks and exit.")
+    return parser.parse_args(args)
+
+
+def main(args: typing.Optional[typing.Sequence[str]] = None) -> int:
+    namespace = _parse_args(args)
+    benchmarks.load_all()
+    selected = [
+        benchmark for benchmark in benchmarks.BENCHMARKS if fnmatch.fnmatchcase(benchmark.full_name, namespace.filter)
+    ]
+
+    if namespace.list:
+        print("\n".join(benchmark.full_name for benchmark in selected))
+        return 0
+
+    results: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+    for result in benchmarks.run(selected, repeat=namespace.repeat, scale=namespace.scale):
+        results[result.name] = result.to_dict()
+        print(f"{result.name}: {result.best * 1_000_000:.3f} µs (median {result.median * 1_000_000:.3f} µs)")
+
+    output = {"environment": benchmarks.environment(), "results": results}
+    if namespace.output:
+        namespace.output.write_text(json.dumps(output, indent=4))
+
+    if namespace.save_baseline:
+        namespace.baseline.write_text(json.dumps(output, indent=4))
+        return 0
+
+    if not namespace.baseline.exists():
+        print(f"No baseline found at {namespace.baseline}, skipping comparison", file=sys.stderr)
+        return 0
+
+    baseline = json.loads(namespace.baseline.read_text())["results"]
+    regressions = 0
+    print()
+    for name, ratio in benchmarks.compare(results, baseline).items():
+        if ratio > 1 + namespace.threshold:
+            regressions += 1
+            status = "REGRESSED"
+
+        elif ratio < 1 - namespace.threshold:
+            status = "improved"
+
+        else:
+            status = "unchanged"
+
+        print(f"{name}: {ratio:.2f}x baseline ({status})")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
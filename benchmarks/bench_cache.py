@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+import typing
+
+from benchmarks import as_benchmark
+from reinhard.util import cache
+
+
+@as_benchmark("cache", number=10_000, parameters={"size": (10, 1_000, 100_000)})
+def expiring_queue_append(size: int) -> typing.Callable[[], None]:
+    queue: cache.ExpiringQueue[int] = cache.ExpiringQueue(60, max_length=size)
+    for index in range(size):
+        queue.append(index)
+
+    return lambda: queue.append(0)
+
+
+@as_benchmark("cache", number=100, parameters={"size": (10, 1_000, 100_000)})
+def expiring_queue_expire(size: int) -> typing.Callable[[], None]:
+    # Entries are back-dated so they're all expired, this measures dropping the whole queue.
+    origin = [(index, time.monotonic() - 120) for index in range(size)]
+
+    def callback() -> None:
+        cache.ExpiringQueue(60, origin=origin).gc()
+
+    return callback
+
+
+@as_benchmark("cache", number=10_000, parameters={"size": (10, 1_000, 100_000)})
+def expiring_dict_set(size: int) -> typing.Callable[[], None]:
+    mapping: cache.ExpiringDict[int, int] = cache.ExpiringDict(60, max_length=size)
+    for index in range(size):
+        mapping[index] = index
+
+    counter = iter(range(size, 2 ** 63))
+    return lambda: mapping.__setitem__(next(counter), 0)
+
+
+@as_benchmark("cache", number=100, parameters={"size": (10, 1_000, 100_000)})
+def expiring_dict_expire(size: int) -> typing.Callable[[], None]:
+    origin = [(index, (index, time.monotonic() - 120)) for index in range(size)]
+
+    def callback() -> None:
+        cache.ExpiringDict(60, origin=origin).gc()
+
+    return callback
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+
+from benchmarks import as_benchmark
+from reinhard.util import help as help_util
+
+
+class _Command:
+    # A stand-in for tanjun's command which only has what the help utilities use.
+    __slots__: typing.Sequence[str] = ("metadata", "names")
+
+    def __init__(self, name: str) -> None:
+        self.metadata: typing.Dict[str, typing.Any] = {help_util.DOC_FLAG: f"Documentation for {name}. " * 4}
+        self.names = {name}
+
+
+class _Component:
+    __slots__: typing.Sequence[str] = ("commands",)
+
+    def __init__(self, command_count: int) -> None:
+        self.commands = frozenset(_Command(f"command_{index}") for index in range(command_count))
+
+
+help_util.with_component_doc("A component used for benchmarking help generation.")(_Component)
+help_util.with_component_name("Benchmark Component")(_Component)
+
+
+@as_benchmark("help", number=100, parameters={"commands": (5, 50, 500)})
+def generate_help_embeds(commands: int) -> typing.Callable[[], None]:
+    component = _Component(commands)
+    loop = asyncio.new_event_loop()
+
+    async def collect() -> None:
+        result = await help_util.generate_help_embeds(component, prefix="r.")  # type: ignore[arg-type]
+        assert result is not None
+        async for _ in result[1]:
+            pass
+
+    return lambda: loop.run_until_complete(collect())
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import datetime
+import itertools
+import random
+import string
+import typing
+
+from benchmarks import as_benchmark
+from reinhard.util import ratelimiter
+from reinhard.util import similarity
+
+
+class _Message:
+    # A stand-in for hikari's message which only has what MessageCall uses.
+    __slots__: typing.Sequence[str] = ("content",)
+
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+def _random_content(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase + " ", k=length))
+
+
+_BACKENDS: typing.Mapping[str, similarity.AbstractSimilarityBackend[typing.Any]] = {
+    "minhash": similarity.MinHashBackend(),
+    "sequence_matcher": similarity.SequenceMatcherBackend(),
+}
+
+
+@as_benchmark(
+    "ratelimiter",
+    number=100,
+    parameters={"backend": tuple(_BACKENDS), "depth": (1, 10, 50), "length": (20, 200, 2000)},
+)
+def simple_bucket_add_call(backend: str, depth: int, length: int) -> typing.Callable[[], None]:
+    rng = random.Random(0)
+    backend_ = _BACKENDS[backend]
+    contents = [_random_content(rng, length) for _ in range(depth + 1)]
+    calls = [
+        ratelimiter.MessageCall(_Message(content), similarity=backend_)  # type: ignore[arg-type]
+        for content in contents
+    ]
+    new_call = calls.pop()
+    template = ratelimiter.SimpleBucket(datetime.timedelta(seconds=60))
+    # The template's filled during setup so the comparisons between the pre-existing calls aren't timed.
+    for call in calls:
+        template.add_call(call)
+
+    def callback() -> None:
+        bucket = template.copy()
+        bucket.add_call(new_call)
+
+    return callback
+
+
+@as_benchmark("ratelimiter", number=10_000, parameters={"depth": (1, 50)})
+def simple_bucket_level(depth: int) -> typing.Callable[[], int]:
+    bucket = ratelimiter.SimpleBucket(datetime.timedelta(seconds=60))
+    for index in range(depth):
+        bucket.add_call(ratelimiter.MessageCall(_Message(str(index))))  # type: ignore[arg-type]
+
+    return lambda: bucket.level
+
+
+@as_benchmark("ratelimiter", number=10_000, parameters={"entities": (1_000, 100_000)})
+def compact_gcra_pool_add_call(entities: int) -> typing.Callable[[], None]:
+    rng = random.Random(0)
+    pool = ratelimiter.CompactGCRAPool(ratelimiter.GCRARate(5, datetime.timedelta(seconds=60)))
+    ids = [rng.getrandbits(63) + 1 for _ in range(entities)]
+    for entity in ids:
+        pool.add_call(entity)  # type: ignore[arg-type]
+
+    choices = itertools.cycle(rng.choices(ids, k=100_000))
+    return lambda: pool.add_call(next(choices))  # type: ignore[arg-type]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import typing
+
+from hikari import permissions
+
+from benchmarks import as_benchmark
+from reinhard.util import basic
+
+
+@as_benchmark("util", number=10_000, parameters={"flags": ("none", "some", "all")})
+def basic_name_grid(flags: str) -> typing.Callable[[], str]:
+    values = {
+        "none": permissions.Permissions.NONE,
+        "some": permissions.Permissions.SEND_MESSAGES
+        | permissions.Permissions.READ_MESSAGE_HISTORY
+        | permissions.Permissions.ADD_REACTIONS
+        | permissions.Permissions.EMBED_LINKS,
+        "all": ~permissions.Permissions.NONE,
+    }
+    value = values[flags]
+    return lambda: basic.basic_name_grid(value)
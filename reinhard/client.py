@@ -1,26 +1,52 @@
 from __future__ import annotations
 
+import datetime
 import typing
 
 import asyncpg
 from tanjun import clients
+from tanjun import context
 from tanjun import hooks
 
 from reinhard import config as config_
 from reinhard import sql
 from reinhard.components import basic
 from reinhard.components import external
+from reinhard.components import starboard
 from reinhard.components import sudo
 from reinhard.components import util
 from reinhard.util import command_hooks
+from reinhard.util import conversion
+from reinhard.util import member_index as member_index_
+from reinhard.util import prefix_cache as prefix_cache_
+from reinhard.util import prefix_matcher
+from reinhard.util import ratelimiter
+from reinhard.util import reaper as reaper_
+from reinhard.util import role_cache as role_cache_
 
 if typing.TYPE_CHECKING:
+    from hikari import snowflakes
     from hikari import traits as hikari_traits
+    from hikari.events import message_events
     from tanjun import traits as tanjun_traits
 
 
 class Client(clients.Client):
-    __slots__: typing.Sequence[str] = ("_password", "_host", "_user", "_database", "_port", "sql_pool", "sql_scripts")
+    __slots__: typing.Sequence[str] = (
+        "_password",
+        "_host",
+        "_user",
+        "_database",
+        "_port",
+        "command_limiter",
+        "member_index",
+        "_prefix_matcher",
+        "prefix_cache",
+        "reaper",
+        "role_cache",
+        "sql_pool",
+        "sql_scripts",
+    )
 
     def __init__(
         self,
@@ -36,13 +62,24 @@ class Client(clients.Client):
         database: str,
         port: int,
         prefixes: typing.Optional[typing.Iterable[str]] = None,
+        command_limiter: typing.Optional[ratelimiter.CommandLimiter] = None,
     ) -> None:
+        if command_limiter is None:
+            command_limiter = ratelimiter.CommandLimiter(
+                ratelimiter.GCRARate(5, datetime.timedelta(seconds=10)), max_delay=2.0
+            )
+
         super().__init__(
             dispatch,
             rest,
             shard,
             cache,
-            hooks=hooks.Hooks(parser_error=command_hooks.on_parser_error, on_error=command_hooks.on_error),
+            hooks=hooks.Hooks(
+                parser_error=command_hooks.on_parser_error,
+                on_error=command_hooks.on_error,
+                # This is called after a command's been matched but before its arguments are parsed.
+                pre_execution=command_limiter,
+            ),
             prefixes=prefixes,
         )
         self._password = password
@@ -50,24 +87,111 @@ class Client(clients.Client):
         self._user = user
         self._database = database
         self._port = port
+        self.command_limiter = command_limiter
+        self.member_index = member_index_.MemberIndex()
+        self.prefix_cache = prefix_cache_.PrefixCache()
+        self._prefix_matcher = prefix_matcher.PrefixMatcher(self.prefixes)
+        self.reaper = reaper_.TimerWheel()
+        self.reaper.add_callback(self.prefix_cache.check_connection, 30)
+        self.reaper.add_callback(command_limiter.garbage_collect, command_limiter.rate.period)
+        self.role_cache = role_cache_.RoleCache()
+        self.reaper.add_callback(self.role_cache.garbage_collect, 300)
+        self.reaper.add_callback(conversion.garbage_collect, 60)
         self.sql_pool: typing.Optional[asyncpg.pool.Pool] = None
-        self.sql_scripts = sql.CachedScripts(pattern=r"[.*schema.sql]|[*prefix.sql]")
+        self.sql_scripts = sql.CachedScripts()
 
     async def open(self, *, register_listener: bool = True) -> None:
-        self.sql_pool = await asyncpg.create_pool(
-            password=self._password, host=self._host, user=self._user, database=self._database, port=self._port,
+        connect_kwargs = dict(
+            password=self._password, host=self._host, user=self._user, database=self._database, port=self._port
         )
-        async with self.sql_pool.acquire() as conn:
+        # The schema has to exist before the pool's connections can prepare statements against it.
+        conn = await asyncpg.connect(**connect_kwargs)
+        try:
             await sql.initialise_schema(self.sql_scripts, conn)
+        finally:
+            await conn.close()
+
+        self.sql_pool = await asyncpg.create_pool(
+            **connect_kwargs, connection_class=sql.ScriptConnection, init=self.sql_scripts.init_connection
+        )
+        await self.prefix_cache.open(self.sql_pool, self.sql_scripts)
 
+        self.reaper.open()
+        self.member_index.subscribe(self.dispatch_service.dispatcher)
+        self.role_cache.subscribe(self.dispatch_service.dispatcher)
         await super().open()
+        # Tanjun adds the mention prefixes while opening without going through add_prefix.
+        self._prefix_matcher = prefix_matcher.PrefixMatcher(self.prefixes)
+
+    async def close(self, *, deregister_listener: bool = True) -> None:
+        await super().close(deregister_listener=deregister_listener)
+        self.member_index.unsubscribe(self.dispatch_service.dispatcher)
+        self.role_cache.unsubscribe(self.dispatch_service.dispatcher)
+        if self.prefix_cache.is_open:
+            await self.prefix_cache.close()
+
+        if self.reaper.is_alive:
+            await self.reaper.close()
+
+    async def check_prefix(
+        self, content: str, /, *, guild_id: typing.Optional[snowflakes.Snowflake] = None
+    ) -> typing.Optional[str]:
+        # Guild prefixes are checked on top of the global prefixes rather than replacing them.
+        if guild_id is not None and (prefix := self.prefix_cache.get(guild_id)) and content.startswith(prefix):
+            return prefix
+
+        return self._prefix_matcher.match(content)
+
+    def add_prefix(self, prefix: str, /) -> None:
+        super().add_prefix(prefix)
+        self._prefix_matcher = prefix_matcher.PrefixMatcher(self.prefixes)
+
+    def remove_prefix(self, prefix: str, /) -> None:
+        super().remove_prefix(prefix)
+        self._prefix_matcher = prefix_matcher.PrefixMatcher(self.prefixes)
+
+    async def on_message_create(self, event: message_events.MessageCreateEvent) -> None:
+        # This mirrors Tanjun's implementation but passes the guild through to check_prefix.
+        if event.message.content is None:
+            return
+
+        if (prefix := await self.check_prefix(event.message.content, guild_id=event.message.guild_id)) is None:
+            return
+
+        content = event.message.content.lstrip()[len(prefix) :].lstrip()
+        ctx = context.Context(self, content=content, message=event.message, triggering_prefix=prefix)
+
+        if not await self.check(ctx):
+            return
+
+        hooks_ = {self.hooks} if self.hooks else set()
+        for component in self.components:
+            if await component.execute(ctx, hooks=hooks_):
+                break
 
 
 def add_components(client: tanjun_traits.Client, /, *, config: typing.Optional[config_.FullConfig] = None) -> None:
     if config is None:
         config = config_.load_config()
 
+    # External commands hit 3rd party APIs so they get a stricter limit.
+    external_limiter = ratelimiter.CommandLimiter(ratelimiter.GCRARate(3, datetime.timedelta(seconds=30)))
+    if isinstance(client, Client):
+        client.reaper.add_callback(external_limiter.garbage_collect, external_limiter.rate.period)
+
+    external_component = external.ExternalComponent(
+        cache_path=config.cache_path,
+        google_token=config.tokens.google,
+        hooks=hooks.Hooks(pre_execution=external_limiter),
+    )
+    if isinstance(client, Client):
+        client.reaper.add_callback(external_component.response_cache.garbage_collect, 300)
+
     client.add_component(basic.BasicComponent())
-    client.add_component(external.ExternalComponent(google_token=config.tokens.google))
+    client.add_component(external_component)
+    # The starboard relies on the database pool which is only provided by this module's client.
+    if isinstance(client, Client):
+        client.add_component(starboard.StarboardComponent())
+
     client.add_component(sudo.SudoComponent(emoji_guild=config.emoji_guild))
     client.add_component(util.UtilComponent())
@@ -3,8 +3,12 @@ from __future__ import annotations
 __all__: typing.Sequence[str] = ["ExternalComponent"]
 
 import asyncio
+import collections
 import html
 import logging
+import pathlib
+import re
+import time
 import typing
 
 import aiohttp
@@ -18,11 +22,18 @@ from tanjun import parsing
 from yuyo import backoff
 from yuyo import paginaton
 
+from reinhard.util import cache
 from reinhard.util import constants
+from reinhard.util import disk_cache
 from reinhard.util import help as help_util
 from reinhard.util import rest_manager
+from reinhard.util import sessions
+from reinhard.util import single_flight
 
 if typing.TYPE_CHECKING:
+    from hikari import emojis
+    from hikari import snowflakes
+    from hikari import traits as hikari_traits
     from tanjun import traits as tanjun_traits
 
 
@@ -31,80 +42,358 @@ YOUTUBE_TYPES = {
     "youtube#channel": ("channelId", "https://www.youtube.com/channel/"),
     "youtube#playlist": ("playlistId", "https://www.youtube.com/playlist?list="),
 }
+LYRICS_URL: typing.Final[str] = "https://lyrics.tsu.sh/v1"
+MOE_URL: typing.Final[str] = "http://api.cutegirls.moe/json"
+NEKOS_LIFE_URL: typing.Final[str] = "https://nekos.life/api/v2"
+YOUTUBE_SEARCH_FIELDS: typing.Final[str] = "items/id,nextPageToken"
+YOUTUBE_SEARCH_URL: typing.Final[str] = "https://www.googleapis.com/youtube/v3/search"
+_WHITESPACE_PATTERN: typing.Final[typing.Pattern[str]] = re.compile(r"\s+")
+_LOGGER = logging.getLogger("hikari.reinhard.external")
+
+
+class ResponseCache:
+    """A TTL and LRU bound cache of decoded 3rd party API responses.
+
+    Other Parameters
+    ----------------
+    expire_after : int
+        How many seconds responses should be cached for. Defaults to `3600`.
+    max_bytes : int
+        The maximum total size of the raw response bodies of the cached responses. Defaults to 16MiB.
+    max_entries : int
+        The maximum amount of responses to cache. Defaults to `1024`.
+    persist_to : typing.Optional[reinhard.util.disk_cache.DiskCache]
+        A disk cache to persist responses to, this will be loaded from when this cache is opened so cached responses
+        outlive restarts.
+    """
+
+    __slots__: typing.Sequence[str] = ("_disk", "_entries", "hits", "max_bytes", "max_entries", "misses", "_size")
+
+    def __init__(
+        self,
+        *,
+        expire_after: int = 3600,
+        max_bytes: int = 16 * 1024 ** 2,
+        max_entries: int = 1024,
+        persist_to: typing.Optional[disk_cache.DiskCache] = None,
+    ) -> None:
+        self._disk = persist_to
+        self._entries: cache.ExpiringDict[str, typing.Tuple[typing.Any, int]] = cache.ExpiringDict(
+            expire_after, lru=True, max_length=max_entries, on_expire=self._on_expire
+        )
+        self.hits = 0
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.misses = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """The total size of the raw response bodies of the cached responses in bytes."""
+        return self._size
+
+    def _evict(self) -> None:
+        # The entries are kept in LRU order so popitem always returns the least recently used entry. Entries which
+        # expire before then are accounted for by _on_expire.
+        while self._size > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem()
+            self._size -= size
+
+    def _on_expire(self, _: str, value: typing.Tuple[typing.Any, int]) -> None:
+        self._size -= value[1]
+
+    @staticmethod
+    def make_key(
+        url: str,
+        params: typing.Mapping[str, typing.Union[str, int]],
+        /,
+        *,
+        casefold: typing.Collection[str] = ("q",),
+        ignore: typing.Collection[str] = ("key",),
+    ) -> str:
+        """Make a normalised cache key for a request.
+
+        Parameters
+        ----------
+        url : str
+            The request's URL.
+        params : typing.Mapping[str, typing.Union[str, int]]
+            The request's query parameters.
+
+        Other Parameters
+        ----------------
+        casefold : typing.Collection[str]
+            Names of case-insensitive parameters to casefold. Defaults to `("q",)`.
+        ignore : typing.Collection[str]
+            Names of parameters which don't affect the response and should be left out (e.g. API keys).
+            Defaults to `("key",)`.
+        """
+        normalised = []
+        for name, value in sorted(params.items()):
+            if name in ignore:
+                continue
+
+            value = _WHITESPACE_PATTERN.sub(" ", str(value).strip())
+            normalised.append(f"{name}={value.casefold() if name in casefold else value}")
+
+        return url.rstrip("/").lower() + "?" + "&".join(normalised)
+
+    def garbage_collect(self) -> int:
+        """Drop the expired responses, this also queues dropping the disk cache's expired entries."""
+        if self._disk is not None and self._disk.is_open:
+            self._disk.garbage_collect()
+
+        return self._entries.gc()
+
+    def get(self, key: str, /) -> typing.Optional[typing.Any]:
+        try:
+            value = self._entries[key][0]
+
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: typing.Any, size: int, /) -> None:
+        if size > self.max_bytes:
+            return
+
+        if (old := self._entries.pop(key, None)) is not None:
+            self._size -= old[1]
+
+        self._size += size
+        self._entries[key] = (value, size)
+        if self._disk is not None and self._disk.is_open:
+            # The raw body size is stored so the disk cache is capped by the same measure and warms this correctly.
+            self._disk.set(key, value, size=size)
+
+        self._evict()
+
+    async def open(self) -> None:
+        """Open this cache's disk cache (if set) and warm this cache with its unexpired entries."""
+        if self._disk is None:
+            return
+
+        await self._disk.open()
+        expire_after = self._entries.expire_after
+        now = time.monotonic()
+        # Entries are loaded oldest first so the newest entries win when the size limits are hit. This replaces the
+        # in-memory entries as this is only expected to be called before the cache's been used.
+        origin = [
+            (entry.key, ((entry.value, entry.size), now - entry.age))
+            for entry in await self._disk.load()
+            if entry.age < expire_after and entry.size <= self.max_bytes
+        ]
+        self._size = sum(size for _, ((_, size), _) in origin)
+        self._entries = cache.ExpiringDict(
+            expire_after, lru=True, max_length=self.max_entries, on_expire=self._on_expire, origin=origin
+        )
+        self._evict()
+
+    async def close(self) -> None:
+        if self._disk is not None and self._disk.is_open:
+            await self._disk.compact()
+            await self._disk.close()
 
 
 class YoutubePaginator(typing.AsyncIterator[typing.Tuple[str, undefined.UndefinedType]]):
-    __slots__ = ("_buffer", "_client", "next_page_token", "parameters", "user_agent")
+    """Async iterator of the links to a Youtube search's results.
+
+    The next page of results is fetched in the background once the amount of buffered results drops below
+    `watermark`, so moving past a page boundary doesn't have to wait on a request.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_in_flight",
+        "_prefetch",
+        "_response_cache",
+        "_session",
+        "next_page_token",
+        "parameters",
+        "watermark",
+    )
 
-    def __init__(self, parameters: typing.MutableMapping[str, typing.Union[str, int]], user_agent: str) -> None:
-        self._buffer: typing.MutableSequence[typing.Mapping[str, typing.Any]] = []
-        self._client: typing.Optional[aiohttp.ClientSession] = None
-        self.next_page_token: str = ""
-        self.parameters = parameters
-        self.user_agent = user_agent
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        parameters: typing.MutableMapping[str, typing.Union[str, int]],
+        *,
+        in_flight: typing.Optional[single_flight.SingleFlight[str, typing.Any]] = None,
+        response_cache: typing.Optional[ResponseCache] = None,
+        watermark: int = 10,
+    ) -> None:
+        self._buffer: typing.Deque[typing.Mapping[str, typing.Any]] = collections.deque()
+        self._in_flight = in_flight
+        self._prefetch: typing.Optional[asyncio.Task[None]] = None
+        self._response_cache = response_cache
+        self._session = session
+        self.next_page_token: typing.Optional[str] = ""
+        # Only the fields which are actually read are requested to keep the responses small.
+        self.parameters = {"fields": YOUTUBE_SEARCH_FIELDS, **parameters}
+        self.watermark = watermark
 
     def __aiter__(self) -> YoutubePaginator:
         return self
 
-    async def __anext__(self) -> typing.Tuple[str, undefined.UndefinedType]:
-        if self._client is None:
-            self._client = aiohttp.ClientSession(headers={"User-Agent": self.user_agent})
+    async def aclose(self) -> None:
+        """Stop fetching pages and cancel any page being prefetched in the background."""
+        self.next_page_token = None
+        if (prefetch := self._prefetch) is None:
+            return
 
-        if not self.next_page_token and self.next_page_token is not None:
-            retry = backoff.Backoff(max_retries=5)
-            error_manager = rest_manager.AIOHTTPStatusHandler(retry, break_on=(404,))
+        self._prefetch = None
+        prefetch.cancel()
+        try:
+            await prefetch
 
-            params: typing.Mapping[str, typing.Union[str, int]] = {"pageToken": self.next_page_token, **self.parameters}
-            async for _ in retry:
-                with error_manager:
-                    response = await self._client.get("https://www.googleapis.com/youtube/v3/search", params=params,)
-                    response.raise_for_status()
-                    break
+        except asyncio.CancelledError:
+            pass
+
+        except Exception as exc:
+            _LOGGER.debug("Youtube page prefetch failed", exc_info=exc)
+
+    async def _fetch_page(self, params: typing.Mapping[str, typing.Union[str, int]], /) -> typing.Any:
+        retry = backoff.Backoff(max_retries=5)
+        error_manager = rest_manager.AIOHTTPStatusHandler(retry, break_on=(404,), host="www.googleapis.com")
+
+        async for _ in retry:
+            with error_manager:
+                response = await self._session.get(YOUTUBE_SEARCH_URL, params=params,)
+                response.raise_for_status()
+                break
 
-            else:
-                if retry.is_depleted:
-                    raise RuntimeError(f"Youtube request passed max_retries with params:\n {params!r}") from None
+        else:
+            if retry.is_depleted:
+                raise RuntimeError(f"Youtube request passed max_retries with params:\n {params!r}") from None
+
+            return None
+
+        try:
+            data = await response.json()
+        except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError) as exc:
+            raise exc
+
+        if self._response_cache is not None:
+            key = ResponseCache.make_key(YOUTUBE_SEARCH_URL, params)
+            self._response_cache.set(key, data, len(await response.read()))
+
+        return data
+
+    async def _load_page(self) -> None:
+        assert self.next_page_token is not None
+        params: typing.Mapping[str, typing.Union[str, int]] = {"pageToken": self.next_page_token, **self.parameters}
+        key = ResponseCache.make_key(YOUTUBE_SEARCH_URL, params)
+        data = None
+        if self._response_cache is not None:
+            data = self._response_cache.get(key)
+
+        if data is None and self._in_flight is not None:
+            data = await self._in_flight.run(key, lambda: self._fetch_page(params))
 
-                raise StopAsyncIteration from None
+        elif data is None:
+            data = await self._fetch_page(params)
 
-            try:
-                data = await response.json()
-            except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError) as exc:
-                raise exc
+        if data is None:
+            self.next_page_token = None
+            return
 
-            self.next_page_token = data.get("nextPageToken")
-            self._buffer.extend(data["items"])
+        self.next_page_token = data.get("nextPageToken")
+        self._buffer.extend(data["items"])
 
-        if not self._buffer:
-            if self._client:
-                await self._client.close()
+    def _maybe_prefetch(self) -> None:
+        if self.next_page_token and self._prefetch is None and len(self._buffer) < self.watermark:
+            self._prefetch = asyncio.create_task(self._load_page())
 
-            raise StopAsyncIteration
+    async def __anext__(self) -> typing.Tuple[str, undefined.UndefinedType]:
+        while True:
+            if not self._buffer:
+                if self._prefetch is not None:
+                    prefetch = self._prefetch
+                    self._prefetch = None
+                    await prefetch
+
+                elif self.next_page_token is not None:
+                    await self._load_page()
 
-        while self._buffer:
-            page = self._buffer.pop(0)
+                if not self._buffer:
+                    raise StopAsyncIteration
+
+            page = self._buffer.popleft()
+            self._maybe_prefetch()
             if response_type := YOUTUBE_TYPES.get(page["id"]["kind"].lower()):
                 return f"{response_type[1]}{page['id'][response_type[0]]}", undefined.UNDEFINED
 
-        raise RuntimeError(f"Got unexpected 'kind' from youtube {page['id']['kind']}")
+            if not self._buffer and not self.next_page_token and self._prefetch is None:
+                raise RuntimeError(f"Got unexpected 'kind' from youtube {page['id']['kind']}")
+
 
-    def __del__(self) -> None:
-        if self._client is not None:
-            asyncio.ensure_future(self._client.close())
+class _YoutubeResultsPaginator(paginaton.Paginator):
+    """A paginator which closes its `YoutubePaginator` once it's been dropped."""
+
+    __slots__ = ("_results",)
+
+    def __init__(
+        self,
+        rest: hikari_traits.RESTAware,
+        channel: snowflakes.Snowflake,
+        results: YoutubePaginator,
+        *,
+        authors: typing.Iterable[snowflakes.Snowflake],
+    ) -> None:
+        super().__init__(rest, channel, results, authors=authors)
+        self._results = results
+
+    async def close(self, remove_reactions: bool = False) -> None:
+        try:
+            await super().close(remove_reactions=remove_reactions)
+
+        finally:
+            await self._results.aclose()
+
+    async def on_reaction_event(self, emoji: emojis.Emoji, user_id: snowflakes.Snowflake) -> typing.Optional[str]:
+        result = await super().on_reaction_event(emoji, user_id)
+        # Paginator pools drop paginators which return END without closing them.
+        if result == paginaton.END:
+            await self._results.aclose()
+
+        return result
 
 
 @help_util.with_component_name("External Component")
 @help_util.with_component_doc("A utility used for getting data from 3rd party APIs.")
 class ExternalComponent(components.Component):
-    __slots__: typing.Sequence[str] = ("google_token", "logger", "paginator_pool", "user_agent")
+    __slots__: typing.Sequence[str] = (
+        "google_token",
+        "in_flight",
+        "logger",
+        "paginator_pool",
+        "response_cache",
+        "sessions",
+        "user_agent",
+    )
 
     def __init__(
-        self, *, google_token: typing.Optional[str] = None, hooks: typing.Optional[tanjun_traits.Hooks] = None
+        self,
+        *,
+        cache_path: typing.Optional[pathlib.Path] = None,
+        google_token: typing.Optional[str] = None,
+        hooks: typing.Optional[tanjun_traits.Hooks] = None,
     ) -> None:
         super().__init__(hooks=hooks)
         self.google_token = google_token
+        self.in_flight: single_flight.SingleFlight[str, typing.Any] = single_flight.SingleFlight()
         self.logger = logging.Logger("hikari.reinhard.external")
         self.paginator_pool: typing.Optional[paginaton.PaginatorPool] = None
+        self.response_cache = ResponseCache(
+            expire_after=86400, persist_to=disk_cache.DiskCache(cache_path, expire_after=86400) if cache_path else None,
+        )
+        self.sessions = sessions.SessionManager()
         self.user_agent = ""
         youtube_command = next(filter(lambda command: "youtube" in command.names, self.commands))
         youtube_command.add_check(lambda _: bool(self.google_token),)
@@ -118,6 +407,11 @@ class ExternalComponent(components.Component):
         if self.paginator_pool is not None:
             await self.paginator_pool.close()
 
+        if self.sessions.is_open:
+            await self.sessions.close()
+
+        await self.response_cache.close()
+
     async def open(self) -> None:
         if self.client is None or self.paginator_pool is None:
             raise RuntimeError("Cannot open this component without binding a client.")
@@ -144,76 +438,90 @@ class ExternalComponent(components.Component):
             me = await self.client.rest_service.rest.fetch_my_user()
 
         self.user_agent = f"Reinhard discord bot (id:{me.id}; owner:{owner_id})"
+        self.sessions.open(headers={"User-Agent": self.user_agent})
+        await self.response_cache.open()
         await self.paginator_pool.open()
         await super().open()
 
+    async def _request_lyrics(self, query: str, /) -> typing.Any:
+        session = self.sessions.get_session("lyrics.tsu.sh")
+        retry = backoff.Backoff(max_retries=5)
+        error_manager = rest_manager.AIOHTTPStatusHandler(
+            retry, host="lyrics.tsu.sh", on_404=f"Couldn't find the lyrics for `{query[:1960]}`"
+        )
+        async for _ in retry:
+            with error_manager:
+                response = await session.get(LYRICS_URL, params={"q": query})
+                response.raise_for_status()
+                break
+
+        else:
+            raise tanjun_errors.CommandError("Couldn't get the lyrics in time") from None
+
+        try:
+            data = await response.json()
+        except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError):
+            self.logger.debug(
+                "Received unexpected data from lyrics.tsu.sh of type %s\n %s",
+                response.headers.get("Content-Type", "unknown"),
+                await response.text(),
+            )
+            raise
+
+        self.response_cache.set(ResponseCache.make_key(LYRICS_URL, {"q": query}), data, len(await response.read()))
+        return data
+
     @help_util.with_parameter_doc("query", "The required argument of a query to search up a song by.")
     @help_util.with_command_doc("Get a song's lyrics.")
     @parsing.with_greedy_argument("query")
     @parsing.with_parser
     @components.as_command("lyrics")
     async def lyrics(self, ctx: context.Context, query: str) -> None:
-        async with aiohttp.ClientSession(headers={"User-Agent": self.user_agent}) as session:
+        key = ResponseCache.make_key(LYRICS_URL, {"q": query})
+        try:
+            if (data := self.response_cache.get(key)) is None:
+                # Concurrent lookups of the same song share one request.
+                data = await self.in_flight.run(key, lambda: self._request_lyrics(query))
+
+        except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError):
             retry = backoff.Backoff(max_retries=5)
-            error_manager = rest_manager.AIOHTTPStatusHandler(
-                retry, on_404=f"Couldn't find the lyrics for `{query[:1960]}`"
+            hikari_error_manager = rest_manager.HikariErrorManager(
+                retry, break_on=(hikari_errors.NotFoundError, hikari_errors.ForbiddenError)
             )
             async for _ in retry:
-                with error_manager:
-                    response = await session.get("https://lyrics.tsu.sh/v1", params={"q": query})
-                    response.raise_for_status()
+                with hikari_error_manager:
+                    await ctx.message.respond(content="Invalid data returned by server.")
                     break
 
-            else:
-                raise tanjun_errors.CommandError("Couldn't get the lyrics in time") from None
-
-            try:
-                data = await response.json()
-            except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError) as exc:
-                hikari_error_manager = rest_manager.HikariErrorManager(
-                    retry, break_on=(hikari_errors.NotFoundError, hikari_errors.ForbiddenError)
-                )
-                retry.reset()
-
-                async for _ in retry:
-                    with hikari_error_manager:
-                        await ctx.message.respond(content="Invalid data returned by server.")
-                        break
-
-                self.logger.debug(
-                    "Received unexpected data from lyrics.tsu.sh of type %s\n %s",
-                    response.headers.get("Content-Type", "unknown"),
-                    await response.text(),
-                )
-                raise exc
-
-            icon = data["song"].get("icon")
-            title = data["song"]["full_title"]
-            pages = (
-                (
-                    undefined.UNDEFINED,
-                    embeds.Embed(description=html.unescape(page), colour=constants.embed_colour())
-                    .set_footer(text=f"Page {index + 1}")
-                    .set_author(icon=icon, name=html.unescape(title)),
-                )
-                async for page, index in paginaton.string_paginator(iter(data["content"].splitlines() or ["..."]))
-            )
-            response_paginator = paginaton.Paginator(
-                ctx.client.rest_service,
-                ctx.message.channel_id,
-                pages,
-                authors=(ctx.message.author.id,),
-                triggers=(
-                    paginaton.LEFT_DOUBLE_TRIANGLE,
-                    paginaton.LEFT_TRIANGLE,
-                    paginaton.STOP_SQUARE,
-                    paginaton.RIGHT_TRIANGLE,
-                    paginaton.RIGHT_DOUBLE_TRIANGLE,
-                ),
+            raise
+
+        icon = data["song"].get("icon")
+        title = data["song"]["full_title"]
+        pages = (
+            (
+                undefined.UNDEFINED,
+                embeds.Embed(description=html.unescape(page), colour=constants.embed_colour())
+                .set_footer(text=f"Page {index + 1}")
+                .set_author(icon=icon, name=html.unescape(title)),
             )
-            message = await response_paginator.open()
-            assert self.paginator_pool is not None
-            self.paginator_pool.add_paginator(message, response_paginator)
+            async for page, index in paginaton.string_paginator(iter(data["content"].splitlines() or ["..."]))
+        )
+        response_paginator = paginaton.Paginator(
+            ctx.client.rest_service,
+            ctx.message.channel_id,
+            pages,
+            authors=(ctx.message.author.id,),
+            triggers=(
+                paginaton.LEFT_DOUBLE_TRIANGLE,
+                paginaton.LEFT_TRIANGLE,
+                paginaton.STOP_SQUARE,
+                paginaton.RIGHT_TRIANGLE,
+                paginaton.RIGHT_DOUBLE_TRIANGLE,
+            ),
+        )
+        message = await response_paginator.open()
+        assert self.paginator_pool is not None
+        self.paginator_pool.add_paginator(message, response_paginator)
 
     @help_util.with_command_doc("Get a youtube video.")
     @parsing.with_option("safe_search", "--safe", "-s", "--safe-search", converters=(bool,), default=None)
@@ -258,12 +566,16 @@ class ExternalComponent(components.Component):
         if language is not None:
             parameters["relevanceLanguage"] = language
 
-        response_paginator = paginaton.Paginator(
-            ctx.client.rest_service,
-            ctx.message.channel_id,
-            YoutubePaginator(parameters, self.user_agent),
-            authors=[ctx.message.author.id],
+        results = YoutubePaginator(
+            self.sessions.get_session("www.googleapis.com"),
+            parameters,
+            in_flight=self.in_flight,
+            response_cache=self.response_cache,
         )
+        response_paginator = _YoutubeResultsPaginator(
+            ctx.client.rest_service, ctx.message.channel_id, results, authors=[ctx.message.author.id]
+        )
+        added = False
         try:
             message = await response_paginator.open()
             assert message is not None
@@ -293,6 +605,32 @@ class ExternalComponent(components.Component):
         else:
             assert self.paginator_pool is not None
             self.paginator_pool.add_paginator(message, response_paginator)
+            added = True
+
+        finally:
+            # The paginator pool only closes paginators which were added to it.
+            if not added:
+                await results.aclose()
+
+    async def _request_moe(self, params: typing.Mapping[str, str], /) -> typing.Any:
+        source = params.get("source")
+        session = self.sessions.get_session("api.cutegirls.moe")
+        retry = backoff.Backoff(max_retries=5)
+        error_manager = rest_manager.AIOHTTPStatusHandler(
+            retry,
+            host="api.cutegirls.moe",
+            on_404=f"Couldn't find source `{source[:1970]}`" if source is not None else "couldn't access api",
+        )
+        async for _ in retry:
+            with error_manager:
+                response = await session.get(MOE_URL, params=params)
+                response.raise_for_status()
+                break
+
+        else:
+            raise tanjun_errors.CommandError("Couldn't get an image in time") from None
+
+        return (await response.json())["data"]
 
     @help_util.with_parameter_doc("--source | -s", "The optional argument of a show's title.")
     @help_util.with_command_doc("Get a random cute anime image.")
@@ -304,72 +642,86 @@ class ExternalComponent(components.Component):
         if source is not None:
             params["source"] = source
 
-        async with aiohttp.ClientSession(headers={"User-Agent": self.user_agent}) as session:
-            retry = backoff.Backoff(max_retries=5)
-            error_manager = rest_manager.AIOHTTPStatusHandler(
-                retry, on_404=f"Couldn't find source `{source[:1970]}`" if source is not None else "couldn't access api"
-            )
+        retry = backoff.Backoff(max_retries=5)
+        hikari_error_manager = rest_manager.HikariErrorManager(
+            retry, break_on=(hikari_errors.NotFoundError, hikari_errors.ForbiddenError)
+        )
+
+        try:
+            data = await self.in_flight.run(ResponseCache.make_key(MOE_URL, params), lambda: self._request_moe(params))
+        except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, LookupError, ValueError) as exc:
             async for _ in retry:
-                with error_manager:
-                    response = await session.get("http://api.cutegirls.moe/json", params=params)
-                    response.raise_for_status()
+                with hikari_error_manager:
+                    await ctx.message.respond(content="Image API returned invalid data.")
                     break
 
-            else:
-                raise tanjun_errors.CommandError("Couldn't get an image in time") from None
+            raise exc
 
-            hikari_error_manager = rest_manager.HikariErrorManager(
-                retry, break_on=(hikari_errors.NotFoundError, hikari_errors.ForbiddenError)
-            )
-            retry.reset()
+        async for _ in retry:
+            with hikari_error_manager:
+                await ctx.message.respond(content=f"{data['image']} (source {data.get('source') or 'unknown'})")
+                break
+
+    async def _request_nekos_life(self, endpoint: str, /) -> typing.Tuple[int, typing.Any]:
+        # This isn't retried so the circuit breaker's managed directly rather than through AIOHTTPStatusHandler.
+        breaker = rest_manager.get_circuit_breaker("nekos.life")
+        if not breaker.allow_request():
+            raise rest_manager.CircuitOpenError("nekos.life", breaker.retry_after)
 
-            try:
-                data = (await response.json())["data"]
-            except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, LookupError, ValueError) as exc:
-                async for _ in retry:
-                    with hikari_error_manager:
-                        await ctx.message.respond(content="Image API returned invalid data.")
-                        break
+        session = self.sessions.get_session("nekos.life")
+        try:
+            response = await session.get(url=NEKOS_LIFE_URL + endpoint)
 
-                raise exc
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
 
-            async for _ in retry:
-                with hikari_error_manager:
-                    await ctx.message.respond(content=f"{data['image']} (source {data.get('source') or 'unknown'})")
-                    break
+        except BaseException:
+            breaker.release()
+            raise
+
+        if response.status >= 500:
+            breaker.record_failure()
+
+        else:
+            breaker.record_success()
+
+        try:
+            data = await response.json()
+        except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError):
+            data = None
+
+        return response.status, data
 
     async def query_nekos_life(self, endpoint: str, response_key: str, **kwargs: typing.Any) -> str:
-        async with aiohttp.ClientSession(headers={"User-Agent": self.user_agent}) as session:
-            response = await session.get(url="https://nekos.life/api/v2" + endpoint)
-            try:
-                data = await response.json()
-            except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError, ValueError):
-                data = None
-
-            # Ok so here's a fun fact, whoever designed this api seems to have decided that it'd be appropriate to
-            # return error status codes in the json body under the "msg" key while leaving the response as a 200 OK
-            # (e.g. a 200 with the json payload '{"msg": "404"}') so here we have to try to get the response code from
-            # the json payload (if available) and then fall back to the actual status code.
-            # We cannot consistently rely on this behaviour either as any internal server errors will likely return an
-            # actual 5xx response.
-            try:
-                status_code = int(data["msg"])
-            except (LookupError, ValueError, TypeError):
-                status_code = response.status
-
-            if status_code == 404:
-                raise tanjun_errors.CommandError("Query not found.") from None
-
-            if status_code >= 500 or data is None or response_key not in data:
-                raise tanjun_errors.CommandError(
-                    "Unable to fetch image at the moment due to server error or malformed response."
-                ) from None
-
-            if status_code >= 300:
-                raise tanjun_errors.CommandError(
-                    f"Unable to fetch image due to unexpected error {data.get('msg', '')}"
-                ) from None
-
-            result = data[response_key]
-            assert isinstance(result, str)
-            return result
+        status, data = await self.in_flight.run(
+            ResponseCache.make_key(NEKOS_LIFE_URL + endpoint, {}), lambda: self._request_nekos_life(endpoint)
+        )
+
+        # Ok so here's a fun fact, whoever designed this api seems to have decided that it'd be appropriate to
+        # return error status codes in the json body under the "msg" key while leaving the response as a 200 OK
+        # (e.g. a 200 with the json payload '{"msg": "404"}') so here we have to try to get the response code from
+        # the json payload (if available) and then fall back to the actual status code.
+        # We cannot consistently rely on this behaviour either as any internal server errors will likely return an
+        # actual 5xx response.
+        try:
+            status_code = int(data["msg"])
+        except (LookupError, ValueError, TypeError):
+            status_code = status
+
+        if status_code == 404:
+            raise tanjun_errors.CommandError("Query not found.") from None
+
+        if status_code >= 500 or data is None or response_key not in data:
+            raise tanjun_errors.CommandError(
+                "Unable to fetch image at the moment due to server error or malformed response."
+            ) from None
+
+        if status_code >= 300:
+            raise tanjun_errors.CommandError(
+                f"Unable to fetch image due to unexpected error {data.get('msg', '')}"
+            ) from None
+
+        result = data[response_key]
+        assert isinstance(result, str)
+        return result
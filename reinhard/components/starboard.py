@@ -0,0 +1,465 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["StarboardComponent"]
+
+import asyncio
+import contextlib
+import logging
+import typing
+
+import asyncpg
+from hikari import embeds
+from hikari import emojis
+from hikari import errors as hikari_errors
+from hikari import permissions
+from hikari.events import reaction_events
+from tanjun import checks as checks_
+from tanjun import components
+from tanjun import conversion
+from tanjun import parsing
+from yuyo import backoff
+
+from reinhard import sql
+from reinhard.util import cache
+from reinhard.util import constants
+from reinhard.util import help as help_util
+from reinhard.util import rest_manager
+from reinhard.util import single_flight
+
+if typing.TYPE_CHECKING:
+    from hikari import messages
+    from hikari import snowflakes
+    from tanjun import traits as tanjun_traits
+
+
+STAR_EMOJI: typing.Final[str] = "\N{WHITE MEDIUM STAR}"
+"""The reaction which stars a message."""
+
+_LOGGER = logging.getLogger("hikari.reinhard.starboard")
+
+
+class _Entry:
+    __slots__: typing.Sequence[str] = (
+        "author_id",
+        "channel_id",
+        "guild_id",
+        "message",
+        "message_id",
+        "starboard_message_id",
+        "starers",
+    )
+
+    def __init__(
+        self,
+        message_id: snowflakes.Snowflake,
+        /,
+        *,
+        author_id: snowflakes.Snowflake,
+        channel_id: snowflakes.Snowflake,
+        guild_id: snowflakes.Snowflake,
+        message: typing.Optional[messages.Message] = None,
+        starboard_message_id: typing.Optional[snowflakes.Snowflake] = None,
+        starers: typing.Optional[typing.Set[snowflakes.Snowflake]] = None,
+    ) -> None:
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.message = message
+        self.message_id = message_id
+        self.starboard_message_id = starboard_message_id
+        self.starers = starers or set()
+
+
+def _is_star(emoji: emojis.Emoji, /) -> bool:
+    return isinstance(emoji, emojis.UnicodeEmoji) and emoji.name == STAR_EMOJI
+
+
+@help_util.with_component_name("Starboard Component")
+@help_util.with_component_doc("Component used for reposting highly starred messages to a starboard channel.")
+class StarboardComponent(components.Component):
+    """A starboard which keeps live star counts in memory and persists them with write-behind batching.
+
+    Star changes are queued and flushed to the database in one transaction of bulk statements every `flush_interval`
+    seconds, so a message collecting thousands of stars only costs a handful of round-trips. Starboard messages are
+    likewise only created or edited once per flush.
+
+    Other Parameters
+    ----------------
+    flush_interval : float
+        How many seconds to wait between flushing queued changes. Defaults to `5.0`.
+    max_entries : int
+        The maximum amount of starred messages to keep in memory. Defaults to `10000`.
+    threshold : int
+        How many stars a message needs to be posted to the starboard. Defaults to `3`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_channels",
+        "_entries",
+        "_flush_task",
+        "_in_flight",
+        "_new_entries",
+        "_pending_posts",
+        "_pending_stars",
+        "_pool",
+        "_sql_scripts",
+        "_updated",
+        "flush_interval",
+        "threshold",
+    )
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = 5.0,
+        hooks: typing.Optional[tanjun_traits.Hooks] = None,
+        max_entries: int = 10_000,
+        threshold: int = 3,
+    ) -> None:
+        super().__init__(hooks=hooks)
+        self._channels: typing.Dict[snowflakes.Snowflake, snowflakes.Snowflake] = {}
+        self._entries: cache.ExpiringDict[snowflakes.Snowflake, _Entry] = cache.ExpiringDict(
+            86400, lru=True, max_length=max_entries
+        )
+        self._flush_task: typing.Optional[asyncio.Task[None]] = None
+        self._in_flight: single_flight.SingleFlight[snowflakes.Snowflake, typing.Optional[_Entry]] = (
+            single_flight.SingleFlight()
+        )
+        # Entries which haven't been inserted yet.
+        self._new_entries: typing.Dict[snowflakes.Snowflake, _Entry] = {}
+        # Entries whose starboard message ID hasn't been saved yet.
+        self._pending_posts: typing.Dict[snowflakes.Snowflake, _Entry] = {}
+        # Message ID -> (entry, starer ID -> whether the star was added (True) or removed (False)), last change wins.
+        self._pending_stars: typing.Dict[
+            snowflakes.Snowflake, typing.Tuple[_Entry, typing.Dict[snowflakes.Snowflake, bool]]
+        ] = {}
+        self._pool: typing.Optional[asyncpg.pool.Pool] = None
+        self._sql_scripts: typing.Optional[sql.CachedScripts] = None
+        # Entries whose starboard message needs to be created or updated.
+        self._updated: typing.Dict[snowflakes.Snowflake, _Entry] = {}
+        self.flush_interval = flush_interval
+        self.threshold = threshold
+
+    async def close(self) -> None:
+        await super().close()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            # This has to finish before the final flush as a cancelled flush re-queues its changes.
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+
+            self._flush_task = None
+
+        # Make sure queued changes aren't lost.
+        await self.flush()
+        self._pool = None
+        self._sql_scripts = None
+
+    async def open(self) -> None:
+        if self.client is None:
+            raise RuntimeError("Cannot open this component before binding it to a client.")
+
+        pool = getattr(self.client, "sql_pool", None)
+        sql_scripts = getattr(self.client, "sql_scripts", None)
+        if not isinstance(pool, asyncpg.pool.Pool) or not isinstance(sql_scripts, sql.CachedScripts):
+            raise RuntimeError("Cannot open this component without an opened database pool.")
+
+        async with pool.acquire() as conn:
+            records = await (await sql_scripts.prepare(conn)).find_starboard_channels()
+
+        self._channels = {record["guild_id"]: record["channel_id"] for record in records}
+        self._pool = pool
+        self._sql_scripts = sql_scripts
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        await super().open()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+
+            except Exception as exc:
+                _LOGGER.exception("Failed to flush starboard changes", exc_info=exc)
+
+    async def flush(self) -> None:
+        """Persist all queued changes and then update starboard messages."""
+        if self._pool is None or self._sql_scripts is None:
+            return
+
+        await self._persist()
+        await self._update_starboard_messages()
+        # Save the IDs of any newly created starboard posts without waiting for the next flush.
+        if self._pending_posts:
+            await self._persist()
+
+    async def _persist(self) -> None:
+        assert self._pool is not None and self._sql_scripts is not None
+        new_entries, self._new_entries = self._new_entries, {}
+        pending_posts, self._pending_posts = self._pending_posts, {}
+        pending_stars, self._pending_stars = self._pending_stars, {}
+        if not new_entries and not pending_posts and not pending_stars:
+            return
+
+        added: typing.List[typing.Tuple[int, int, int]] = []
+        removed: typing.List[typing.Tuple[int, int]] = []
+        # The in-memory starers are authoritative so the denormalized count only needs one absolute update per message
+        # rather than one increment per star.
+        star_counts = [(message_id, len(entry.starers)) for message_id, (entry, _) in pending_stars.items()]
+        for message_id, (entry, changes) in pending_stars.items():
+            for starer_id, is_added in changes.items():
+                if is_added:
+                    added.append((message_id, entry.channel_id, starer_id))
+
+                else:
+                    removed.append((message_id, starer_id))
+
+        try:
+            async with self._pool.acquire() as conn:
+                prepared = await self._sql_scripts.prepare(conn)
+                async with conn.transaction():
+                    # Entries have to be inserted first as stars reference them.
+                    if new_entries:
+                        entry_rows = [
+                            (entry.message_id, entry.channel_id, entry.author_id, 0) for entry in new_entries.values()
+                        ]
+                        await prepared.executemany("create_starboard_entry", entry_rows)
+
+                    if added:
+                        await prepared.executemany("create_post_star", added)
+
+                    if removed:
+                        await prepared.executemany("delete_post_star", removed)
+
+                    if star_counts:
+                        await prepared.executemany("update_star_count", star_counts)
+
+                    if pending_posts:
+                        await prepared.executemany(
+                            "update_starboard_entry",
+                            [(entry.message_id, entry.starboard_message_id) for entry in pending_posts.values()],
+                        )
+
+        except BaseException:
+            # Re-queue the changes for the next flush, letting any changes made since take precedence.
+            self._new_entries = {**new_entries, **self._new_entries}
+            self._pending_posts = {**pending_posts, **self._pending_posts}
+            for message_id, (entry, changes) in pending_stars.items():
+                if (newer := self._pending_stars.get(message_id)) is not None:
+                    changes.update(newer[1])
+
+                self._pending_stars[message_id] = (entry, changes)
+
+            raise
+
+        _LOGGER.debug(
+            "Flushed %s new starboard entries, %s added stars and %s removed stars",
+            len(new_entries),
+            len(added),
+            len(removed),
+        )
+
+    async def _update_starboard_messages(self) -> None:
+        updated, self._updated = self._updated, {}
+        entries = iter(updated.values())
+        try:
+            for entry in entries:
+                try:
+                    await self._update_starboard_message(entry)
+
+                except Exception as exc:
+                    _LOGGER.warning("Failed to update the starboard post for %s", entry.message_id, exc_info=exc)
+                    self._updated.setdefault(entry.message_id, entry)
+
+        finally:
+            # Re-queue any entries which weren't reached (e.g. because this was cancelled).
+            for entry in entries:
+                self._updated.setdefault(entry.message_id, entry)
+
+    async def _fetch_message(
+        self, channel_id: snowflakes.Snowflake, message_id: snowflakes.Snowflake, /
+    ) -> typing.Optional[messages.Message]:
+        assert self.client is not None
+        retry = backoff.Backoff(max_retries=3)
+        error_manager = rest_manager.HikariErrorManager(
+            retry, break_on=(hikari_errors.ForbiddenError, hikari_errors.NotFoundError)
+        )
+        async for _ in retry:
+            with error_manager:
+                return await self.client.rest_service.rest.fetch_message(channel_id, message_id)
+
+        return None
+
+    async def _load_entry(
+        self, guild_id: snowflakes.Snowflake, channel_id: snowflakes.Snowflake, message_id: snowflakes.Snowflake, /,
+    ) -> typing.Optional[_Entry]:
+        assert self._pool is not None and self._sql_scripts is not None
+        # An entry may have been evicted from memory before it was flushed.
+        if (entry := self._new_entries.get(message_id)) is None:
+            async with self._pool.acquire() as conn:
+                prepared = await self._sql_scripts.prepare(conn)
+                if (record := await prepared.find_starboard_entry(message_id)) is not None:
+                    stars = await prepared.find_post_stars(message_id)
+                    entry = _Entry(
+                        message_id,
+                        author_id=record["author_id"],
+                        channel_id=record["channel_id"],
+                        guild_id=guild_id,
+                        starboard_message_id=record["starboard_message_id"],
+                        starers={star["starer_id"] for star in stars},
+                    )
+
+        if entry is None:
+            # Reaction events don't include the message's author so the message has to be fetched for new entries.
+            if (message := await self._fetch_message(channel_id, message_id)) is None:
+                return None
+
+            entry = _Entry(
+                message_id, author_id=message.author.id, channel_id=channel_id, guild_id=guild_id, message=message
+            )
+            self._new_entries[message_id] = entry
+
+        # Apply any changes which were queued before this was evicted from memory.
+        _, changes = self._pending_stars.get(message_id, (entry, {}))
+        for starer_id, is_added in changes.items():
+            if is_added:
+                entry.starers.add(starer_id)
+
+            else:
+                entry.starers.discard(starer_id)
+
+        self._entries[message_id] = entry
+        return entry
+
+    async def _get_entry(
+        self, guild_id: snowflakes.Snowflake, channel_id: snowflakes.Snowflake, message_id: snowflakes.Snowflake, /,
+    ) -> typing.Optional[_Entry]:
+        if (entry := self._entries.get(message_id)) is not None:
+            return entry
+
+        return await self._in_flight.run(message_id, lambda: self._load_entry(guild_id, channel_id, message_id))
+
+    def _queue_star(self, entry: _Entry, starer_id: snowflakes.Snowflake, is_added: bool, /) -> None:
+        self._pending_stars.setdefault(entry.message_id, (entry, {}))[1][starer_id] = is_added
+        if entry.starboard_message_id is not None or len(entry.starers) >= self.threshold:
+            self._updated[entry.message_id] = entry
+
+    def _tracks(self, guild_id: snowflakes.Snowflake, channel_id: snowflakes.Snowflake, /) -> bool:
+        starboard_id = self._channels.get(guild_id)
+        # Stars on the starboard itself aren't counted.
+        return self._pool is not None and starboard_id is not None and starboard_id != channel_id
+
+    async def _update_starboard_message(self, entry: _Entry, /) -> None:
+        assert self.client is not None
+        if (starboard_id := self._channels.get(entry.guild_id)) is None:
+            return
+
+        content = f"{STAR_EMOJI} {len(entry.starers)} <#{entry.channel_id}>"
+        retry = backoff.Backoff(max_retries=3)
+        error_manager = rest_manager.HikariErrorManager(
+            retry, break_on=(hikari_errors.ForbiddenError, hikari_errors.NotFoundError)
+        )
+        if entry.starboard_message_id is not None:
+            async for _ in retry:
+                with error_manager:
+                    await self.client.rest_service.rest.edit_message(starboard_id, entry.starboard_message_id, content)
+                    break
+
+            return
+
+        message = entry.message or await self._fetch_message(entry.channel_id, entry.message_id)
+        if message is None:
+            return
+
+        link = f"https://discord.com/channels/{entry.guild_id}/{entry.channel_id}/{entry.message_id}"
+        embed = (
+            embeds.Embed(colour=constants.embed_colour(), description=message.content, timestamp=message.timestamp)
+            .set_author(name=str(message.author), icon=message.author.avatar_url or message.author.default_avatar_url)
+            .add_field(name="Source", value=f"[Jump]({link})")
+        )
+        if message.attachments:
+            embed.set_image(message.attachments[0].url)
+
+        async for _ in retry:
+            with error_manager:
+                starboard_message = await self.client.rest_service.rest.create_message(
+                    starboard_id, content, embed=embed
+                )
+                entry.starboard_message_id = starboard_message.id
+                # The message is only needed to create the post so there's no need to keep it in memory after.
+                entry.message = None
+                self._pending_posts[entry.message_id] = entry
+                break
+
+        else:
+            # Keep the message around to avoid re-fetching it when trying again on the next change.
+            entry.message = message
+
+    @components.as_listener(reaction_events.GuildReactionAddEvent)
+    async def on_reaction_add(self, event: reaction_events.GuildReactionAddEvent) -> None:
+        if not _is_star(event.emoji) or event.member.user.is_bot or not self._tracks(event.guild_id, event.channel_id):
+            return
+
+        entry = await self._get_entry(event.guild_id, event.channel_id, event.message_id)
+        # Self-stars don't count.
+        if entry is None or event.user_id == entry.author_id or event.user_id in entry.starers:
+            return
+
+        entry.starers.add(event.user_id)
+        self._queue_star(entry, event.user_id, True)
+
+    @components.as_listener(reaction_events.GuildReactionDeleteEvent)
+    async def on_reaction_delete(self, event: reaction_events.GuildReactionDeleteEvent) -> None:
+        if not _is_star(event.emoji) or not self._tracks(event.guild_id, event.channel_id):
+            return
+
+        entry = await self._get_entry(event.guild_id, event.channel_id, event.message_id)
+        if entry is not None and event.user_id in entry.starers:
+            entry.starers.remove(event.user_id)
+            self._queue_star(entry, event.user_id, False)
+
+    async def _clear_stars(
+        self, guild_id: snowflakes.Snowflake, channel_id: snowflakes.Snowflake, message_id: snowflakes.Snowflake, /
+    ) -> None:
+        if not self._tracks(guild_id, channel_id):
+            return
+
+        entry = await self._get_entry(guild_id, channel_id, message_id)
+        if entry is not None:
+            starers = entry.starers.copy()
+            entry.starers.clear()
+            for starer_id in starers:
+                self._queue_star(entry, starer_id, False)
+
+    @components.as_listener(reaction_events.GuildReactionDeleteAllEvent)
+    async def on_reaction_delete_all(self, event: reaction_events.GuildReactionDeleteAllEvent) -> None:
+        await self._clear_stars(event.guild_id, event.channel_id, event.message_id)
+
+    @components.as_listener(reaction_events.GuildReactionDeleteEmojiEvent)
+    async def on_reaction_delete_emoji(self, event: reaction_events.GuildReactionDeleteEmojiEvent) -> None:
+        if _is_star(event.emoji):
+            await self._clear_stars(event.guild_id, event.channel_id, event.message_id)
+
+    @help_util.with_parameter_doc("channel", "The required argument of the mention or ID of the channel to use.")
+    @help_util.with_command_doc("Set the channel highly starred messages in this guild should be posted to.")
+    @parsing.with_argument("channel", converters=(conversion.ChannelIDParser.match_id,))
+    @parsing.with_parser
+    @checks_.with_author_permission_check(permissions.Permissions.MANAGE_GUILD)
+    @components.as_command("starboard", checks=[lambda ctx: ctx.message.guild_id is not None])
+    async def starboard(self, ctx: tanjun_traits.Context, channel: snowflakes.Snowflake) -> None:
+        assert ctx.message.guild_id is not None
+        if self._pool is None or self._sql_scripts is None:
+            raise RuntimeError("Cannot use this command before the component's been opened")
+
+        async with self._pool.acquire() as conn:
+            await (await self._sql_scripts.prepare(conn)).create_starboard_channel(ctx.message.guild_id, channel)
+
+        self._channels[ctx.message.guild_id] = channel
+        retry = backoff.Backoff(max_retries=5)
+        error_manager = rest_manager.HikariErrorManager(
+            retry, break_on=(hikari_errors.ForbiddenError, hikari_errors.NotFoundError)
+        )
+        async for _ in retry:
+            with error_manager:
+                await ctx.message.respond(content=f"Set the starboard channel to <#{channel}>")
+                break
@@ -24,6 +24,7 @@ from yuyo import paginaton
 
 from reinhard.util import constants
 from reinhard.util import help as help_util
+from reinhard.util import metrics
 from reinhard.util import rest_manager
 
 if typing.TYPE_CHECKING:
@@ -202,6 +203,25 @@ class SudoComponent(components.Component):
             with error_manager:
                 await ctx.message.respond("Loaded commands\n" + "\n".join(commands))
 
+    @help_util.with_command_doc("Get the bot's in-process metrics (e.g. REST retry telemetry).")
+    @components.as_command("metrics")
+    async def metrics_command(self, ctx: context.Context) -> None:
+        assert self.paginator_pool is not None
+        rendered = metrics.REGISTRY.render() or "No metrics recorded yet."
+        string_paginator = paginaton.string_paginator(iter(rendered.splitlines()), wrapper="```\n{}\n```")
+        embed_generator = (
+            (
+                undefined.UNDEFINED,
+                embeds.Embed(colour=constants.embed_colour(), description=text, title=f"Metrics page {page}"),
+            )
+            async for text, page in string_paginator
+        )
+        response_paginator = paginaton.Paginator(
+            ctx.client.rest_service, ctx.message.channel_id, embed_generator, authors=[ctx.message.author.id]
+        )
+        message = await response_paginator.open()
+        self.paginator_pool.add_paginator(message, response_paginator)
+
     @components.as_group("note", "notes")
     async def note(self, ctx: context.Context) -> None:
         await ctx.message.respond("You have zero tags")
@@ -21,6 +21,7 @@ from reinhard.util import constants
 from reinhard.util import conversion
 from reinhard.util import help as help_util
 from reinhard.util import rest_manager
+from reinhard.util import role_cache
 
 
 @help_util.with_component_doc("Component used for getting miscellaneous Discord information.")
@@ -112,7 +113,7 @@ class UtilComponent(components.Component):
         )
         async for _ in retry:
             with error_manager:
-                guild = await ctx.client.rest_service.rest.fetch_guild(guild=ctx.message.guild_id)
+                guild_roles = await role_cache.fetch_guild_roles(ctx.client, ctx.message.guild_id)
                 break
 
         else:
@@ -121,11 +122,15 @@ class UtilComponent(components.Component):
 
             return
 
-        permissions = guild.roles[guild.id].permissions
+        # The @everyone role shares its ID with the guild.
+        permissions = guild_roles[ctx.message.guild_id].permissions
         roles = {}
 
         for role_id in member.role_ids:
-            role = guild.roles[role_id]
+            # The snapshot may be missing roles which were created while we were disconnected from the gateway.
+            if (role := guild_roles.get(role_id)) is None:
+                continue
+
             permissions |= role.permissions
             roles[role.position] = role
 
@@ -155,7 +160,7 @@ class UtilComponent(components.Component):
         if member.user.is_bot:
             member_information.append("System bot" if member.user.is_system else "Bot")
 
-        if member.user.id == guild.owner_id:
+        if member.user.id == guild_roles.owner_id:
             member_information.append("Server owner")
 
         # TODO: this embed will go over the character limit easily
@@ -72,17 +72,19 @@ class Tokens(Config):
 
 
 class FullConfig(Config):
-    __slots__: typing.Sequence[str] = ("database", "emoji_guild", "log_level", "prefixes", "tokens")
+    __slots__: typing.Sequence[str] = ("cache_path", "database", "emoji_guild", "log_level", "prefixes", "tokens")
 
     def __init__(
         self,
         *,
+        cache_path: typing.Optional[pathlib.Path] = None,
         database: DatabaseConfig,
         emoji_guild: typing.Optional[snowflakes.Snowflake] = None,
         log_level: bot.LoggerLevelT = logging.INFO,
         prefixes: typing.Iterable[str] = ("r.",),
         tokens: Tokens,
     ) -> None:
+        self.cache_path = cache_path
         self.database = database
         self.emoji_guild = emoji_guild
         self.log_level = log_level.upper() if isinstance(log_level, str) else log_level
@@ -96,6 +98,7 @@ class FullConfig(Config):
             raise ValueError("Invalid log level found in config")
 
         return cls(
+            cache_path=pathlib.Path(mapping["cache_path"]) if mapping.get("cache_path") is not None else None,
             database=DatabaseConfig.from_mapping(mapping["database"]),
             emoji_guild=snowflakes.Snowflake(mapping["emoji_guild"]) if "emoji_guild" in mapping else None,
             log_level=log_level,
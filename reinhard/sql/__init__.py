@@ -7,6 +7,16 @@ import typing
 
 import asyncpg
 
+if typing.TYPE_CHECKING:
+    from asyncpg import prepared_stmt
+
+
+MIGRATIONS_DIR: typing.Final[pathlib.Path] = pathlib.Path(__file__).parent / "migrations"
+"""The folder of versioned migration scripts, these are named `{version}_{description}.sql`."""
+
+# An arbitrary key used to stop multiple processes from applying migrations at the same time.
+_MIGRATION_LOCK_KEY: typing.Final[int] = 0x5265696E
+
 
 def script_getter_factory(key: str) -> property:  # Could just make this retrieve the file.
     """
@@ -24,9 +34,116 @@ def script_getter_factory(key: str) -> property:  # Could just make this retriev
     return property(get_script)
 
 
+class PreparedScripts:
+    """The statement scripts of a :class:`CachedScripts` instance prepared for a single connection.
+
+    This shouldn't be used after the connection it was prepared for has been released back to its pool, unless it
+    was attached to the connection by :meth:`CachedScripts.init_connection`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_connection", "_statements")
+
+    def __init__(
+        self, connection: asyncpg.Connection, statements: typing.Mapping[str, prepared_stmt.PreparedStatement]
+    ) -> None:
+        self._connection = connection
+        self._statements = statements
+
+    def _get_statement(self, key: str) -> prepared_stmt.PreparedStatement:
+        try:
+            return self._statements[key]
+        except KeyError:
+            raise AttributeError(f"Unable to get unprepared script '{key}'.") from None
+
+    async def execute(self, key: str, *args: typing.Any, timeout: typing.Optional[float] = None) -> None:
+        """Execute a prepared script, discarding any rows it returns."""
+        await self._get_statement(key).fetch(*args, timeout=timeout)
+
+    async def executemany(
+        self, key: str, args: typing.Iterable[typing.Sequence[typing.Any]], *, timeout: typing.Optional[float] = None
+    ) -> None:
+        """
+        Execute a script for each set of arguments in a single round-trip.
+
+        asyncpg's prepared statements can't be executed in bulk so this goes through the connection rather than the
+        statement prepared for this script. The statement is therefore parsed and planned again the first time this
+        is called for each script on a connection, after which asyncpg's per-connection statement cache reuses it.
+        """
+        await self._connection.executemany(self._get_statement(key).get_query(), args, timeout=timeout)
+
+    async def fetch(
+        self, key: str, *args: typing.Any, timeout: typing.Optional[float] = None
+    ) -> typing.List[asyncpg.Record]:
+        return await self._get_statement(key).fetch(*args, timeout=timeout)
+
+    async def fetchrow(
+        self, key: str, *args: typing.Any, timeout: typing.Optional[float] = None
+    ) -> typing.Optional[asyncpg.Record]:
+        return await self._get_statement(key).fetchrow(*args, timeout=timeout)
+
+    async def fetchval(
+        self, key: str, *args: typing.Any, column: int = 0, timeout: typing.Optional[float] = None
+    ) -> typing.Any:
+        return await self._get_statement(key).fetchval(*args, column=column, timeout=timeout)
+
+    async def create_post_star(self, message_id: int, channel_id: int, starer_id: int) -> None:
+        await self.execute("create_post_star", message_id, channel_id, starer_id)
+
+    async def create_prefix(self, guild_id: int, prefix: str) -> None:
+        await self.execute("create_prefix", guild_id, prefix)
+
+    async def create_starboard_channel(self, guild_id: int, channel_id: int) -> None:
+        await self.execute("create_starboard_channel", guild_id, channel_id)
+
+    async def create_starboard_entry(
+        self, message_id: int, channel_id: int, author_id: int, message_status: int
+    ) -> None:
+        await self.execute("create_starboard_entry", message_id, channel_id, author_id, message_status)
+
+    async def delete_post_star(self, message_id: int, starer_id: int) -> None:
+        await self.execute("delete_post_star", message_id, starer_id)
+
+    async def find_guild_prefix(self, guild_id: int) -> typing.Optional[str]:
+        return await self.fetchval("find_guild_prefix", guild_id)
+
+    async def find_guild_prefixes(self) -> typing.List[asyncpg.Record]:
+        return await self.fetch("find_guild_prefixes")
+
+    async def find_post_stars(self, message_id: int) -> typing.List[asyncpg.Record]:
+        return await self.fetch("find_post_stars", message_id)
+
+    async def find_starboard_channels(self) -> typing.List[asyncpg.Record]:
+        return await self.fetch("find_starboard_channels")
+
+    async def find_starboard_entry(self, message_id: int) -> typing.Optional[asyncpg.Record]:
+        return await self.fetchrow("find_starboard_entry", message_id)
+
+    async def update_star_count(self, message_id: int, star_count: int) -> None:
+        await self.execute("update_star_count", message_id, star_count)
+
+    async def update_starboard_entry(self, message_id: int, starboard_message_id: int) -> None:
+        await self.execute("update_starboard_entry", message_id, starboard_message_id)
+
+
+class ScriptConnection(asyncpg.Connection):
+    """An asyncpg connection which holds the scripts prepared for it.
+
+    This should be passed as the `connection_class` of pools which use :meth:`CachedScripts.init_connection`.
+    """
+
+    __slots__: typing.Sequence[str] = ("prepared_scripts",)
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared_scripts: typing.Optional[PreparedScripts] = None
+
+
 class CachedScripts:
     """A class used for loading and calling sql scripts from a folder."""
 
+    UNPREPARED_SCRIPTS: typing.Final[typing.AbstractSet[str]] = frozenset(("schema",))
+    """The names of scripts which aren't single statements and therefore can't be prepared."""
+
     scripts: typing.MutableMapping[str, str]
 
     def __init__(self, root_dir: typing.Optional[str] = "./reinhard/sql", pattern: str = ".") -> None:
@@ -65,14 +182,69 @@ class CachedScripts:
         """
         root_dir = pathlib.Path(root_dir)
         for file in root_dir.rglob("*"):
+            # Migrations are applied by apply_migrations rather than being used as scripts.
+            if file.parent.name == MIGRATIONS_DIR.name:
+                continue
+
             if file.is_file() and file.name.endswith(".sql") and re.match(pattern, file.name):
                 self.load_sql_file(str(file.absolute()))
 
+    async def init_connection(self, conn: asyncpg.Connection) -> None:
+        """
+        Prepare the loaded statement scripts for a new connection.
+
+        This is intended to be passed as the `init` hook of an asyncpg pool created with
+        `connection_class=ScriptConnection` so that scripts are prepared once per connection rather than being parsed
+        and planned when they're first used.
+
+        Args:
+            conn:
+                The new :class:`ScriptConnection`.
+        """
+        if not isinstance(conn, ScriptConnection):
+            raise TypeError("Scripts can only be prepared ahead of time for ScriptConnection connections")
+
+        conn.prepared_scripts = await self._prepare(conn)
+
+    async def _prepare(self, conn: asyncpg.Connection) -> PreparedScripts:
+        statements = {
+            name: await conn.prepare(script)
+            for name, script in self.scripts.items()
+            if name not in self.UNPREPARED_SCRIPTS
+        }
+        return PreparedScripts(conn, statements)
+
+    async def prepare(self, conn: asyncpg.Connection) -> PreparedScripts:
+        """
+        Get the loaded statement scripts prepared for a connection.
+
+        Args:
+            conn:
+                An active :class:`asyncpg.Connection` or a connection acquired from a pool.
+
+        Returns:
+            The :class:`PreparedScripts` attached to the connection by :meth:`init_connection`, otherwise the scripts
+            are prepared for the connection now.
+        """
+        # Pool connection proxies forward attribute access to the connection they wrap.
+        if (prepared := getattr(conn, "prepared_scripts", None)) is not None:
+            return typing.cast(PreparedScripts, prepared)
+
+        return await self._prepare(conn)
+
     create_post_star = script_getter_factory("create_post_star")
+    create_prefix = script_getter_factory("create_prefix")
     create_starboard_channel = script_getter_factory("create_starboard_channel")
     create_starboard_entry = script_getter_factory("create_starboard_entry")
+    delete_post_star = script_getter_factory("delete_post_star")
     find_guild_prefix = script_getter_factory("find_guild_prefix")
+    find_guild_prefixes = script_getter_factory("find_guild_prefixes")
+    find_post_stars = script_getter_factory("find_post_stars")
+    find_starboard_channels = script_getter_factory("find_starboard_channels")
+    find_starboard_entry = script_getter_factory("find_starboard_entry")
     schema = script_getter_factory("schema")
+    update_star_count = script_getter_factory("update_star_count")
+    update_starboard_entry = script_getter_factory("update_starboard_entry")
 
 
 async def initialise_schema(sql_scripts: CachedScripts, conn: asyncpg.Connection) -> None:
@@ -87,5 +259,35 @@ async def initialise_schema(sql_scripts: CachedScripts, conn: asyncpg.Connection
     """
     try:
         await conn.execute(sql_scripts.schema)
+        await apply_migrations(conn)
     except asyncpg.PostgresError as exc:
         raise RuntimeError("Failed to initialise database.") from exc
+
+
+async def apply_migrations(conn: asyncpg.Connection, migrations_dir: pathlib.Path = MIGRATIONS_DIR) -> int:
+    """
+    Apply the versioned migrations which haven't been applied to the database yet.
+
+    All the pending migrations are applied in version order within a single transaction.
+
+    Args:
+        conn:
+            An active :class:`asyncpg.Connection`.
+        migrations_dir:
+            The folder to load migrations from, defaults to reinhard's migrations folder.
+
+    Returns:
+        How many migrations were applied.
+    """
+    migrations = sorted((int(file.name.split("_", 1)[0]), file) for file in migrations_dir.glob("*.sql"))
+    count = 0
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock($1);", _MIGRATION_LOCK_KEY)
+        current_version = await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM SchemaVersions;")
+        for version, file in migrations:
+            if version > current_version:
+                await conn.execute(file.read_text())
+                await conn.execute("INSERT INTO SchemaVersions (version) VALUES ($1);", version)
+                count += 1
+
+    return count
@@ -2,4 +2,5 @@
 -- $2 = channel ID
 -- $3 = starer ID
 INSERT INTO poststars (message_id, channel_id, starer_id)
-    VALUES ($1, $2, $3);
\ No newline at end of file
+    VALUES ($1, $2, $3)
+    ON CONFLICT DO NOTHING;
\ No newline at end of file
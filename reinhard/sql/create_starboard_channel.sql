@@ -1,4 +1,5 @@
 -- $1 = guild ID
 -- %2 = channel ID
 INSERT INTO starboardchannels (guild_id, channel_id)
-    VALUES ($1, $2);
\ No newline at end of file
+    VALUES ($1, $2)
+    ON CONFLICT (guild_id) DO UPDATE SET channel_id = EXCLUDED.channel_id;
\ No newline at end of file
@@ -4,4 +4,5 @@
 -- $4 = message_status
 INSERT INTO StarboardEntries
     (message_id, channel_id, author_id, message_status)
-    VALUES($1, $2, $3, $4);
\ No newline at end of file
+    VALUES($1, $2, $3, $4)
+    ON CONFLICT DO NOTHING;
\ No newline at end of file
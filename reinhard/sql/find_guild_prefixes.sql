@@ -0,0 +1 @@
+SELECT guild_id, prefix FROM Prefixes;
\ No newline at end of file
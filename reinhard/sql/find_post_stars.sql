@@ -0,0 +1,3 @@
+-- $1 = message ID
+SELECT starer_id FROM PostStars
+WHERE message_id = $1;
\ No newline at end of file
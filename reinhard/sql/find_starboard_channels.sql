@@ -0,0 +1 @@
+SELECT guild_id, channel_id FROM StarboardChannels;
\ No newline at end of file
@@ -0,0 +1,3 @@
+-- $1 = message ID
+SELECT channel_id, author_id, message_status, starboard_message_id FROM StarboardEntries
+WHERE message_id = $1;
\ No newline at end of file
@@ -0,0 +1,13 @@
+-- Denormalizes how many stars each starboard entry has so threshold checks and "top starred" queries don't have to
+-- count PostStars rows, this is kept up to date by the application.
+ALTER TABLE StarboardEntries ADD COLUMN IF NOT EXISTS star_count INT NOT NULL DEFAULT 0;
+
+UPDATE StarboardEntries
+SET star_count = counts.star_count
+FROM (SELECT message_id, COUNT(*) AS star_count FROM PostStars GROUP BY message_id) AS counts
+WHERE StarboardEntries.message_id = counts.message_id;
+
+CREATE INDEX IF NOT EXISTS post_stars_channel_id_idx ON PostStars (channel_id);
+-- This covers looking up an author's entries as well as their most starred entries.
+CREATE INDEX IF NOT EXISTS starboard_entries_author_id_idx ON StarboardEntries (author_id, star_count DESC);
+CREATE INDEX IF NOT EXISTS starboard_entries_star_count_idx ON StarboardEntries (star_count DESC);
@@ -30,3 +30,27 @@ CREATE TABLE IF NOT EXISTS Prefixes (
     guild_id BIGINT PRIMARY KEY,
     prefix VARCHAR(10) NOT NULL
 );
+
+-- Tracks which of the versioned scripts in the migrations folder have been applied.
+CREATE TABLE IF NOT EXISTS SchemaVersions (
+    version INT PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Lets clients keep their in-memory prefix caches in sync through LISTEN/NOTIFY.
+CREATE OR REPLACE FUNCTION notify_prefix_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('prefix_changes', json_build_object('guild_id', OLD.guild_id, 'prefix', NULL)::TEXT);
+    ELSE
+        PERFORM pg_notify('prefix_changes', json_build_object('guild_id', NEW.guild_id, 'prefix', NEW.prefix)::TEXT);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS prefix_changes ON Prefixes;
+CREATE TRIGGER prefix_changes
+    AFTER INSERT OR UPDATE OR DELETE ON Prefixes
+    FOR EACH ROW EXECUTE PROCEDURE notify_prefix_change();
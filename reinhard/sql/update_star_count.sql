@@ -0,0 +1,5 @@
+-- $1 = message ID
+-- $2 = star count
+UPDATE StarboardEntries
+SET star_count = $2
+WHERE message_id = $1;
\ No newline at end of file
@@ -0,0 +1,5 @@
+-- $1 = message ID
+-- $2 = starboard message ID
+UPDATE StarboardEntries
+SET starboard_message_id = $2
+WHERE message_id = $1;
\ No newline at end of file
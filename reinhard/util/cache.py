@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 import time
 import typing
 
@@ -8,112 +9,350 @@ ValueT = typing.TypeVar("ValueT")
 
 
 class ExpiringQueue(typing.MutableSequence[ValueT]):
-    __slots__: typing.Sequence[str] = ("_data", "_expire_after")
+    """A FIFO queue where entries expire a set amount of seconds after being added.
+
+    Entries are stored alongside a monotonic timestamp in insertion order, which means that expired entries are
+    always found at the front of the queue and can be dropped in amortized O(1) time.
+
+    Parameters
+    ----------
+    seconds : int
+        How many seconds entries should be kept for.
+
+    Other Parameters
+    ----------------
+    max_length : typing.Optional[int]
+        The maximum amount of entries this should hold, if this is reached then the oldest entries will be dropped
+        to make room for new ones.
+    on_expire : typing.Optional[typing.Callable[[ValueT], None]]
+        A callback which is called with each entry which is dropped due to expiring or `max_length` being hit.
+        This isn't called for entries which are explicitly removed.
+    origin : typing.Optional[typing.Sequence[typing.Tuple[ValueT, float]]]
+        An initial sequence of `(value, monotonic timestamp)` pairs.
+    """
+
+    __slots__: typing.Sequence[str] = ("_data", "_expire_after", "_max_length", "_on_expire")
 
     def __init__(
-        self, seconds: int, /, *, origin: typing.Optional[typing.Sequence[typing.Tuple[ValueT, float]]] = None
+        self,
+        seconds: int,
+        /,
+        *,
+        max_length: typing.Optional[int] = None,
+        on_expire: typing.Optional[typing.Callable[[ValueT], None]] = None,
+        origin: typing.Optional[typing.Sequence[typing.Tuple[ValueT, float]]] = None,
     ) -> None:
-        self._data = list(origin or ())
+        if max_length is not None and max_length < 1:
+            raise ValueError("max_length must be greater than 0")
+
+        self._data: typing.Deque[typing.Tuple[ValueT, float]] = collections.deque(origin or ())
         self._expire_after = seconds
-        #  TODO: max_length
+        self._max_length = max_length
+        self._on_expire = on_expire
+        self._trim()
 
-    def __contains__(self, value: ValueT, /) -> bool:
+    def __contains__(self, value: typing.Any, /) -> bool:
+        self.gc()
         return any(value == v for (v, _) in self._data)
 
     def __delitem__(self, index: typing.Union[slice, int], /) -> None:
         try:
-            del self._data[index]
+            if isinstance(index, slice):
+                data = list(self._data)
+                del data[index]
+                self._data = collections.deque(data)
+
+            else:
+                del self._data[index]
+
         finally:
             self.gc()
 
+    @typing.overload
     def __getitem__(self, index: int, /) -> ValueT:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice, /) -> typing.MutableSequence[ValueT]:
+        ...
+
+    def __getitem__(self, index: typing.Union[int, slice], /) -> typing.Union[ValueT, typing.MutableSequence[ValueT]]:
+        self.gc()
+        if isinstance(index, slice):
+            return [value for (value, _) in list(self._data)[index]]
+
         return self._data[index][0]
 
-    def __iter__(self) -> typing.Iterable[ValueT]:
+    def __iter__(self) -> typing.Iterator[ValueT]:
+        self.gc()
         return (value for (value, _) in self._data)
 
     def __len__(self) -> int:
+        self.gc()
         return len(self._data)
 
-    def __setitem__(self, index: typing.Union[int, slice], value: ValueT) -> None:
-        self._data[index] = value
+    def __setitem__(self, index: typing.Any, value: typing.Any, /) -> None:
+        if isinstance(index, slice):
+            raise TypeError("ExpiringQueue doesn't support slice assignment")
+
+        # This keeps the original timestamp to avoid breaking the queue's ordering.
+        self._data[index] = (value, self._data[index][1])
         self.gc()
 
     def __repr__(self) -> str:
         return f"ExpiringQueue<{self._data!r}>"
 
-    def copy(self) -> ExpiringQueue:
+    @property
+    def expire_after(self) -> int:
+        return self._expire_after
+
+    @property
+    def max_length(self) -> typing.Optional[int]:
+        return self._max_length
+
+    def _trim(self) -> None:
+        if self._max_length is not None:
+            while len(self._data) > self._max_length:
+                value, _ = self._data.popleft()
+                if self._on_expire is not None:
+                    self._on_expire(value)
+
+    def append(self, value: ValueT, /) -> None:
         self.gc()
-        return ExpiringQueue(self._expire_after, origin=self._data.copy())
+        self._data.append((value, time.monotonic()))
+        self._trim()
+
+    def copy(self, *, on_expire: typing.Optional[typing.Callable[[ValueT], None]] = None) -> ExpiringQueue[ValueT]:
+        """Copy this queue.
+
+        `on_expire` isn't carried over as it's usually bound to whatever owns this queue, so it has to be passed
+        explicitly.
+        """
+        self.gc()
+        return ExpiringQueue(self._expire_after, max_length=self._max_length, on_expire=on_expire, origin=self._data)
 
     def freeze(self) -> typing.Sequence[ValueT]:
         self.gc()
         return [value for (value, _) in self._data]
 
-    def gc(self) -> None:
-        now = time.perf_counter()
-        # Is this fine?
-        for (_, timestamp) in self._data:
-            if now - timestamp < self._expire_after:
-                break
-            del self._data[0]
+    def gc(self) -> int:
+        # As entries are stored in the order they were added, the first unexpired entry marks the end of the
+        # expired entries.
+        expire_before = time.monotonic() - self._expire_after
+        count = 0
+        while self._data and self._data[0][1] <= expire_before:
+            value, _ = self._data.popleft()
+            count += 1
+            if self._on_expire is not None:
+                self._on_expire(value)
+
+        return count
 
     def insert(self, index: int, value: ValueT, /) -> None:
         self.gc()
-        self._data.insert(index, (value, time.perf_counter()))
+        # Inserting anywhere but the end (i.e. through `append`) may leave a newer entry in front of older ones,
+        # in which case the older entries will outlive their expiry until the newer entry expires.
+        self._data.insert(index, (value, time.monotonic()))
+        self._trim()
 
 
 class ExpiringDict(typing.MutableMapping[KeyT, ValueT]):
-    __slots__: typing.Sequence[str] = ("_data", "_expire_after")
+    """A mapping where entries expire a set amount of seconds after they were last set.
+
+    Entries are kept ordered by when they were set alongside a monotonic timestamp, which means that expired entries
+    are found at the start of the mapping and can be dropped in amortized O(1) time. When LRU eviction is enabled
+    reads also reorder entries, in which case a separate ordering by when entries were set is kept for expiry.
+
+    Iterating over this (including through `items` and `values`) doesn't count as using the entries and works on a
+    snapshot, so this can be modified while iterating.
+
+    Parameters
+    ----------
+    seconds : int
+        How many seconds entries should be kept for after being set.
+
+    Other Parameters
+    ----------------
+    lru : bool
+        Whether entries should be evicted in least recently used order rather than first-in-first-out order when
+        `max_length` is hit. Defaults to `False`.
+    max_length : typing.Optional[int]
+        The maximum amount of entries this should hold, if this is reached then entries will be evicted to make room
+        for new ones.
+    on_expire : typing.Optional[typing.Callable[[KeyT, ValueT], None]]
+        A callback which is called with each entry which is dropped due to expiring or `max_length` being hit.
+        This isn't called for entries which are explicitly removed or overwritten.
+    origin : typing.Union[typing.Mapping[KeyT, typing.Tuple[ValueT, float]], typing.Iterable[...], None]
+        Initial `key -> (value, monotonic timestamp)` pairs.
+    """
+
+    __slots__: typing.Sequence[str] = ("_data", "_expire_after", "_expiry", "_lru", "_max_length", "_on_expire")
 
     def __init__(
         self,
         seconds: int,
         /,
         *,
+        lru: bool = False,
+        max_length: typing.Optional[int] = None,
+        on_expire: typing.Optional[typing.Callable[[KeyT, ValueT], None]] = None,
         origin: typing.Union[
-            typing.Mapping[KeyT, typing.Tuple[ValueT, float]], typing.Iterable[KeyT, typing.Tuple[ValueT, float]], None,
+            typing.Mapping[KeyT, typing.Tuple[ValueT, float]],
+            typing.Iterable[typing.Tuple[KeyT, typing.Tuple[ValueT, float]]],
+            None,
         ] = None,
     ) -> None:
-        self._data = dict(origin) if origin else {}
+        if max_length is not None and max_length < 1:
+            raise ValueError("max_length must be greater than 0")
+
+        self._data: typing.OrderedDict[KeyT, typing.Tuple[ValueT, float]] = collections.OrderedDict(origin or ())
         self._expire_after = seconds
+        # As reads reorder `_data` in LRU mode, the entries' timestamp order has to be tracked separately.
+        self._expiry: typing.Optional[typing.OrderedDict[KeyT, float]] = None
+        if lru:
+            self._expiry = collections.OrderedDict(
+                sorted(((key, timestamp) for key, (_, timestamp) in self._data.items()), key=lambda entry: entry[1])
+            )
+
+        self._lru = lru
+        self._max_length = max_length
+        self._on_expire = on_expire
+        self._trim()
+
+    def __contains__(self, key: typing.Any, /) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
 
     def __setitem__(self, key: KeyT, value: ValueT, /) -> None:
-        self._data[key] = value
         self.gc()
+        # The entry's timestamp is refreshed so it has to be moved to the end to keep the mapping ordered.
+        now = time.monotonic()
+        self._data.pop(key, None)
+        self._data[key] = (value, now)
+        if self._expiry is not None:
+            self._expiry.pop(key, None)
+            self._expiry[key] = now
+
+        self._trim()
 
     def __delitem__(self, key: KeyT, /) -> None:
         try:
             del self._data[key]
+            if self._expiry is not None:
+                del self._expiry[key]
+
         finally:
             self.gc()
 
     def __getitem__(self, key: KeyT, /) -> ValueT:
-        return self._data[key]
+        value, timestamp = self._data[key]
+        # This avoids returning an expired entry without having to run gc on every read.
+        if time.monotonic() - timestamp >= self._expire_after:
+            self._drop(key)
+            raise KeyError(key)
+
+        if self._lru:
+            self._data.move_to_end(key)
+
+        return value
 
     def __len__(self) -> int:
-        return len(self)
+        self.gc()
+        return len(self._data)
 
     def __iter__(self) -> typing.Iterator[KeyT]:
-        return iter(self._data)
+        self.gc()
+        return iter(list(self._data))
 
     def __repr__(self) -> str:
         return f"ExpiringDict<{self._data!r}>"
 
-    def copy(self) -> ExpiringDict:
+    @property
+    def expire_after(self) -> int:
+        return self._expire_after
+
+    @property
+    def max_length(self) -> typing.Optional[int]:
+        return self._max_length
+
+    def _drop(self, key: KeyT, /) -> None:
+        value, _ = self._data.pop(key)
+        if self._expiry is not None:
+            del self._expiry[key]
+
+        if self._on_expire is not None:
+            self._on_expire(key, value)
+
+    def _trim(self) -> None:
+        if self._max_length is not None:
+            while len(self._data) > self._max_length:
+                self._drop(next(iter(self._data)))
+
+    def clear(self) -> None:
+        self._data.clear()
+        if self._expiry is not None:
+            self._expiry.clear()
+
+    def copy(
+        self, *, on_expire: typing.Optional[typing.Callable[[KeyT, ValueT], None]] = None
+    ) -> ExpiringDict[KeyT, ValueT]:
+        """Copy this mapping.
+
+        `on_expire` isn't carried over as it's usually bound to whatever owns this mapping, so it has to be passed
+        explicitly.
+        """
         self.gc()
-        return ExpiringDict(self._expire_after, origin=self._data.copy())
+        return ExpiringDict(
+            self._expire_after,
+            lru=self._lru,
+            max_length=self._max_length,
+            on_expire=on_expire,
+            origin=self._data.copy(),
+        )
 
     def freeze(self) -> typing.Mapping[KeyT, ValueT]:
         self.gc()
-        return {key: value for key, (_, value) in self._data.items()}
+        now = time.monotonic()
+        return {key: value for key, (value, timestamp) in self._data.items() if now - timestamp < self._expire_after}
+
+    def popitem(self) -> typing.Tuple[KeyT, ValueT]:
+        """Remove and return the oldest entry (or least recently used entry in LRU mode) in O(1) time."""
+        self.gc()
+        try:
+            key, (value, _) = self._data.popitem(last=False)
+        except KeyError:
+            raise KeyError("popitem(): dictionary is empty") from None
+
+        if self._expiry is not None:
+            del self._expiry[key]
 
-    def gc(self) -> None:
-        now = time.perf_counter()
-        for key, (_, timestamp) in tuple(self._data.items()):
-            if now - timestamp < self._expire_after:
+        return key, value
+
+    def items(self) -> typing.ItemsView[KeyT, ValueT]:
+        # This goes through a snapshot as reading through `__getitem__` would reorder LRU entries.
+        return self.freeze().items()
+
+    def values(self) -> typing.ValuesView[ValueT]:
+        return self.freeze().values()
+
+    def gc(self) -> int:
+        expire_before = time.monotonic() - self._expire_after
+        count = 0
+        while self._data:
+            if self._expiry is not None:
+                key, timestamp = next(iter(self._expiry.items()))
+
+            else:
+                key, (_, timestamp) = next(iter(self._data.items()))
+
+            if timestamp > expire_before:
                 break
-            try:
-                del self[key]
-            except KeyError:
-                continue
+
+            self._drop(key)
+            count += 1
+
+        return count
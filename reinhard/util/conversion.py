@@ -4,6 +4,7 @@ __all__: typing.Sequence[str] = [
     "RESTFulMemberConverter",
     "RESTFulRoleConverter",
     "RESTFulUserConverter",
+    "garbage_collect",
     # tanjun.conversion
     "ChannelConverter",
     "ColorConverter",
@@ -26,15 +27,53 @@ from tanjun.conversion import *
 from yuyo import backoff
 
 from reinhard.util import basic
+from reinhard.util import member_index
+from reinhard.util import memoize
 from reinhard.util import rest_manager
+from reinhard.util import role_cache
 
 if typing.TYPE_CHECKING:
     from hikari import guilds
     from hikari import snowflakes
     from hikari import users
+    from hikari.api import rest as rest_api
     from tanjun import traits
 
 
+# Only "not found" errors are cached as the others either depend on the guild (e.g. Forbidden) or are transient.
+@memoize.memoize(
+    expire_after=60,
+    key=lambda _, guild_id, user_id: (guild_id, user_id),
+    max_size=2048,
+    negative_errors=(hikari_errors.NotFoundError,),
+)
+async def _fetch_member(
+    rest: rest_api.RESTClient, guild_id: snowflakes.Snowflake, user_id: snowflakes.Snowflake, /
+) -> guilds.Member:
+    return await rest.fetch_member(guild_id, user_id)
+
+
+@memoize.memoize(
+    expire_after=600, key=lambda _, user_id: user_id, max_size=2048, negative_errors=(hikari_errors.NotFoundError,)
+)
+async def _fetch_user(rest: rest_api.RESTClient, user_id: snowflakes.Snowflake, /) -> users.User:
+    return await rest.fetch_user(user_id)
+
+
+def _get_cached_member(
+    ctx: traits.Context, guild_id: snowflakes.Snowflake, user_id: snowflakes.Snowflake, /
+) -> typing.Optional[guilds.Member]:
+    if ctx.client.cache_service:
+        return ctx.client.cache_service.cache.get_member(guild_id, user_id)
+
+    return None
+
+
+def garbage_collect() -> int:
+    """Drop the expired results of the memoized REST fallbacks."""
+    return _fetch_member.garbage_collect() + _fetch_user.garbage_collect()
+
+
 class RESTFulMemberConverter(MemberConverter):
     __slots__: typing.Sequence[str] = ()
 
@@ -71,15 +110,37 @@ class RESTFulMemberConverter(MemberConverter):
             .with_rule((hikari_errors.ForbiddenError,), basic.raise_error(None))
         )
 
+        index = getattr(ctx.client, "member_index", None)
+        if not isinstance(index, member_index.MemberIndex):
+            index = None
+
+        # Try exact and prefix matches from the local name index before falling back to searching through REST.
+        # The index only holds IDs so a match is then looked up by ID.
+        elif member_id is None and (user_ids := index.search(ctx.message.guild_id, argument, fuzzy=False)):
+            member_id = user_ids[0]
+            if member := _get_cached_member(ctx, ctx.message.guild_id, member_id):
+                return member
+
         async for _ in retry:
             with error_manager:
                 # Get by ID if we were provided a valid ID.
                 if member_id is not None:
-                    return await ctx.client.rest_service.rest.fetch_member(ctx.message.guild_id, member_id)
+                    return await _fetch_member(ctx.client.rest_service.rest, ctx.message.guild_id, member_id)
 
                 # Else get by username/nickname.
                 else:
-                    return (await ctx.client.rest_service.rest.search_members(ctx.message.guild_id, argument))[0]
+                    members = await ctx.client.rest_service.rest.search_members(ctx.message.guild_id, argument)
+                    if index is not None:
+                        index.add_members(ctx.message.guild_id, members)
+                        # Fuzzy matches are only used when Discord couldn't find anyone as they may be the wrong member.
+                        if not members and (user_ids := index.search(ctx.message.guild_id, argument)):
+                            member_id = user_ids[0]
+                            if member := _get_cached_member(ctx, ctx.message.guild_id, member_id):
+                                return member
+
+                            return await _fetch_member(ctx.client.rest_service.rest, ctx.message.guild_id, member_id)
+
+                    return members[0]
 
         else:
             raise ValueError("Couldn't get member in time") from None
@@ -105,25 +166,16 @@ class RESTFulRoleConverter(RoleConverter):
         except ValueError:
             pass
 
-        # Match by ID if we were provided a valid ID.
+        role_id: typing.Optional[snowflakes.Snowflake] = None
         try:
             role_id = conversion.UserIDParser.match_id(argument)
-
-            def predicate(role: guilds.Role) -> bool:
-                return role.id == role_id
-
-        # Else match by name.
         except ValueError:
-            argument = argument.casefold()
-
-            def predicate(role: guilds.Role) -> bool:
-                return role.name.casefold() == argument
+            pass
 
         retry = backoff.Backoff(max_retries=5)
         error_manager = (
             rest_manager.HikariErrorManager(retry).with_rule(
-                # next(...) will raise StopIteration if the iterator feed to it doesn't yield anything.
-                (hikari_errors.BadRequestError, hikari_errors.NotFoundError, StopIteration),
+                (hikari_errors.BadRequestError, hikari_errors.NotFoundError),
                 basic.raise_error("Couldn't find role.", error_type=ValueError),
             )
             # If this is the case then we can't access the guild this was triggered in anymore and should stop the
@@ -133,11 +185,18 @@ class RESTFulRoleConverter(RoleConverter):
 
         async for _ in retry:
             with error_manager:
-                roles = await ctx.client.rest_service.rest.fetch_roles(ctx.message.guild_id)
-                return next(filter(predicate, iter(roles)))
+                roles = await role_cache.fetch_guild_roles(ctx.client, ctx.message.guild_id)
+                break
 
         else:
-            raise ValueError("Couldn't fetch user in time.")
+            raise ValueError("Couldn't fetch role in time.")
+
+        # Match by ID if we were provided a valid ID else match by name.
+        role = roles.get(role_id) if role_id is not None else roles.find(argument)
+        if role is None:
+            raise ValueError("Couldn't find role.")
+
+        return role
 
 
 class RESTFulUserConverter(UserConverter):
@@ -165,7 +224,7 @@ class RESTFulUserConverter(UserConverter):
 
         async for _ in retry:
             with error_manager:
-                return await ctx.client.rest_service.rest.fetch_user(user_id)
+                return await _fetch_user(ctx.client.rest_service.rest, user_id)
 
         else:
             raise ValueError("Couldn't fetch user in time.")
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["DiskCache", "DiskEntry"]
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import pathlib
+import sqlite3
+import time
+import typing
+
+_LOGGER = logging.getLogger("hikari.reinhard.disk_cache")
+_ValueT = typing.TypeVar("_ValueT")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT    NOT NULL,
+    value       TEXT    NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL    NOT NULL,
+
+    CONSTRAINT entry_pk
+        PRIMARY KEY (key)
+);
+
+CREATE INDEX IF NOT EXISTS entries_created_at_idx ON entries (created_at);
+"""
+
+
+class DiskEntry(typing.NamedTuple):
+    key: str
+    value: typing.Any
+    size: int
+    age: float
+    """How many seconds ago this entry was stored."""
+
+
+class DiskCache:
+    """A persistent SQLite backed cache of JSON serialisable values.
+
+    All database access is run on a single background thread so it never blocks the event loop, and writes are
+    queued without waiting for them to finish. Both limits are enforced after each write so the database doesn't
+    grow while running, with `compact` only being needed to reclaim the freed space.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path to the SQLite database file, this will be created if it doesn't exist.
+
+    Other Parameters
+    ----------------
+    expire_after : int
+        How many seconds entries should be kept for. Defaults to a day.
+    max_bytes : int
+        The maximum total size of the stored values (as given to `set`), the oldest entries are dropped when this
+        is passed. Defaults to 16MiB.
+    """
+
+    __slots__: typing.Sequence[str] = ("_connection", "_executor", "expire_after", "max_bytes", "_path", "_size")
+
+    def __init__(self, path: pathlib.Path, /, *, expire_after: int = 86400, max_bytes: int = 16 * 1024 ** 2) -> None:
+        self._connection: typing.Optional[sqlite3.Connection] = None
+        self._executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.expire_after = expire_after
+        self.max_bytes = max_bytes
+        self._path = path
+        # The total size of the stored entries, this is only accessed from the background thread.
+        self._size = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._executor is not None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("Disk cache is not open")
+
+        return self._connection
+
+    async def _run(self, callback: typing.Callable[[], _ValueT], /) -> _ValueT:
+        if self._executor is None:
+            raise RuntimeError("Disk cache is not open")
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, callback)
+
+    def _open(self) -> None:
+        self._connection = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def _trim(self, connection: sqlite3.Connection, /) -> int:
+        expire_before = time.time() - self.expire_after
+        expired_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE created_at <= ?", (expire_before,)
+        ).fetchone()[0]
+        count = connection.execute("DELETE FROM entries WHERE created_at <= ?", (expire_before,)).rowcount
+        self._size -= expired_size
+        if self._size > self.max_bytes:
+            # Drop the oldest entries which don't fit under max_bytes when summing sizes from the newest entry.
+            count += connection.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY created_at DESC) AS total FROM entries
+                    ) WHERE total > ?
+                )
+                """,
+                (self.max_bytes,),
+            ).rowcount
+            self._size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        return count
+
+    def _compact(self) -> int:
+        connection = self._get_connection()
+        with connection:
+            self._size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            count = self._trim(connection)
+
+        if count:
+            connection.execute("VACUUM")
+
+        return count
+
+    def _load(self) -> typing.List[DiskEntry]:
+        now = time.time()
+        cursor = self._get_connection().execute(
+            "SELECT key, value, size, created_at FROM entries WHERE created_at > ? ORDER BY created_at",
+            (now - self.expire_after,),
+        )
+        return [DiskEntry(key, json.loads(value), size, now - created_at) for key, value, size, created_at in cursor]
+
+    def _set(self, key: str, value: str, size: int, created_at: float) -> None:
+        with self._get_connection() as connection:
+            if (old := connection.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()) is not None:
+                self._size -= old[0]
+
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at) VALUES (?, ?, ?, ?)",
+                (key, value, size, created_at),
+            )
+            self._size += size
+            self._trim(connection)
+
+    def _garbage_collect(self) -> int:
+        with self._get_connection() as connection:
+            return self._trim(connection)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def compact(self) -> int:
+        """Drop expired entries and the oldest entries which don't fit under `max_bytes` then reclaim the free space.
+
+        Returns
+        -------
+        int
+            How many entries were dropped.
+        """
+        return await self._run(self._compact)
+
+    def garbage_collect(self) -> int:
+        """Queue dropping the expired entries.
+
+        This doesn't wait for them to be dropped so always returns `0`, failures are only logged.
+        """
+        if self._executor is None:
+            raise RuntimeError("Disk cache is not open")
+
+        self._executor.submit(self._garbage_collect).add_done_callback(_log_failure)
+        return 0
+
+    async def load(self) -> typing.Sequence[DiskEntry]:
+        """Load the unexpired entries from the oldest to the newest."""
+        return await self._run(self._load)
+
+    def set(self, key: str, value: typing.Any, /, *, size: typing.Optional[int] = None) -> None:
+        """Queue a value to be stored.
+
+        This doesn't wait for the write to finish and failed writes are only logged.
+
+        Parameters
+        ----------
+        key : str
+            The entry's key.
+        value : typing.Any
+            The JSON serialisable value to store.
+
+        Other Parameters
+        ----------------
+        size : typing.Optional[int]
+            The size to count this entry as towards `max_bytes`. Defaults to the size of the serialised value.
+        """
+        if self._executor is None:
+            raise RuntimeError("Disk cache is not open")
+
+        data = json.dumps(value)
+        future = self._executor.submit(self._set, key, data, len(data.encode()) if size is None else size, time.time())
+        future.add_done_callback(_log_failure)
+
+    async def open(self) -> None:
+        if self._executor is not None:
+            raise RuntimeError("Disk cache is already open")
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="reinhard-disk-cache")
+        try:
+            await self._run(self._open)
+            await self.compact()
+
+        except BaseException:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        if self._executor is None:
+            raise RuntimeError("Disk cache is not open")
+
+        executor = self._executor
+        # Queued writes are finished before the connection is closed as the executor runs tasks in order.
+        await asyncio.get_running_loop().run_in_executor(executor, self._close)
+        self._executor = None
+        executor.shutdown(wait=False)
+
+
+def _log_failure(future: concurrent.futures.Future[typing.Any], /) -> None:
+    if not future.cancelled() and (exc := future.exception()):
+        _LOGGER.warning("Failed to write to disk cache", exc_info=exc)
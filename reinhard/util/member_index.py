@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["GuildMemberIndex", "MemberIndex"]
+
+import collections
+import typing
+
+from hikari.events import guild_events
+from hikari.events import member_events
+from hikari.events import shard_events
+
+if typing.TYPE_CHECKING:
+    from hikari import guilds
+    from hikari import snowflakes
+    from hikari.api import event_dispatcher
+
+
+def _trigrams(name: str, /) -> typing.FrozenSet[str]:
+    # Padding lets the start and end of short names still produce trigrams.
+    padded = f"  {name} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+def _names(member: guilds.Member, /) -> typing.Tuple[str, ...]:
+    names = [member.user.username.casefold()]
+    # This may be undefined for partial member updates.
+    if isinstance(member.nickname, str) and (nickname := member.nickname.casefold()) != names[0]:
+        names.append(nickname)
+
+    return tuple(names)
+
+
+class _TrieNode:
+    __slots__: typing.Sequence[str] = ("children", "members")
+
+    def __init__(self) -> None:
+        self.children: typing.Dict[str, _TrieNode] = {}
+        self.members: typing.Set[snowflakes.Snowflake] = set()
+
+
+class GuildMemberIndex:
+    """An index of a guild's members by their casefolded usernames and nicknames.
+
+    Exact and prefix matches are looked up through a prefix trie, falling back to fuzzy matching through a trigram
+    index when nothing starts with the query.
+
+    Only the members' IDs and names are kept to avoid duplicating the member objects Hikari's cache already holds,
+    so found members have to be resolved through the cache or REST.
+    """
+
+    __slots__: typing.Sequence[str] = ("_names", "_trie", "_trigrams")
+
+    def __init__(self) -> None:
+        self._names: typing.Dict[snowflakes.Snowflake, typing.Tuple[str, ...]] = {}
+        self._trie = _TrieNode()
+        self._trigrams: typing.Dict[str, typing.Set[snowflakes.Snowflake]] = collections.defaultdict(set)
+
+    def __contains__(self, user_id: typing.Any, /) -> bool:
+        return user_id in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _insert(self, user_id: snowflakes.Snowflake, name: str, /) -> None:
+        node = self._trie
+        for char in name:
+            if (child := node.children.get(char)) is None:
+                child = node.children[char] = _TrieNode()
+
+            node = child
+
+        node.members.add(user_id)
+        for trigram in _trigrams(name):
+            self._trigrams[trigram].add(user_id)
+
+    def _delete(self, user_id: snowflakes.Snowflake, name: str, /) -> None:
+        path = [self._trie]
+        for char in name:
+            if (node := path[-1].children.get(char)) is None:
+                break
+
+            path.append(node)
+
+        else:
+            path[-1].members.discard(user_id)
+            # Prune the nodes which no longer lead to any members.
+            for depth in range(len(name), 0, -1):
+                if path[depth].members or path[depth].children:
+                    break
+
+                del path[depth - 1].children[name[depth - 1]]
+
+        for trigram in _trigrams(name):
+            if (members := self._trigrams.get(trigram)) is not None:
+                members.discard(user_id)
+                if not members:
+                    del self._trigrams[trigram]
+
+    def add(self, member: guilds.Member, /) -> None:
+        """Add or update a member."""
+        user_id = member.user.id
+        names = _names(member)
+        old_names = self._names.get(user_id, ())
+        for name in old_names:
+            if name not in names:
+                self._delete(user_id, name)
+
+        for name in names:
+            if name not in old_names:
+                self._insert(user_id, name)
+
+        self._names[user_id] = names
+
+    def remove(self, user_id: snowflakes.Snowflake, /) -> None:
+        for name in self._names.pop(user_id, ()):
+            self._delete(user_id, name)
+
+    def search(
+        self, query: str, /, *, fuzzy: bool = True, limit: int = 1, min_score: float = 0.3
+    ) -> typing.Sequence[snowflakes.Snowflake]:
+        """Search for members by username or nickname.
+
+        Parameters
+        ----------
+        query : str
+            The name to search for.
+
+        Other Parameters
+        ----------------
+        fuzzy : bool
+            Whether fuzzy matches should be returned when there aren't enough exact or prefix matches.
+            Defaults to `True`.
+        limit : int
+            The maximum amount of members to return. Defaults to `1`.
+        min_score : float
+            The minimum trigram similarity (`0` to `1`) fuzzy matches need. Defaults to `0.3`.
+
+        Returns
+        -------
+        typing.Sequence[hikari.snowflakes.Snowflake]
+            The IDs of the found members ordered from exact matches, through the shortest prefix matches, to the best
+            fuzzy matches.
+        """
+        query = query.casefold()
+        found: typing.Dict[snowflakes.Snowflake, None] = {}
+        node: typing.Optional[_TrieNode] = self._trie
+        for char in query:
+            if node is None:
+                break
+
+            node = node.children.get(char)
+
+        if node is not None:
+            # Breadth-first traversal finds exact matches first followed by the shortest completions.
+            queue = collections.deque((node,))
+            while queue and len(found) < limit:
+                current = queue.popleft()
+                found.update(dict.fromkeys(current.members))
+                queue.extend(current.children.values())
+
+        if fuzzy and len(found) < limit:
+            query_trigrams = _trigrams(query)
+            counts: typing.Counter[snowflakes.Snowflake] = collections.Counter()
+            for trigram in query_trigrams:
+                counts.update(self._trigrams.get(trigram, ()))
+
+            # As the union of two trigram sets is at least as big as the query's set, members which don't share enough
+            # trigrams to reach min_score can be skipped without scoring them.
+            min_shared = min_score * len(query_trigrams)
+            scores: typing.List[typing.Tuple[float, snowflakes.Snowflake]] = []
+            for user_id, shared in counts.items():
+                if shared < min_shared:
+                    continue
+
+                # A member's shared trigram count may be split across their names so each is scored separately.
+                score = max(
+                    len(query_trigrams & (name_trigrams := _trigrams(name))) / len(query_trigrams | name_trigrams)
+                    for name in self._names[user_id]
+                )
+                if score >= min_score and user_id not in found:
+                    scores.append((score, user_id))
+
+            scores.sort(key=lambda entry: entry[0], reverse=True)
+            found.update(dict.fromkeys(user_id for _, user_id in scores))
+
+        return list(found)[:limit]
+
+
+class MemberIndex:
+    """Per-guild member name indexes which are built from member events and chunks."""
+
+    __slots__: typing.Sequence[str] = ("_guilds",)
+
+    def __init__(self) -> None:
+        self._guilds: typing.Dict[snowflakes.Snowflake, GuildMemberIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self._guilds)
+
+    def add_members(self, guild_id: snowflakes.Snowflake, members: typing.Iterable[guilds.Member], /) -> None:
+        if (index := self._guilds.get(guild_id)) is None:
+            index = self._guilds[guild_id] = GuildMemberIndex()
+
+        for member in members:
+            index.add(member)
+
+    def get_guild(self, guild_id: snowflakes.Snowflake, /) -> typing.Optional[GuildMemberIndex]:
+        return self._guilds.get(guild_id)
+
+    def search(
+        self, guild_id: snowflakes.Snowflake, query: str, /, *, fuzzy: bool = True, limit: int = 1
+    ) -> typing.Sequence[snowflakes.Snowflake]:
+        if (index := self._guilds.get(guild_id)) is None:
+            return []
+
+        return index.search(query, fuzzy=fuzzy, limit=limit)
+
+    async def on_guild_available(self, event: guild_events.GuildAvailableEvent, /) -> None:
+        self.add_members(event.guild_id, event.members.values())
+
+    async def on_guild_leave(self, event: guild_events.GuildLeaveEvent, /) -> None:
+        self._guilds.pop(event.guild_id, None)
+
+    async def on_member_chunk(self, event: shard_events.MemberChunkEvent, /) -> None:
+        self.add_members(event.guild_id, event.members.values())
+
+    async def on_member_create(
+        self, event: typing.Union[member_events.MemberCreateEvent, member_events.MemberUpdateEvent], /
+    ) -> None:
+        self.add_members(event.guild_id, (event.member,))
+
+    async def on_member_delete(self, event: member_events.MemberDeleteEvent, /) -> None:
+        if (index := self._guilds.get(event.guild_id)) is not None:
+            index.remove(event.user_id)
+
+    def _listeners(
+        self,
+    ) -> typing.Iterator[typing.Tuple[typing.Type[typing.Any], event_dispatcher.CallbackT[typing.Any]]]:
+        yield guild_events.GuildAvailableEvent, self.on_guild_available
+        yield guild_events.GuildLeaveEvent, self.on_guild_leave
+        yield member_events.MemberCreateEvent, self.on_member_create
+        yield member_events.MemberDeleteEvent, self.on_member_delete
+        yield member_events.MemberUpdateEvent, self.on_member_create
+        yield shard_events.MemberChunkEvent, self.on_member_chunk
+
+    def subscribe(self, dispatcher: event_dispatcher.EventDispatcher, /) -> None:
+        for event_type, callback in self._listeners():
+            dispatcher.subscribe(event_type, callback)
+
+    def unsubscribe(self, dispatcher: event_dispatcher.EventDispatcher, /) -> None:
+        for event_type, callback in self._listeners():
+            dispatcher.unsubscribe(event_type, callback)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["AsyncMemo", "memoize"]
+
+import asyncio
+import typing
+
+from reinhard.util import cache
+
+ValueT = typing.TypeVar("ValueT")
+CallbackT = typing.Callable[..., typing.Awaitable[ValueT]]
+KeyCallbackT = typing.Callable[..., typing.Hashable]
+
+
+def _default_key(*args: typing.Any, **kwargs: typing.Any) -> typing.Hashable:
+    return (*args, *sorted(kwargs.items())) if kwargs else args
+
+
+class _KeyLock:
+    __slots__: typing.Sequence[str] = ("lock", "waiters")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.waiters = 0
+
+
+class AsyncMemo(typing.Generic[ValueT]):
+    """An async callable which memoizes its results for a set amount of time.
+
+    Concurrent calls with the same key are serialised through a per-key lock so only the first one makes the call
+    while the others wait for and re-use its result.
+
+    Parameters
+    ----------
+    callback : CallbackT[ValueT]
+        The async callable to memoize.
+
+    Other Parameters
+    ----------------
+    expire_after : int
+        How many seconds results should be kept for. Defaults to `300`.
+    key : typing.Optional[KeyCallbackT]
+        A callable which is called with the same arguments as `callback` to get the key to cache its result under.
+        Defaults to using the positional and keyword arguments as the key.
+    max_size : int
+        The maximum amount of results (and errors) to keep, least recently used entries are evicted first.
+        Defaults to `1024`.
+    negative_errors : typing.Tuple[typing.Type[BaseException], ...]
+        Errors which should be cached and re-raised for repeat calls (e.g. "not found" errors). Defaults to none.
+    negative_expire_after : int
+        How many seconds cached errors should be kept for. Defaults to `60`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_callback",
+        "_errors",
+        "_key",
+        "_locks",
+        "_negative_errors",
+        "_results",
+        "hits",
+        "misses",
+    )
+
+    def __init__(
+        self,
+        callback: CallbackT[ValueT],
+        /,
+        *,
+        expire_after: int = 300,
+        key: typing.Optional[KeyCallbackT] = None,
+        max_size: int = 1024,
+        negative_errors: typing.Tuple[typing.Type[BaseException], ...] = (),
+        negative_expire_after: int = 60,
+    ) -> None:
+        self._callback = callback
+        self._errors: cache.ExpiringDict[typing.Hashable, BaseException] = cache.ExpiringDict(
+            negative_expire_after, lru=True, max_length=max_size
+        )
+        self._key = key or _default_key
+        self._locks: typing.Dict[typing.Hashable, _KeyLock] = {}
+        self._negative_errors = negative_errors
+        self._results: cache.ExpiringDict[typing.Hashable, ValueT] = cache.ExpiringDict(
+            expire_after, lru=True, max_length=max_size
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results) + len(self._errors)
+
+    def _lookup(self, key: typing.Hashable, /) -> typing.Optional[typing.Tuple[ValueT]]:
+        if (error := self._errors.get(key)) is not None:
+            self.hits += 1
+            # Dropping the traceback avoids it growing with every re-raise.
+            raise error.with_traceback(None)
+
+        try:
+            result = self._results[key]
+        except KeyError:
+            return None
+
+        self.hits += 1
+        return (result,)
+
+    async def __call__(self, *args: typing.Any, **kwargs: typing.Any) -> ValueT:
+        key = self._key(*args, **kwargs)
+        if (cached := self._lookup(key)) is not None:
+            return cached[0]
+
+        if (key_lock := self._locks.get(key)) is None:
+            key_lock = self._locks[key] = _KeyLock()
+
+        key_lock.waiters += 1
+        try:
+            async with key_lock.lock:
+                # Another call may've cached this while we were waiting for the lock.
+                if (cached := self._lookup(key)) is not None:
+                    return cached[0]
+
+                self.misses += 1
+                try:
+                    result = await self._callback(*args, **kwargs)
+
+                except self._negative_errors as exc:
+                    self._errors[key] = exc
+                    raise
+
+                self._results[key] = result
+                return result
+
+        finally:
+            key_lock.waiters -= 1
+            if not key_lock.waiters:
+                del self._locks[key]
+
+    def clear(self) -> None:
+        self._errors.clear()
+        self._results.clear()
+
+    def garbage_collect(self) -> int:
+        return self._errors.gc() + self._results.gc()
+
+    def invalidate(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        """Drop the cached result or error for a set of arguments."""
+        key = self._key(*args, **kwargs)
+        self._errors.pop(key, None)
+        self._results.pop(key, None)
+
+
+def memoize(
+    *,
+    expire_after: int = 300,
+    key: typing.Optional[KeyCallbackT] = None,
+    max_size: int = 1024,
+    negative_errors: typing.Tuple[typing.Type[BaseException], ...] = (),
+    negative_expire_after: int = 60,
+) -> typing.Callable[[CallbackT[ValueT]], AsyncMemo[ValueT]]:
+    """Decorator used to memoize an async callable.
+
+    See `AsyncMemo` for the parameters.
+    """
+
+    def decorator(callback: CallbackT[ValueT], /) -> AsyncMemo[ValueT]:
+        return AsyncMemo(
+            callback,
+            expire_after=expire_after,
+            key=key,
+            max_size=max_size,
+            negative_errors=negative_errors,
+            negative_expire_after=negative_expire_after,
+        )
+
+    return decorator
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["Counter", "DEFAULT_BUCKETS", "Histogram", "MetricsRegistry", "REGISTRY"]
+
+import bisect
+import math
+import typing
+
+LabelsT = typing.Tuple[typing.Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: typing.Final[typing.Sequence[float]] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""The default upper bounds (in seconds) of histogram buckets."""
+
+
+class Counter:
+    __slots__: typing.Sequence[str] = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0, /) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+
+        self.value += amount
+
+
+class Histogram:
+    """A histogram with fixed cumulative buckets.
+
+    Parameters
+    ----------
+    buckets : typing.Sequence[float]
+        The upper bounds of this histogram's buckets in ascending order, an implicit infinite bucket is always added.
+    """
+
+    __slots__: typing.Sequence[str] = ("buckets", "count", "_counts", "sum")
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS, /) -> None:
+        self.buckets = tuple(buckets) if buckets and buckets[-1] == math.inf else (*buckets, math.inf)
+        self.count = 0
+        self._counts = [0] * len(self.buckets)
+        self.sum = 0.0
+
+    @property
+    def cumulative_counts(self) -> typing.Sequence[int]:
+        """The amount of observations which are less than or equal to each bucket's upper bound."""
+        counts: typing.List[int] = []
+        total = 0
+        for count in self._counts:
+            total += count
+            counts.append(total)
+
+        return counts
+
+    def observe(self, value: float, /) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+MetricT = typing.TypeVar("MetricT", Counter, Histogram)
+
+
+class MetricsRegistry:
+    """An in-process registry of labelled metrics.
+
+    Metrics are created on first use and identified by their name and labels.
+    """
+
+    __slots__: typing.Sequence[str] = ("_metrics",)
+
+    def __init__(self) -> None:
+        self._metrics: typing.Dict[str, typing.Dict[LabelsT, typing.Union[Counter, Histogram]]] = {}
+
+    def __len__(self) -> int:
+        return sum(map(len, self._metrics.values()))
+
+    def _get(
+        self,
+        name: str,
+        labels: typing.Mapping[str, str],
+        cls: typing.Type[MetricT],
+        factory: typing.Callable[[], MetricT],
+        /,
+    ) -> MetricT:
+        metrics = self._metrics.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        if (metric := metrics.get(key)) is None:
+            metric = metrics[key] = factory()
+
+        elif not isinstance(metric, cls):
+            raise TypeError(f"Metric {name!r} is a {type(metric).__name__} not a {cls.__name__}")
+
+        return metric
+
+    def counter(self, name: str, /, **labels: str) -> Counter:
+        """Get or create a counter."""
+        return self._get(name, labels, Counter, Counter)
+
+    def histogram(self, name: str, /, *, buckets: typing.Sequence[float] = DEFAULT_BUCKETS, **labels: str) -> Histogram:
+        """Get or create a histogram.
+
+        `buckets` is only used if the histogram doesn't exist yet.
+        """
+        return self._get(name, labels, Histogram, lambda: Histogram(buckets))
+
+    def collect(self) -> typing.Iterator[typing.Tuple[str, typing.Mapping[str, str], typing.Union[Counter, Histogram]]]:
+        """Iterate over the registered metrics as `(name, labels, metric)` in name order."""
+        for name, metrics in sorted(self._metrics.items()):
+            for labels, metric in sorted(metrics.items(), key=lambda entry: entry[0]):
+                yield name, dict(labels), metric
+
+    def clear(self) -> None:
+        self._metrics.clear()
+
+    def render(self) -> str:
+        """Render the registered metrics in the Prometheus text exposition format."""
+        lines: typing.List[str] = []
+        for name, labels, metric in self.collect():
+            if isinstance(metric, Counter):
+                lines.append(f"{name}{_format_labels(labels)} {metric.value}")
+                continue
+
+            for bound, count in zip(metric.buckets, metric.cumulative_counts):
+                bucket_labels = {**labels, "le": "+Inf" if bound == math.inf else str(bound)}
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+
+            lines.append(f"{name}_sum{_format_labels(labels)} {metric.sum}")
+            lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+
+        return "\n".join(lines)
+
+
+def _format_labels(labels: typing.Mapping[str, str], /) -> str:
+    if not labels:
+        return ""
+
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels.keys(), escaped)) + "}"
+
+
+REGISTRY: typing.Final[MetricsRegistry] = MetricsRegistry()
+"""The process-wide metrics registry."""
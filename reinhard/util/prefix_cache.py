@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["NOTIFY_CHANNEL", "PrefixCache"]
+
+import asyncio
+import contextlib
+import json
+import logging
+import typing
+
+from hikari import snowflakes
+
+if typing.TYPE_CHECKING:
+    import asyncpg
+
+    from reinhard import sql
+
+NOTIFY_CHANNEL: typing.Final[str] = "prefix_changes"
+"""The channel the schema's `Prefixes` trigger notifies of changes on."""
+
+_LOGGER = logging.getLogger("hikari.reinhard.prefix_cache")
+
+
+class PrefixCache:
+    """An in-memory copy of the `Prefixes` table.
+
+    This is bulk-loaded when opened and then kept up to date through Postgres notifications rather than being
+    re-queried, so looking up a guild's prefix never touches the database.
+
+    Notifications stop if the listening connection's lost, so `check_connection` should be called periodically to
+    re-open the connection and reload the prefixes when that happens.
+    """
+
+    __slots__: typing.Sequence[str] = ("_conn", "_pending", "_pool", "_prefixes", "_reconnect_task", "_sql_scripts")
+
+    def __init__(self) -> None:
+        self._conn: typing.Optional[asyncpg.Connection] = None
+        self._pending: typing.Optional[typing.List[str]] = None
+        self._pool: typing.Optional[asyncpg.pool.Pool] = None
+        self._prefixes: typing.Dict[snowflakes.Snowflake, str] = {}
+        self._reconnect_task: typing.Optional[asyncio.Task[None]] = None
+        self._sql_scripts: typing.Optional[sql.CachedScripts] = None
+
+    def __contains__(self, guild_id: typing.Any, /) -> bool:
+        return guild_id in self._prefixes
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    @property
+    def is_open(self) -> bool:
+        return self._pool is not None
+
+    def get(self, guild_id: snowflakes.Snowflake, /) -> typing.Optional[str]:
+        return self._prefixes.get(guild_id)
+
+    def _on_notification(self, _: asyncpg.Connection, __: int, ___: str, payload: str, /) -> None:
+        if self._pending is not None:
+            self._pending.append(payload)
+
+        else:
+            self._apply(payload)
+
+    def _apply(self, payload: str, /) -> None:
+        try:
+            data = json.loads(payload)
+            guild_id = snowflakes.Snowflake(data["guild_id"])
+            prefix = data["prefix"]
+
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring malformed prefix notification %r", payload)
+            return
+
+        if prefix is None:
+            self._prefixes.pop(guild_id, None)
+
+        else:
+            self._prefixes[guild_id] = str(prefix)
+
+    async def _connect(self, pool: asyncpg.pool.Pool, sql_scripts: sql.CachedScripts, /) -> None:
+        conn = await pool.acquire()
+        # Listening before loading means changes made during the load can't be missed, these are queued up and
+        # re-applied on top of the loaded prefixes as the load may or may not have included them.
+        self._pending = []
+        try:
+            await conn.add_listener(NOTIFY_CHANNEL, self._on_notification)
+            records = await (await sql_scripts.prepare(conn)).find_guild_prefixes()
+
+        except BaseException:
+            self._pending = None
+            await pool.release(conn)
+            raise
+
+        self._conn = conn
+        self._prefixes = {snowflakes.Snowflake(record["guild_id"]): record["prefix"] for record in records}
+        for payload in self._pending:
+            self._apply(payload)
+
+        self._pending = None
+        _LOGGER.debug("Loaded %s guild prefixes", len(self._prefixes))
+
+    async def _reconnect(self, pool: asyncpg.pool.Pool, sql_scripts: sql.CachedScripts, /) -> None:
+        try:
+            if (conn := self._conn) is not None:
+                self._conn = None
+                try:
+                    await pool.release(conn)
+
+                except Exception as exc:
+                    _LOGGER.debug("Failed to release lost prefix cache connection", exc_info=exc)
+
+            # The prefixes loaded before the connection was lost are kept until they can be reloaded.
+            await self._connect(pool, sql_scripts)
+
+        except Exception as exc:
+            _LOGGER.warning("Failed to re-open prefix cache, this will be retried on the next check", exc_info=exc)
+
+        finally:
+            self._reconnect_task = None
+
+    def check_connection(self) -> int:
+        """Start re-opening this cache in the background if its connection's been lost.
+
+        asyncpg 0.20 doesn't support connection termination listeners so this has to be polled. This always returns
+        `0` so it can be registered as a reaper callback.
+        """
+        if self._pool is None or self._sql_scripts is None or self._reconnect_task is not None:
+            return 0
+
+        if self._conn is not None and not self._conn.is_closed():
+            return 0
+
+        _LOGGER.warning("Prefix cache's connection was lost, re-opening it")
+        self._reconnect_task = asyncio.create_task(self._reconnect(self._pool, self._sql_scripts))
+        return 0
+
+    async def open(self, pool: asyncpg.pool.Pool, sql_scripts: sql.CachedScripts, /) -> None:
+        """Load the stored prefixes and start listening for changes.
+
+        This holds one of the pool's connections until closed.
+        """
+        if self._pool is not None:
+            raise RuntimeError("Prefix cache is already open")
+
+        await self._connect(pool, sql_scripts)
+        self._pool = pool
+        self._sql_scripts = sql_scripts
+
+    async def close(self) -> None:
+        if self._pool is None:
+            raise RuntimeError("Prefix cache is not open")
+
+        pool = self._pool
+        reconnect_task = self._reconnect_task
+        self._pool = None
+        self._sql_scripts = None
+        if reconnect_task is not None:
+            reconnect_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reconnect_task
+
+        # This may be a connection the cancelled reconnect acquired rather than the original connection.
+        conn = self._conn
+        self._conn = None
+        if conn is None:
+            return
+
+        try:
+            await conn.remove_listener(NOTIFY_CHANNEL, self._on_notification)
+
+        finally:
+            await pool.release(conn)
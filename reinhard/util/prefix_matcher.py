@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["PrefixMatcher"]
+
+import re
+import typing
+
+
+class PrefixMatcher:
+    """A set of prefixes compiled into a single anchored regex alternation.
+
+    This lets a message be checked against every prefix in one pass through the regex engine rather than a
+    `str.startswith` call per prefix. When multiple prefixes match, the longest one wins.
+
+    Parameters
+    ----------
+    prefixes : typing.Iterable[str]
+        The prefixes to match.
+    """
+
+    __slots__: typing.Sequence[str] = ("_first_chars", "_pattern", "prefixes")
+
+    def __init__(self, prefixes: typing.Iterable[str], /) -> None:
+        self.prefixes = frozenset(prefixes)
+        # Regex alternation is first-match so longer prefixes have to be tried first for the longest match to win.
+        ordered = sorted(self.prefixes, key=len, reverse=True)
+        # An empty prefix matches everything so the first character can't be used to reject messages then.
+        self._first_chars: typing.Optional[typing.FrozenSet[str]] = (
+            None if "" in self.prefixes else frozenset(prefix[0] for prefix in ordered)
+        )
+        self._pattern: typing.Optional[typing.Pattern[str]] = (
+            re.compile("|".join(map(re.escape, ordered))) if ordered else None
+        )
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def __len__(self) -> int:
+        return len(self.prefixes)
+
+    def match(self, content: str, /) -> typing.Optional[str]:
+        """Get the longest prefix the content starts with, if any."""
+        if self._pattern is None:
+            return None
+
+        # The vast majority of messages aren't commands so a set lookup on the first character rejects most of them
+        # without entering the regex engine.
+        if self._first_chars is not None and content[:1] not in self._first_chars:
+            return None
+
+        if (match := self._pattern.match(content)) is not None:
+            return match.group()
+
+        return None
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import abc
+import array
+import asyncio
 import datetime
-import difflib
+import enum
+import itertools
+import math
+import time
 import typing
 
 # from . import cache
 from reinhard.util import cache
+from reinhard.util import similarity as similarity_
 
 if typing.TYPE_CHECKING:
     from hikari import messages
@@ -14,6 +20,14 @@ if typing.TYPE_CHECKING:
     from tanjun import traits
 
 
+class Affinity(enum.IntEnum):
+    """The entity a bucket pool's buckets should be keyed by."""
+
+    USER = 0
+    CHANNEL = 1
+    GUILD = 2
+
+
 class AbstractCall(abc.ABC):  # TODO: better name
     __slots__: typing.Sequence[str] = ()
 
@@ -48,36 +62,66 @@ class AbstractCall(abc.ABC):  # TODO: better name
         raise NotImplementedError
 
 
-class MessageCall(AbstractCall):
-    __slots__: typing.Sequence[str] = ("content", "level")
+def _compare_content(
+    similarity: similarity_.AbstractSimilarityBackend[typing.Any],
+    sketch: typing.Any,
+    other_similarity: similarity_.AbstractSimilarityBackend[typing.Any],
+    other_sketch: typing.Any,
+    other_content: str,
+) -> float:
+    # Sketches are only comparable when they were made by the same backend.
+    if other_similarity is not similarity:
+        other_sketch = similarity.sketch(other_content)
+
+    return similarity.compare(sketch, other_sketch)
 
-    def __init__(self, message: messages.Message) -> None:
+
+class MessageCall(AbstractCall):
+    __slots__: typing.Sequence[str] = ("content", "level", "similarity", "sketch")
+
+    def __init__(
+        self,
+        message: messages.Message,
+        *,
+        similarity: similarity_.AbstractSimilarityBackend[typing.Any] = similarity_.DEFAULT_BACKEND,
+    ) -> None:
         if message.content is None:
             raise ValueError("Cannot initiate a message call for a message with no content")
 
         self.content = message.content
         self.level = 1
+        self.similarity = similarity
+        self.sketch = similarity.sketch(self.content)
 
     def similarity_check(self, other: typing.Union[typing.Any, MessageCall]) -> int:
         if not isinstance(other, type(self)):
             return 0
 
-        return round(difflib.SequenceMatcher(a=self.content, b=other.content).ratio() * 100)
+        ratio = _compare_content(self.similarity, self.sketch, other.similarity, other.sketch, other.content)
+        return round(ratio * 100)
 
 
 class CommandCall(AbstractCall):
-    __slots__: typing.Sequence[str] = ("command", "content", "level")
-
-    def __init__(self, ctx: traits.Context) -> None:
+    __slots__: typing.Sequence[str] = ("command", "content", "level", "similarity", "sketch")
+
+    def __init__(
+        self,
+        ctx: traits.Context,
+        *,
+        similarity: similarity_.AbstractSimilarityBackend[typing.Any] = similarity_.DEFAULT_BACKEND,
+    ) -> None:
         self.command = ctx.command
-        self.content = ctx.message.content
+        self.content = ctx.message.content or ""
         self.level = 1
+        self.similarity = similarity
+        self.sketch = similarity.sketch(self.content)
 
     def similarity_check(self, other: AbstractCall) -> int:
         if not isinstance(other, type(self)):
             return 0
 
-        similarity = round(difflib.SequenceMatcher(a=self.content, b=other.content).ratio() * 75)
+        ratio = _compare_content(self.similarity, self.sketch, other.similarity, other.sketch, other.content)
+        similarity = round(ratio * 75)
         if self.command == other.command:
             similarity += 25
 
@@ -87,11 +131,6 @@ class CommandCall(AbstractCall):
 class AbstractBucket(abc.ABC):
     __slots__: typing.Sequence[str] = ()
 
-    @property
-    @abc.abstractmethod
-    def calls(self) -> typing.MutableSequence[AbstractCall]:
-        raise NotImplementedError
-
     @abc.abstractmethod
     def add_call(self, call: AbstractCall) -> None:
         ...
@@ -108,51 +147,147 @@ class AbstractBucket(abc.ABC):
 
 
 class SimpleBucket(AbstractBucket):
-    __slots__: typing.Sequence[str] = ("_calls",)
+    __slots__: typing.Sequence[str] = ("_calls", "_level")
 
     def __init__(self, expire_after: datetime.timedelta) -> None:
-        self._calls = cache.ExpiringQueue(int(expire_after.total_seconds()))
+        self._calls = cache.ExpiringQueue(int(expire_after.total_seconds()), on_expire=self._on_call_expire)
+        # A running total of the level of every call in the bucket, this is kept up to date as calls are added and
+        # expire to avoid having to sum the whole bucket on every read.
+        self._level = 0
+
+    def _on_call_expire(self, call: AbstractCall) -> None:
+        self._level -= call.level
 
     def add_call(self, call: AbstractCall) -> None:
-        similarities = [other_call.similarity_check(call) for other_call in self.calls]
-        similarities.sort()
-        if not similarities:
-            pass
-        elif similarities[-1] >= 100:  # This shouldn't ever be greater than 100 but meh.
+        max_similarity = 0
+        for other_call in self._calls:
+            similarity = other_call.similarity_check(call)
+            if similarity > max_similarity:
+                max_similarity = similarity
+
+                if similarity >= 100:  # We can't get any higher than this.
+                    break
+
+        if max_similarity >= 100:  # This shouldn't ever be greater than 100 but meh.
             call.level = 3
-        elif similarities[-1] >= 60:  # TODO: make this dynamic
+        elif max_similarity >= 60:  # TODO: make this dynamic
             call.level = 2
 
+        self._level += call.level
         self._calls.append(call)
 
+    def copy(self) -> SimpleBucket:
+        bucket = SimpleBucket.__new__(SimpleBucket)
+        bucket._calls = self._calls.copy(on_expire=bucket._on_call_expire)
+        bucket._level = self._level
+        return bucket
+
     @property
-    def calls(self) -> typing.MutableSequence[AbstractCall]:
-        return self._calls
+    def calls(self) -> typing.Sequence[AbstractCall]:
+        # This is a snapshot as calls added or removed behind the bucket's back would desync its running level.
+        return self._calls.freeze()
 
     @property
     def expired(self) -> bool:
         return not self._calls
 
     @property
-    def level(self) -> int:  # I think this could be a race condition hence the copy.
-        return sum(call.level for call in self._calls.copy())
+    def level(self) -> int:
+        self._calls.gc()
+        return self._level
 
 
-class BucketPool:
-    __slots__: typing.Sequence[str] = ("affinity", "buckets", "expire_after")
+class GCRARate:
+    """The shared configuration of a "limit calls per period" generic cell rate limit.
+
+    Parameters
+    ----------
+    limit : int
+        How many calls may be made within `period`.
+    period : datetime.timedelta
+        The period the limit applies over.
+    """
+
+    __slots__: typing.Sequence[str] = ("emission_interval", "limit", "period", "tolerance")
+
+    def __init__(self, limit: int, period: datetime.timedelta) -> None:
+        if limit < 1:
+            raise ValueError("limit must be greater than 0")
+
+        self.limit = limit
+        self.period = period.total_seconds()
+        # How much each call pushes back the theoretical arrival time.
+        self.emission_interval = self.period / limit
+        # How far ahead of the current time the theoretical arrival time can be while a call still conforms.
+        self.tolerance = self.period - self.emission_interval
+
+    def create_bucket(self) -> GCRABucket:
+        return GCRABucket(self)
+
+
+class GCRABucket(AbstractBucket):
+    """A generic cell rate algorithm bucket.
+
+    Rather than storing calls this only stores the "theoretical arrival time" of the next call, which is pushed back
+    by the rate's emission interval every time a call is added.
+    """
+
+    __slots__: typing.Sequence[str] = ("_rate", "_tat")
+
+    def __init__(self, rate: GCRARate) -> None:
+        self._rate = rate
+        self._tat = 0.0
+
+    def add_call(self, call: typing.Optional[AbstractCall] = None) -> None:
+        self._tat = max(self._tat, time.monotonic()) + self._rate.emission_interval
+
+    @property
+    def expired(self) -> bool:
+        return self._tat <= time.monotonic()
+
+    @property
+    def is_limited(self) -> bool:
+        """Whether adding another call would go over this bucket's limit."""
+        return self._tat - time.monotonic() > self._rate.tolerance
 
-    def __init__(self, affinity: int, expire_after: datetime.timedelta) -> None:
+    @property
+    def level(self) -> int:
+        return max(0, math.ceil((self._tat - time.monotonic()) / self._rate.emission_interval))
+
+    @property
+    def retry_after(self) -> float:
+        """How many seconds until another call can be made without going over this bucket's limit."""
+        return max(0.0, self._tat - self._rate.tolerance - time.monotonic())
+
+
+class BucketPool:
+    __slots__: typing.Sequence[str] = ("affinity", "bucket_factory", "buckets", "expire_after")
+
+    def __init__(
+        self,
+        affinity: int,
+        expire_after: datetime.timedelta,
+        *,
+        bucket_factory: typing.Optional[typing.Callable[[], AbstractBucket]] = None,
+    ) -> None:
         self.affinity = affinity
+        self.bucket_factory = bucket_factory
         self.buckets: typing.MutableMapping[snowflakes.Snowflake, AbstractBucket] = {}
         self.expire_after = expire_after
 
     def _create_bucket(self) -> AbstractBucket:
+        if self.bucket_factory is not None:
+            return self.bucket_factory()
+
         return SimpleBucket(expire_after=self.expire_after)
 
     def add_cool(self, entity: snowflakes.Snowflake, call: AbstractCall) -> None:
-        if entity not in self.buckets:
-            self.buckets[entity] = self._create_bucket()
-        self.buckets[entity].add_call(call)
+        self.get_or_create_bucket(entity).add_call(call)
+
+    def get_or_create_bucket(self, entity: snowflakes.Snowflake) -> AbstractBucket:
+        if (bucket := self.buckets.get(entity)) is None:
+            bucket = self.buckets[entity] = self._create_bucket()
+        return bucket
 
     @property
     def is_empty(self) -> bool:
@@ -163,29 +298,301 @@ class BucketPool:
             return bucket.level
         return 0
 
-    def garbage_collect(self) -> None:
-        for entity, bucket in tuple(self.buckets.items()):
+    def garbage_collect(self, *, max_buckets: int = 10_000) -> int:
+        """Drop the expired buckets out of the next `max_buckets` buckets.
+
+        The buckets which are still live are moved to the back so each call carries on from where the last one
+        stopped rather than sweeping every bucket at once.
+        """
+        count = 0
+        for entity in list(itertools.islice(self.buckets, max_buckets)):
+            bucket = self.buckets.pop(entity)
             if bucket.expired:
-                del self.buckets[entity]
+                count += 1
 
+            else:
+                self.buckets[entity] = bucket
 
-class ComplexBucketPool:
-    __slots__: typing.Sequence[str] = ("affinity", "expire_after", "pools")
+        return count
 
-    def __init__(self, affinity: int, expire_after: datetime.timedelta) -> None:
+
+class ComplexBucketPool:
+    __slots__: typing.Sequence[str] = ("affinity", "bucket_factory", "expire_after", "pools")
+
+    def __init__(
+        self,
+        affinity: int,
+        expire_after: datetime.timedelta,
+        *,
+        bucket_factory: typing.Optional[typing.Callable[[], AbstractBucket]] = None,
+    ) -> None:
         self.affinity = affinity
+        self.bucket_factory = bucket_factory
         self.expire_after = expire_after
         self.pools: typing.MutableMapping[snowflakes.Snowflake, BucketPool] = {}
 
     def _create_pool(self) -> BucketPool:
-        return BucketPool(expire_after=self.expire_after, affinity=self.affinity)
+        return BucketPool(expire_after=self.expire_after, affinity=self.affinity, bucket_factory=self.bucket_factory)
 
     def get_or_create_pool(self, target: snowflakes.Snowflake) -> BucketPool:
         if target not in self.pools:
             self.pools[target] = self._create_pool()
         return self.pools[target]
 
-    def garbage_collect(self) -> None:  # TODO: naming
-        for key, pool in tuple(self.pools.items()):
+    def garbage_collect(self, *, max_buckets: int = 10_000) -> int:  # TODO: naming
+        """Drop the expired buckets out of the next `max_buckets` buckets, dropping any pools this empties.
+
+        Like `BucketPool.garbage_collect`, the pools are swept in a rotating order so each call carries on from
+        where the last one stopped.
+        """
+        count = 0
+        remaining = max_buckets
+        for key in list(itertools.islice(self.pools, max_buckets)):
+            if remaining <= 0:
+                break
+
+            pool = self.pools.pop(key)
+            # Empty pools still cost a check.
+            checked = max(1, min(remaining, len(pool.buckets)))
+            count += pool.garbage_collect(max_buckets=checked)
+            remaining -= checked
             if pool.is_empty:
-                del self.pools[key]
+                count += 1
+
+            else:
+                self.pools[key] = pool
+
+        return count
+
+
+_EMPTY_KEY: typing.Final[int] = 0
+_DELETED_KEY: typing.Final[int] = 2 ** 64 - 1
+_FIBONACCI_MULTIPLIER: typing.Final[int] = 0x9E3779B97F4A7C15
+_UINT64_MASK: typing.Final[int] = 2 ** 64 - 1
+
+
+class CompactGCRAPool:
+    """A memory compact pool of GCRA buckets for tracking very large amounts of entities.
+
+    Rather than storing a bucket object per entity this stores each entity's ID and theoretical arrival time in
+    parallel `array.array` columns, indexed by an open-addressing (linear probing) hash table. Each slot costs 16
+    bytes and the table's kept at most half full, counting the tombstones left behind by expired entries, and is
+    rehashed to a quarter full when it fills up. That's 32 to 128 bytes per tracked entity depending on how recently
+    the table was rehashed and how many tombstones it holds (e.g. a million entities take 32MiB to 64MiB).
+
+    Expired entries are swept in bounded chunks by `garbage_collect` so a sweep never has to walk the whole table in
+    one go.
+
+    Parameters
+    ----------
+    rate : GCRARate
+        The rate limit to apply to each entity.
+
+    Other Parameters
+    ----------------
+    capacity : int
+        The initial amount of slots to allocate, this will be rounded up to a power of 2. Defaults to `1024`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_bits", "_cursor", "_keys", "_length", "rate", "_tats", "_used")
+
+    def __init__(self, rate: GCRARate, /, *, capacity: int = 1024) -> None:
+        self._bits = max(3, (capacity - 1).bit_length())
+        # Where the next garbage collection sweep should start from.
+        self._cursor = 0
+        self._keys = array.array("Q", bytes(8 << self._bits))
+        # The amount of live entries.
+        self._length = 0
+        self.rate = rate
+        self._tats = array.array("d", bytes(8 << self._bits))
+        # The amount of live and deleted entries, as deleted entries still lengthen probe chains.
+        self._used = 0
+
+    def __contains__(self, entity: typing.Any, /) -> bool:
+        return isinstance(entity, int) and self._find(entity) != -1
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        return len(self._keys)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._length
+
+    @property
+    def memory_usage(self) -> int:
+        """How many bytes are allocated by this pool's columns."""
+        return self._keys.itemsize * len(self._keys) + self._tats.itemsize * len(self._tats)
+
+    def _hash(self, entity: int) -> int:
+        return ((entity * _FIBONACCI_MULTIPLIER) & _UINT64_MASK) >> (64 - self._bits)
+
+    def _find(self, entity: int) -> int:
+        mask = len(self._keys) - 1
+        index = self._hash(entity)
+        while (key := self._keys[index]) != _EMPTY_KEY:
+            if key == entity:
+                return index
+
+            index = (index + 1) & mask
+
+        return -1
+
+    def _resize(self, bits: int) -> None:
+        keys = self._keys
+        tats = self._tats
+        self._bits = bits
+        self._cursor = 0
+        self._keys = array.array("Q", bytes(8 << bits))
+        self._tats = array.array("d", bytes(8 << bits))
+        self._length = 0
+        self._used = 0
+
+        for key, tat in zip(keys, tats):
+            if key != _EMPTY_KEY and key != _DELETED_KEY:
+                self._set(key, tat)
+
+    def _set(self, entity: int, tat: float) -> None:
+        mask = len(self._keys) - 1
+        index = self._hash(entity)
+        insert_at = -1
+        while (key := self._keys[index]) != _EMPTY_KEY:
+            if key == entity:
+                self._tats[index] = tat
+                return
+
+            if key == _DELETED_KEY and insert_at == -1:
+                insert_at = index
+
+            index = (index + 1) & mask
+
+        if insert_at == -1:
+            insert_at = index
+            self._used += 1
+
+        self._keys[insert_at] = entity
+        self._tats[insert_at] = tat
+        self._length += 1
+
+    def _get_tat(self, entity: int) -> float:
+        index = self._find(entity)
+        return self._tats[index] if index != -1 else 0.0
+
+    def add_call(self, entity: snowflakes.Snowflake, /) -> None:
+        if entity == _EMPTY_KEY or entity == _DELETED_KEY:
+            raise ValueError(f"{entity} cannot be tracked by this pool")
+
+        if (self._used + 1) * 2 > len(self._keys):
+            # This is sized by the live entries so a table that's mostly deleted entries is shrunk rather than just
+            # having its deleted entries cleared out.
+            self._resize(max(3, ((self._length + 1) * 4 - 1).bit_length()))
+
+        self._set(entity, max(self._get_tat(entity), time.monotonic()) + self.rate.emission_interval)
+
+    def get_level(self, entity: snowflakes.Snowflake, /) -> int:
+        return max(0, math.ceil((self._get_tat(entity) - time.monotonic()) / self.rate.emission_interval))
+
+    def is_limited(self, entity: snowflakes.Snowflake, /) -> bool:
+        return self._get_tat(entity) - time.monotonic() > self.rate.tolerance
+
+    def retry_after(self, entity: snowflakes.Snowflake, /) -> float:
+        return max(0.0, self._get_tat(entity) - self.rate.tolerance - time.monotonic())
+
+    def garbage_collect(self, *, max_slots: int = 65_536) -> int:
+        """Sweep the next chunk of slots for expired entries.
+
+        Each call carries on from where the last one stopped, wrapping around at the end of the table, so this
+        should be called often enough for the whole table to be swept within the rate's period.
+
+        Other Parameters
+        ----------------
+        max_slots : int
+            The maximum amount of slots to check. Defaults to `65_536`.
+
+        Returns
+        -------
+        int
+            How many entries were dropped.
+        """
+        now = time.monotonic()
+        keys = self._keys
+        tats = self._tats
+        start = self._cursor
+        end = min(len(keys), start + max_slots)
+        count = 0
+        # Entries are only marked as deleted here to avoid breaking probe chains, these are then cleared out when
+        # the table's next resized.
+        for index in range(start, end):
+            if tats[index] <= now and keys[index] != _EMPTY_KEY and keys[index] != _DELETED_KEY:
+                keys[index] = _DELETED_KEY
+                count += 1
+
+        self._cursor = end if end < len(keys) else 0
+        self._length -= count
+        return count
+
+
+def _get_affinity_entity(ctx: traits.Context, affinity: int) -> snowflakes.Snowflake:
+    if affinity == Affinity.USER:
+        return ctx.message.author.id
+
+    if affinity == Affinity.GUILD and ctx.message.guild_id is not None:
+        return ctx.message.guild_id
+
+    # DM channels are treated as their own guild.
+    return ctx.message.channel_id
+
+
+class CommandLimiter:
+    """A pre-execution hook used to rate limit command calls before they're parsed.
+
+    Calls are tracked in a `ComplexBucketPool` of GCRA buckets where the pools are keyed by guild (or DM channel)
+    and the buckets are keyed by the configured affinity. Going over the limit will lead to the command being
+    delayed if the wait is within `max_delay` otherwise it'll be silently ignored.
+
+    Parameters
+    ----------
+    rate : GCRARate
+        The rate limit to apply.
+
+    Other Parameters
+    ----------------
+    affinity : Affinity
+        What entity the limit should apply to. Defaults to `Affinity.USER`.
+    max_delay : float
+        The maximum amount of seconds a command call should be delayed by before it's ignored instead.
+        Defaults to `0.0`.
+    """
+
+    __slots__: typing.Sequence[str] = ("max_delay", "pool", "rate")
+
+    def __init__(self, rate: GCRARate, /, *, affinity: Affinity = Affinity.USER, max_delay: float = 0.0) -> None:
+        self.max_delay = max_delay
+        self.pool = ComplexBucketPool(
+            affinity, datetime.timedelta(seconds=rate.period), bucket_factory=rate.create_bucket
+        )
+        self.rate = rate
+
+    async def __call__(self, ctx: traits.Context, /) -> bool:
+        pool = self.pool.get_or_create_pool(ctx.message.guild_id or ctx.message.channel_id)
+        bucket = pool.get_or_create_bucket(_get_affinity_entity(ctx, self.pool.affinity))
+        assert isinstance(bucket, GCRABucket)
+
+        if bucket.is_limited:
+            retry_after = bucket.retry_after
+            if retry_after > self.max_delay:
+                return False
+
+            # The call's slot is claimed before sleeping so concurrent calls queue up behind it.
+            bucket.add_call()
+            await asyncio.sleep(retry_after)
+            return True
+
+        bucket.add_call()
+        return True
+
+    def garbage_collect(self) -> int:
+        return self.pool.garbage_collect()
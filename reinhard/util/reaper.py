@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["ReapCallbackT", "TimerWheel"]
+
+import asyncio
+import collections
+import logging
+import math
+import typing
+
+ReapCallbackT = typing.Callable[[], int]
+"""A garbage collection callback which returns how many entries it reclaimed."""
+
+_LOGGER = logging.getLogger("hikari.reinhard.reaper")
+
+
+class _Timer:
+    __slots__: typing.Sequence[str] = ("callback", "deadline", "interval")
+
+    def __init__(self, callback: ReapCallbackT, interval: int, deadline: int) -> None:
+        self.callback = callback
+        self.deadline = deadline
+        self.interval = interval
+
+
+class TimerWheel:
+    """A hierarchical timer wheel used to periodically garbage collect expiring collections.
+
+    Registered callbacks are bucketed by when they're next due, so each tick only has to look at the callbacks which
+    are due on that tick rather than every registered callback. Due callbacks are run in batches of at most
+    `batch_size` callbacks per tick from a single background task. This only bounds how many callbacks are called
+    per tick, so each callback is expected to bound how much work a single call does (e.g. by sweeping in chunks).
+
+    Other Parameters
+    ----------------
+    batch_size : int
+        The maximum amount of callbacks which should be called per tick, any left over will be called on the next
+        tick. Defaults to `100`.
+    levels : int
+        How many levels this wheel should have. Defaults to `3`.
+    slots : int
+        How many slots each level should have. Defaults to `64`.
+    tick : float
+        How many seconds each tick lasts. Defaults to `1.0`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_batch_size",
+        "_levels",
+        "_now",
+        "_pending",
+        "_reclaimed",
+        "_slot_count",
+        "_task",
+        "_tick",
+        "_timers",
+    )
+
+    def __init__(self, *, batch_size: int = 100, levels: int = 3, slots: int = 64, tick: float = 1.0) -> None:
+        if batch_size < 1 or levels < 1 or slots < 2:
+            raise ValueError("batch_size and levels must be greater than 0 and slots must be greater than 1")
+
+        self._batch_size = batch_size
+        self._levels: typing.List[typing.List[typing.List[_Timer]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._now = 0
+        self._pending: typing.Deque[_Timer] = collections.deque()
+        self._reclaimed = 0
+        self._slot_count = slots
+        self._task: typing.Optional[asyncio.Task[None]] = None
+        self._tick = tick
+        self._timers: typing.Dict[ReapCallbackT, _Timer] = {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    @property
+    def is_alive(self) -> bool:
+        return self._task is not None
+
+    @property
+    def reclaimed(self) -> int:
+        """How many entries have been reclaimed by this wheel's callbacks."""
+        return self._reclaimed
+
+    def _schedule(self, timer: _Timer) -> None:
+        delay = timer.deadline - self._now
+        if delay <= 0:
+            self._pending.append(timer)
+            return
+
+        # Find the lowest level with the range to hold this delay, falling back to the top level where the timer
+        # will be re-cascaded each time its slot comes around until it's due.
+        for level, slots in enumerate(self._levels):
+            span = self._slot_count ** level
+            if delay < span * self._slot_count or level == len(self._levels) - 1:
+                slots[(timer.deadline // span) % self._slot_count].append(timer)
+                break
+
+    def _advance(self) -> None:
+        self._now += 1
+        for level, slots in enumerate(self._levels):
+            span = self._slot_count ** level
+            if self._now % span:
+                break
+
+            slot = slots[(self._now // span) % self._slot_count]
+            timers = slot.copy()
+            slot.clear()
+            for timer in timers:
+                # Timers may have been removed since they were scheduled.
+                if self._timers.get(timer.callback) is timer:
+                    self._schedule(timer)
+
+    def _run_pending(self) -> int:
+        count = 0
+        for _ in range(min(self._batch_size, len(self._pending))):
+            timer = self._pending.popleft()
+            if self._timers.get(timer.callback) is not timer:
+                continue
+
+            try:
+                count += timer.callback()
+
+            except Exception as exc:
+                _LOGGER.exception("Reap callback %r raised an exception", timer.callback, exc_info=exc)
+
+            timer.deadline = self._now + timer.interval
+            self._schedule(timer)
+
+        self._reclaimed += count
+        return count
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._tick)
+            self._advance()
+            self._run_pending()
+
+    def add_callback(self, callback: ReapCallbackT, interval: float, /) -> None:
+        """Register a garbage collection callback.
+
+        Parameters
+        ----------
+        callback : ReapCallbackT
+            The callback to call. This should return the amount of entries it reclaimed.
+        interval : float
+            How often (in seconds) this should be called.
+        """
+        if callback in self._timers:
+            raise ValueError(f"Callback {callback!r} is already registered")
+
+        interval_ticks = max(1, math.ceil(interval / self._tick))
+        timer = _Timer(callback, interval_ticks, self._now + interval_ticks)
+        self._timers[callback] = timer
+        self._schedule(timer)
+
+    def remove_callback(self, callback: ReapCallbackT, /) -> None:
+        # Any references left in the slots are lazily skipped.
+        del self._timers[callback]
+
+    def reap(self) -> int:
+        """Call every registered callback now, ignoring the batch limit.
+
+        Returns
+        -------
+        int
+            How many entries were reclaimed.
+        """
+        count = 0
+        for timer in self._timers.values():
+            try:
+                count += timer.callback()
+
+            except Exception as exc:
+                _LOGGER.exception("Reap callback %r raised an exception", timer.callback, exc_info=exc)
+
+        self._reclaimed += count
+        return count
+
+    def open(self) -> None:
+        if self._task is not None:
+            raise RuntimeError("Timer wheel is already running")
+
+        self._task = asyncio.create_task(self._loop())
+
+    async def close(self) -> None:
+        if self._task is None:
+            raise RuntimeError("Timer wheel is not running")
+
+        task = self._task
+        self._task = None
+        task.cancel()
+        try:
+            await task
+
+        except asyncio.CancelledError:
+            pass
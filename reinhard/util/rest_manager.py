@@ -1,39 +1,380 @@
 from __future__ import annotations
 
-__all__: typing.Sequence[str] = ["AIOHTTPStatusHandler", "HikariErrorManager"]
+__all__: typing.Sequence[str] = [
+    "AIOHTTPStatusHandler",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "DEFAULT_RETRY_BUDGET",
+    "HikariErrorManager",
+    "RetryBudget",
+    "get_circuit_breaker",
+]
 
+import asyncio
+import enum
 import logging
+import math
+import re
+import time
+import types
 import typing
+import urllib.parse
 
 import aiohttp
 from hikari import errors as hikari_errors
 from tanjun import errors as tanjun_errors
 from yuyo import backoff
 
+from reinhard.util import metrics
+from reinhard.util import sessions
+
 _LOGGER = logging.getLogger("hikari.reinhard.rest_manager")
+_SNOWFLAKE_PATTERN: typing.Final[typing.Pattern[str]] = re.compile(r"\d{15,21}")
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    """Requests are let through as normal."""
+
+    OPEN = "open"
+    """The host is assumed to be down and requests fail fast."""
+
+    HALF_OPEN = "half-open"
+    """A single probe request is let through to check whether the host has recovered."""
+
+
+class CircuitOpenError(tanjun_errors.CommandError):
+    """Error raised when a request is attempted against a host whose circuit is open."""
+
+    __slots__: typing.Sequence[str] = ("host", "retry_after")
+
+    def __init__(self, host: str, retry_after: float, /) -> None:
+        super().__init__(f"{host} is currently unavailable, try again in {max(1, round(retry_after))} seconds")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """A closed/open/half-open circuit breaker for requests to an upstream host.
+
+    Parameters
+    ----------
+    name : str
+        Name of the host this breaker is for.
+
+    Other Parameters
+    ----------------
+    failure_threshold : int
+        How many consecutive failures open the circuit. Defaults to `5`.
+    reset_timeout : float
+        How many seconds the circuit stays open for before a probe request is let through. Defaults to `30.0`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "failure_threshold",
+        "_failures",
+        "name",
+        "_opened_at",
+        "_probing",
+        "reset_timeout",
+    )
+
+    def __init__(self, name: str, /, *, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self._failures = 0
+        self.name = name
+        self._opened_at: typing.Optional[float] = None
+        self._probing = False
+        self.reset_timeout = reset_timeout
+
+    @property
+    def retry_after(self) -> float:
+        """How many seconds are left until a probe request will be let through."""
+        if self._opened_at is None:
+            return 0.0
+
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return CircuitState.OPEN
+
+        return CircuitState.HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """Check whether a request should be let through, claiming the probe if the circuit is half-open."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+
+        if state is CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+
+        return False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                _LOGGER.warning("Opening circuit for %s after %s consecutive failures", self.name, self._failures)
+
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release(self) -> None:
+        """Release the probe claimed by a request which ended without a response (e.g. through being cancelled)."""
+        self._probing = False
+
+
+_CIRCUIT_BREAKERS: typing.Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(host: str, /) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a host, creating it if it doesn't exist yet."""
+    if (breaker := _CIRCUIT_BREAKERS.get(host)) is None:
+        breaker = _CIRCUIT_BREAKERS[host] = CircuitBreaker(host)
+
+    return breaker
+
+
+def _enter_circuit(host: typing.Optional[str], /) -> None:
+    if host is not None and not (breaker := get_circuit_breaker(host)).allow_request():
+        raise CircuitOpenError(host, breaker.retry_after)
+
+
+def _exit_circuit(host: typing.Optional[str], /, *, is_failure: bool, got_response: bool) -> None:
+    if host is None:
+        return
+
+    breaker = get_circuit_breaker(host)
+    if is_failure:
+        breaker.record_failure()
+
+    # Only a response proves the host's reachable, errors raised before a request was sent (e.g. by the local
+    # throttle) or cancellation just give up the probe.
+    elif got_response:
+        breaker.record_success()
+
+    else:
+        breaker.release()
+
+
+class _RollingCounter:
+    __slots__: typing.Sequence[str] = ("_counts", "_slot_length", "_start")
+
+    def __init__(self, window: float, slots: int, /) -> None:
+        self._counts = [0] * slots
+        self._slot_length = window / slots
+        self._start = math.floor(time.monotonic() / self._slot_length)
+
+    def _advance(self) -> int:
+        current = math.floor(time.monotonic() / self._slot_length)
+        # Clear the slots which have fallen out of the window since the last call.
+        for slot in range(max(self._start + 1, current - len(self._counts) + 1), current + 1):
+            self._counts[slot % len(self._counts)] = 0
+
+        self._start = max(self._start, current)
+        return current
+
+    def increment(self) -> None:
+        self._counts[self._advance() % len(self._counts)] += 1
+
+    def total(self) -> int:
+        self._advance()
+        return sum(self._counts)
+
+
+class RetryBudget:
+    """A process-wide limit on how many retries may be made relative to recent successful requests.
+
+    This stops the bot from multiplying its own traffic while an upstream is having an outage, as each retry loop
+    otherwise retries independently.
+
+    Other Parameters
+    ----------------
+    min_retries : int
+        The amount of retries which are always allowed within `window` regardless of successful requests, this lets
+        low traffic periods still retry. Defaults to `10`.
+    ratio : float
+        The amount of retries allowed per successful request within `window`. Defaults to `0.2`.
+    window : float
+        How many seconds requests are tracked for. Defaults to `10.0`.
+    """
+
+    __slots__: typing.Sequence[str] = ("min_retries", "ratio", "_retries", "_successes")
+
+    def __init__(self, *, min_retries: int = 10, ratio: float = 0.2, window: float = 10.0) -> None:
+        self.min_retries = min_retries
+        self.ratio = ratio
+        self._retries = _RollingCounter(window, 10)
+        self._successes = _RollingCounter(window, 10)
+
+    @property
+    def available(self) -> int:
+        """How many retries may currently be made."""
+        allowed = self.min_retries + math.floor(self._successes.total() * self.ratio)
+        return max(0, allowed - self._retries.total())
+
+    def record_success(self) -> None:
+        self._successes.increment()
+
+    def try_retry(self) -> bool:
+        """Try to withdraw a retry from this budget.
+
+        Returns
+        -------
+        bool
+            Whether the retry is allowed.
+        """
+        if not self.available:
+            return False
+
+        self._retries.increment()
+        return True
+
+
+DEFAULT_RETRY_BUDGET: typing.Final[RetryBudget] = RetryBudget()
+"""The retry budget shared by the error managers by default."""
+
+
+def _record_attempt(target: str, /) -> None:
+    metrics.REGISTRY.counter("reinhard_rest_attempts_total", target=target).inc()
+
+
+def _record_break(target: str, route: str, /) -> None:
+    metrics.REGISTRY.counter("reinhard_rest_breaks_total", route=route, target=target).inc()
+
+
+def _record_failure(target: str, route: str, exception: BaseException, /) -> None:
+    reason = type(exception).__name__
+    metrics.REGISTRY.counter("reinhard_rest_failures_total", reason=reason, route=route, target=target).inc()
+
+
+def _record_retry(target: str, route: str, reason: str, /, *, retry_after: typing.Optional[float] = None) -> None:
+    metrics.REGISTRY.counter("reinhard_rest_retries_total", reason=reason, route=route, target=target).inc()
+    if retry_after is not None:
+        metrics.REGISTRY.histogram("reinhard_rest_retry_after_seconds", target=target).observe(retry_after)
+
+
+def _hikari_route(exception: typing.Optional[BaseException], /) -> str:
+    if isinstance(exception, hikari_errors.RateLimitedError):
+        return f"{exception.route.route.method} {exception.route.route.path_template}"
+
+    if isinstance(exception, hikari_errors.HTTPResponseError):
+        return _SNOWFLAKE_PATTERN.sub("{id}", urllib.parse.urlsplit(exception.url).path)
+
+    return "unknown"
+
+
+def _aiohttp_route(exception: typing.Optional[BaseException], /) -> str:
+    if isinstance(exception, aiohttp.ClientResponseError) and exception.request_info:
+        return exception.request_info.real_url.path
+
+    return "unknown"
 
 
 class HikariErrorManager(backoff.ErrorManager):
-    __slots__: typing.Sequence[str] = ("_backoff_handler")
+    """Error manager for retrying requests made through Hikari's REST client.
+
+    Other Parameters
+    ----------------
+    break_on : typing.Iterable[typing.Type[BaseException]]
+        Exceptions which should stop the retry loop.
+    host : typing.Optional[str]
+        Name of the circuit breaker this should report server errors to and fail fast through. Defaults to `None`
+        which disables circuit breaking.
+    retry_budget : RetryBudget
+        The budget server errors are only retried within. Defaults to `DEFAULT_RETRY_BUDGET`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_backoff_handler", "_host", "_retry_budget")
 
     def __init__(
-        self, backoff_handler: backoff.Backoff, /, *, break_on: typing.Iterable[typing.Type[BaseException]] = ()
+        self,
+        backoff_handler: backoff.Backoff,
+        /,
+        *,
+        break_on: typing.Iterable[typing.Type[BaseException]] = (),
+        host: typing.Optional[str] = None,
+        retry_budget: RetryBudget = DEFAULT_RETRY_BUDGET,
     ) -> None:
         self._backoff_handler = backoff_handler
+        self._host = host
+        self._retry_budget = retry_budget
         super().__init__()
         self.clear_rules(break_on=break_on)
 
-    def _on_break_on(self, _: BaseException) -> bool:
+    @property
+    def _target(self) -> str:
+        return self._host or "discord"
+
+    def __enter__(self) -> HikariErrorManager:
+        try:
+            _enter_circuit(self._host)
+
+        except CircuitOpenError as exc:
+            _record_failure(self._target, "unknown", exc)
+            raise
+
+        return self
+
+    def __exit__(
+        self,
+        exception_type: typing.Optional[typing.Type[BaseException]],
+        exception: typing.Optional[BaseException],
+        exception_traceback: typing.Optional[types.TracebackType],
+    ) -> typing.Optional[bool]:
+        _exit_circuit(
+            self._host,
+            is_failure=isinstance(exception, hikari_errors.InternalServerError),
+            got_response=exception is None or isinstance(exception, hikari_errors.HTTPResponseError),
+        )
+        _record_attempt(self._target)
+        if exception is None:
+            self._retry_budget.record_success()
+            return None
+
+        try:
+            suppress = super().__exit__(exception_type, exception, exception_traceback)
+
+        except BaseException as exc:
+            _record_failure(self._target, _hikari_route(exception), exc)
+            raise
+
+        if not suppress:
+            _record_failure(self._target, _hikari_route(exception), exception)
+
+        return suppress
+
+    def _on_break_on(self, exception: BaseException) -> bool:
+        _record_break(self._target, _hikari_route(exception))
         self._backoff_handler.finish()
         return False
 
-    def _on_internal_server_error(self, _: hikari_errors.InternalServerError) -> bool:
+    def _on_internal_server_error(self, exception: hikari_errors.InternalServerError) -> bool:
+        # Re-raise rather than retrying once the shared retry budget has run out.
+        if not self._retry_budget.try_retry():
+            return True
+
+        _record_retry(self._target, _hikari_route(exception), "internal_server_error")
         return False
 
     def _on_rate_limited_error(self, exception: hikari_errors.RateLimitedError) -> bool:
         if exception.retry_after > 10:
             return True
 
+        _record_retry(self._target, _hikari_route(exception), "rate_limited", retry_after=exception.retry_after)
         self._backoff_handler.set_next_backoff(exception.retry_after)
         return False
 
@@ -47,7 +388,23 @@ class HikariErrorManager(backoff.ErrorManager):
 
 
 class AIOHTTPStatusHandler(backoff.ErrorManager):
-    __slots__: typing.Sequence[str] = ("_backoff_handler", "_break_on", "_on_404")
+    """Error manager for retrying requests made through aiohttp.
+
+    Other Parameters
+    ----------------
+    break_on : typing.Iterable[int]
+        Response status codes which should stop the retry loop.
+    host : typing.Optional[str]
+        The host requests are being made to. When this is passed, 5xx responses, connection errors and timeouts are
+        reported to the host's circuit breaker and entering this fails fast with `CircuitOpenError` while the
+        circuit is open.
+    on_404 : typing.Optional[str]
+        If passed then a 404 will raise a command error with this message.
+    retry_budget : RetryBudget
+        The budget 5xx and 429 responses are only retried within. Defaults to `DEFAULT_RETRY_BUDGET`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_backoff_handler", "_break_on", "_host", "_on_404", "_retry_budget")
 
     def __init__(
         self,
@@ -55,30 +412,88 @@ class AIOHTTPStatusHandler(backoff.ErrorManager):
         /,
         *,
         break_on: typing.Iterable[int] = (),
+        host: typing.Optional[str] = None,
         on_404: typing.Optional[str] = None,
+        retry_budget: RetryBudget = DEFAULT_RETRY_BUDGET,
     ) -> None:
         super().__init__()
         self._backoff_handler = backoff_handler
         self._break_on: typing.AbstractSet[int] = set()
+        self._host = host
         self._on_404: typing.Optional[str] = None
+        self._retry_budget = retry_budget
         self.clear_rules(break_on=break_on, on_404=on_404)
 
+    @property
+    def _target(self) -> str:
+        return self._host or "unknown"
+
+    def __enter__(self) -> AIOHTTPStatusHandler:
+        try:
+            _enter_circuit(self._host)
+
+        except CircuitOpenError as exc:
+            _record_failure(self._target, "unknown", exc)
+            raise
+
+        return self
+
+    def __exit__(
+        self,
+        exception_type: typing.Optional[typing.Type[BaseException]],
+        exception: typing.Optional[BaseException],
+        exception_traceback: typing.Optional[types.TracebackType],
+    ) -> typing.Optional[bool]:
+        is_failure = isinstance(exception, (aiohttp.ClientConnectionError, asyncio.TimeoutError)) or (
+            isinstance(exception, aiohttp.ClientResponseError) and exception.status >= 500
+        )
+        _exit_circuit(
+            self._host,
+            is_failure=is_failure,
+            got_response=exception is None or isinstance(exception, aiohttp.ClientResponseError),
+        )
+        _record_attempt(self._target)
+        if exception is None:
+            self._retry_budget.record_success()
+            return None
+
+        try:
+            suppress = super().__exit__(exception_type, exception, exception_traceback)
+
+        except BaseException as exc:
+            _record_failure(self._target, _aiohttp_route(exception), exc)
+            raise
+
+        if not suppress:
+            _record_failure(self._target, _aiohttp_route(exception), exception)
+
+        return suppress
+
     def _on_client_response_error(self, exception: aiohttp.ClientResponseError) -> bool:
         if exception.status in self._break_on:
+            _record_break(self._target, _aiohttp_route(exception))
             self._backoff_handler.finish()
             return False
 
+        if exception.status >= 500 or exception.status == 429:
+            # Re-raise rather than retrying once the shared retry budget has run out.
+            if not self._retry_budget.try_retry():
+                return True
+
         if exception.status >= 500:
+            _record_retry(self._target, _aiohttp_route(exception), "server_error")
             return False
 
         if exception.status == 429:
             raw_retry_after = exception.headers.get("Retry-After") if exception.headers else None
+            retry_after: typing.Optional[float] = None
             if raw_retry_after is not None:
                 retry_after = float(raw_retry_after)
 
                 if retry_after <= 10:
                     self._backoff_handler.set_next_backoff(retry_after)
 
+            _record_retry(self._target, _aiohttp_route(exception), "rate_limited", retry_after=retry_after)
             return False
 
         if self._on_404 is not None and exception.status == 404:
@@ -86,8 +501,16 @@ class AIOHTTPStatusHandler(backoff.ErrorManager):
 
         return True
 
+    def _on_throttled_error(self, exception: sessions.ThrottledError) -> bool:
+        # The host's rate limit headers say it won't accept requests for a while, so there's no point retrying.
+        self._backoff_handler.finish()
+        raise tanjun_errors.CommandError(
+            f"{exception.host} is rate limiting requests, try again in {max(1, round(exception.retry_after))} seconds"
+        ) from None
+
     def clear_rules(self, *, break_on: typing.Iterable[int] = (), on_404: typing.Optional[str] = None) -> None:
         super().clear_rules()
         self.with_rule((aiohttp.ClientResponseError,), self._on_client_response_error)
+        self.with_rule((sessions.ThrottledError,), self._on_throttled_error)
         self._break_on = set(break_on)
         self._on_404 = on_404
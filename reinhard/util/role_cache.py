@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["GuildRoles", "RoleCache", "fetch_guild_roles"]
+
+import typing
+
+from hikari.events import guild_events
+from hikari.events import role_events
+
+from reinhard.util import cache
+from reinhard.util import single_flight
+
+if typing.TYPE_CHECKING:
+    from hikari import guilds
+    from hikari import snowflakes
+    from hikari import traits as hikari_traits
+    from hikari.api import event_dispatcher
+    from tanjun import traits as tanjun_traits
+
+
+class GuildRoles:
+    """A snapshot of a guild's roles indexed by ID and by casefolded name.
+
+    When multiple roles share a name, the name index points to the highest positioned one. This also tracks the
+    guild's owner as that's needed alongside the roles to work out a member's permissions.
+    """
+
+    __slots__: typing.Sequence[str] = ("_by_id", "_by_name", "owner_id")
+
+    def __init__(self, roles: typing.Iterable[guilds.Role], /, *, owner_id: snowflakes.Snowflake) -> None:
+        self._by_id: typing.Dict[snowflakes.Snowflake, guilds.Role] = {role.id: role for role in roles}
+        self._by_name: typing.Dict[str, guilds.Role] = {}
+        self.owner_id = owner_id
+        self._index_names()
+
+    @classmethod
+    def from_guild(cls, guild: guilds.Guild, /) -> GuildRoles:
+        return cls(guild.roles.values(), owner_id=guild.owner_id)
+
+    def __contains__(self, role_id: typing.Any, /) -> bool:
+        return role_id in self._by_id
+
+    def __getitem__(self, role_id: snowflakes.Snowflake, /) -> guilds.Role:
+        return self._by_id[role_id]
+
+    def __iter__(self) -> typing.Iterator[guilds.Role]:
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _index_names(self) -> None:
+        self._by_name.clear()
+        for role in sorted(self._by_id.values(), key=lambda role: role.position):
+            self._by_name[role.name.casefold()] = role
+
+    def add(self, role: guilds.Role, /) -> None:
+        # Guilds are capped at 250 roles so rebuilding the name index is cheap and keeps it consistent.
+        self._by_id[role.id] = role
+        self._index_names()
+
+    def find(self, name: str, /) -> typing.Optional[guilds.Role]:
+        """Find a role by its name (case-insensitive)."""
+        return self._by_name.get(name.casefold())
+
+    def get(self, role_id: snowflakes.Snowflake, /) -> typing.Optional[guilds.Role]:
+        return self._by_id.get(role_id)
+
+    def remove(self, role_id: snowflakes.Snowflake, /) -> None:
+        if self._by_id.pop(role_id, None) is not None:
+            self._index_names()
+
+
+class RoleCache:
+    """A LRU cache of per-guild role snapshots which is kept up to date by gateway events.
+
+    This only relies on role, guild update and guild leave events rather than Hikari's cache so it works with minimal
+    cache settings.
+
+    Other Parameters
+    ----------------
+    expire_after : int
+        How many seconds snapshots should be kept for before being re-fetched, this only acts as a safety net for
+        missed events. Defaults to `3600`.
+    max_guilds : int
+        The maximum amount of guilds to keep snapshots for. Defaults to `1000`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_guilds", "_in_flight")
+
+    def __init__(self, *, expire_after: int = 3600, max_guilds: int = 1000) -> None:
+        self._guilds: cache.ExpiringDict[snowflakes.Snowflake, GuildRoles] = cache.ExpiringDict(
+            expire_after, lru=True, max_length=max_guilds
+        )
+        self._in_flight: single_flight.SingleFlight[snowflakes.Snowflake, GuildRoles] = single_flight.SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._guilds)
+
+    def get_cached(self, guild_id: snowflakes.Snowflake, /) -> typing.Optional[GuildRoles]:
+        return self._guilds.get(guild_id)
+
+    async def get_roles(self, rest: hikari_traits.RESTAware, guild_id: snowflakes.Snowflake, /) -> GuildRoles:
+        """Get a guild's roles, fetching them if they aren't cached.
+
+        Concurrent fetches for the same guild share one request and any REST errors are raised as-is.
+        """
+        if (roles := self._guilds.get(guild_id)) is not None:
+            return roles
+
+        async def fetch() -> GuildRoles:
+            roles = GuildRoles.from_guild(await rest.rest.fetch_guild(guild_id))
+            self._guilds[guild_id] = roles
+            return roles
+
+        return await self._in_flight.run(guild_id, fetch)
+
+    def garbage_collect(self) -> int:
+        return self._guilds.gc()
+
+    async def on_guild_leave(self, event: guild_events.GuildLeaveEvent, /) -> None:
+        self._guilds.pop(event.guild_id, None)
+
+    async def on_guild_update(
+        self, event: typing.Union[guild_events.GuildAvailableEvent, guild_events.GuildUpdateEvent], /
+    ) -> None:
+        # These events include the full role list so there's no need to wait for a request to cache them but they're
+        # only used to refresh guilds which are already cached to avoid filling the cache with every guild on startup.
+        if event.guild_id in self._guilds:
+            self._guilds[event.guild_id] = GuildRoles(event.roles.values(), owner_id=event.guild.owner_id)
+
+    async def on_role_create(
+        self, event: typing.Union[role_events.RoleCreateEvent, role_events.RoleUpdateEvent], /
+    ) -> None:
+        if (roles := self._guilds.get(event.guild_id)) is not None:
+            roles.add(event.role)
+
+    async def on_role_delete(self, event: role_events.RoleDeleteEvent, /) -> None:
+        if (roles := self._guilds.get(event.guild_id)) is not None:
+            roles.remove(event.role_id)
+
+    def _listeners(
+        self,
+    ) -> typing.Iterator[typing.Tuple[typing.Type[typing.Any], event_dispatcher.CallbackT[typing.Any]]]:
+        yield guild_events.GuildAvailableEvent, self.on_guild_update
+        yield guild_events.GuildLeaveEvent, self.on_guild_leave
+        yield guild_events.GuildUpdateEvent, self.on_guild_update
+        yield role_events.RoleCreateEvent, self.on_role_create
+        yield role_events.RoleDeleteEvent, self.on_role_delete
+        yield role_events.RoleUpdateEvent, self.on_role_create
+
+    def subscribe(self, dispatcher: event_dispatcher.EventDispatcher, /) -> None:
+        for event_type, callback in self._listeners():
+            dispatcher.subscribe(event_type, callback)
+
+    def unsubscribe(self, dispatcher: event_dispatcher.EventDispatcher, /) -> None:
+        for event_type, callback in self._listeners():
+            dispatcher.unsubscribe(event_type, callback)
+
+
+async def fetch_guild_roles(client: tanjun_traits.Client, guild_id: snowflakes.Snowflake, /) -> GuildRoles:
+    """Get a guild's roles through the client's role cache if it has one, otherwise fetching them."""
+    if isinstance(role_cache := getattr(client, "role_cache", None), RoleCache):
+        return await role_cache.get_roles(client.rest_service, guild_id)
+
+    return GuildRoles.from_guild(await client.rest_service.rest.fetch_guild(guild_id))
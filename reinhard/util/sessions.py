@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["HostThrottle", "SessionManager", "ThrottledError"]
+
+import asyncio
+import email.utils
+import logging
+import time
+import typing
+
+import aiohttp
+
+if typing.TYPE_CHECKING:
+    import types
+
+    from multidict import CIMultiDictProxy
+
+_LOGGER = logging.getLogger("hikari.reinhard.sessions")
+# Reset headers are either a relative amount of seconds or a unix timestamp, which will be well above this.
+_MIN_TIMESTAMP: typing.Final[float] = 1_000_000_000
+
+
+class ThrottledError(aiohttp.ClientError):
+    """Error raised when a request would have to wait longer than the throttle's `max_delay` to be sent."""
+
+    __slots__: typing.Sequence[str] = ("host", "retry_after")
+
+    def __init__(self, host: str, retry_after: float, /) -> None:
+        super().__init__(f"Requests to {host} are rate limited for another {retry_after:.2f} seconds")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def _parse_float(value: typing.Optional[str], /) -> typing.Optional[float]:
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+
+    except ValueError:
+        return None
+
+
+def _parse_retry_after(value: typing.Optional[str], /) -> typing.Optional[float]:
+    if (seconds := _parse_float(value)) is not None or value is None:
+        return seconds
+
+    # Retry-After may also be a HTTP date.
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+
+    except (TypeError, ValueError):
+        return None
+
+
+class HostThrottle:
+    """Client-side pacing of the requests made to a host based on the rate limit headers it returns.
+
+    This reads `Retry-After`, `X-RateLimit-Remaining`, `X-RateLimit-Reset` and `X-RateLimit-Reset-After` from
+    responses and spreads the requests which are still allowed in the current window out over what's left of it,
+    holding all requests while the limit is exhausted.
+
+    Other Parameters
+    ----------------
+    max_delay : float
+        The longest a request should be held for, requests which would be held for longer fail with
+        `ThrottledError`. Defaults to `30.0`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_blocked_until", "_interval", "_interval_until", "max_delay", "_next_slot")
+
+    def __init__(self, *, max_delay: float = 30.0) -> None:
+        self._blocked_until = 0.0
+        self._interval = 0.0
+        self._interval_until = 0.0
+        self.max_delay = max_delay
+        self._next_slot = 0.0
+
+    def reserve(self, *, max_delay: typing.Optional[float] = None) -> float:
+        """Reserve the next slot for a request.
+
+        Other Parameters
+        ----------------
+        max_delay : typing.Optional[float]
+            If provided, the slot is only reserved if the request would have to wait for this many seconds or less.
+
+        Returns
+        -------
+        float
+            How many seconds the request should wait before being sent. If this is greater than `max_delay` then no
+            slot was reserved.
+        """
+        now = time.monotonic()
+        slot = max(now, self._blocked_until, self._next_slot)
+        delay = slot - now
+        # Rejected requests mustn't take up a slot, otherwise each rejection would push the lockout back further.
+        if max_delay is not None and delay > max_delay:
+            return delay
+
+        interval = self._interval if now < self._interval_until else 0.0
+        self._next_slot = slot + interval
+        return delay
+
+    def update(self, status: int, headers: CIMultiDictProxy[str], /) -> None:
+        """Update this throttle with the headers of a response."""
+        now = time.monotonic()
+        if status in (429, 503) and (retry_after := _parse_retry_after(headers.get("Retry-After"))) is not None:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+        reset_after = _parse_float(headers.get("X-RateLimit-Reset-After"))
+        if reset_after is None and (reset_after := _parse_float(headers.get("X-RateLimit-Reset"))) is not None:
+            if reset_after > _MIN_TIMESTAMP * 1000:
+                # Some APIs give this as a timestamp in milliseconds.
+                reset_after = reset_after / 1000 - time.time()
+
+            elif reset_after > _MIN_TIMESTAMP:
+                reset_after -= time.time()
+
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        if reset_after is None or remaining is None:
+            return
+
+        reset_after = max(0.0, reset_after)
+        if remaining < 1:
+            self._blocked_until = max(self._blocked_until, now + reset_after)
+
+        else:
+            self._interval = reset_after / remaining
+            self._interval_until = now + reset_after
+
+    async def acquire(self, host: str, /) -> None:
+        """Wait until a request can be sent.
+
+        Raises
+        ------
+        ThrottledError
+            If the request would have to wait longer than `max_delay`.
+        """
+        if (delay := self.reserve(max_delay=self.max_delay)) > self.max_delay:
+            raise ThrottledError(host, delay)
+
+        if delay > 0:
+            _LOGGER.debug("Holding request to %s for %.2f seconds", host, delay)
+            await asyncio.sleep(delay)
+
+
+class SessionManager:
+    """A registry of long-lived aiohttp sessions with a connection pool per upstream host.
+
+    Sharing sessions lets requests to the same host reuse keep-alive connections and cached DNS lookups rather than
+    doing a fresh DNS lookup and TCP+TLS handshake for every request.
+
+    Other Parameters
+    ----------------
+    dns_ttl : int
+        How many seconds DNS lookups should be cached for. Defaults to `300`.
+    keepalive_timeout : float
+        How many seconds idle connections should be kept open for. Defaults to `30.0`.
+    limit_per_host : int
+        The maximum amount of concurrent connections to each host, further requests will wait for a connection to be
+        freed up. Defaults to `10`.
+    max_throttle_delay : float
+        The longest a request should be held back for by its host's `HostThrottle`. Defaults to `30.0`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_dns_ttl",
+        "_headers",
+        "_is_open",
+        "_keepalive_timeout",
+        "_limit",
+        "_max_throttle_delay",
+        "_sessions",
+        "_throttles",
+        "_trace_config",
+    )
+
+    def __init__(
+        self,
+        *,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        limit_per_host: int = 10,
+        max_throttle_delay: float = 30.0,
+    ) -> None:
+        self._dns_ttl = dns_ttl
+        self._headers: typing.Mapping[str, str] = {}
+        self._is_open = False
+        self._keepalive_timeout = keepalive_timeout
+        self._limit = limit_per_host
+        self._max_throttle_delay = max_throttle_delay
+        self._sessions: typing.Dict[str, aiohttp.ClientSession] = {}
+        self._throttles: typing.Dict[str, HostThrottle] = {}
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_request_start.append(self._on_request_start)
+        self._trace_config.on_request_end.append(self._on_request_end)
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    def get_throttle(self, host: str, /) -> HostThrottle:
+        """Get the throttle for a host, creating it if it doesn't exist yet."""
+        if (throttle := self._throttles.get(host)) is None:
+            throttle = self._throttles[host] = HostThrottle(max_delay=self._max_throttle_delay)
+
+        return throttle
+
+    async def _on_request_start(
+        self, _: aiohttp.ClientSession, __: types.SimpleNamespace, params: aiohttp.TraceRequestStartParams
+    ) -> None:
+        if params.url.host:
+            await self.get_throttle(params.url.host).acquire(params.url.host)
+
+    async def _on_request_end(
+        self, _: aiohttp.ClientSession, __: types.SimpleNamespace, params: aiohttp.TraceRequestEndParams
+    ) -> None:
+        if params.url.host:
+            self.get_throttle(params.url.host).update(params.response.status, params.response.headers)
+
+    def get_session(self, host: str, /) -> aiohttp.ClientSession:
+        """Get the shared session for a host, creating it if it doesn't exist yet."""
+        if not self._is_open:
+            raise RuntimeError("Cannot get a session from a closed session manager")
+
+        if (session := self._sessions.get(host)) is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                keepalive_timeout=self._keepalive_timeout,
+                limit=self._limit,
+                limit_per_host=self._limit,
+                ttl_dns_cache=self._dns_ttl,
+                use_dns_cache=True,
+            )
+            session = self._sessions[host] = aiohttp.ClientSession(
+                connector=connector, headers=self._headers, trace_configs=[self._trace_config]
+            )
+
+        return session
+
+    def open(self, *, headers: typing.Optional[typing.Mapping[str, str]] = None) -> None:
+        if self._is_open:
+            raise RuntimeError("Session manager is already open")
+
+        self._headers = dict(headers) if headers else {}
+        self._is_open = True
+
+    async def close(self) -> None:
+        if not self._is_open:
+            raise RuntimeError("Session manager is already closed")
+
+        self._is_open = False
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
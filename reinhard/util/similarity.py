@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = [
+    "AbstractSimilarityBackend",
+    "DEFAULT_BACKEND",
+    "MinHashBackend",
+    "SequenceMatcherBackend",
+]
+
+import abc
+import bisect
+import difflib
+import hashlib
+import heapq
+import math
+import typing
+
+SketchT = typing.TypeVar("SketchT")
+
+
+class AbstractSimilarityBackend(abc.ABC, typing.Generic[SketchT]):
+    """Base class for the strategies used to score how similar two strings are.
+
+    Content is converted to a sketch once (e.g. when a call is made) so that it can then be cheaply compared against
+    any amount of other sketches.
+    """
+
+    __slots__: typing.Sequence[str] = ()
+
+    @abc.abstractmethod
+    def sketch(self, content: str, /) -> SketchT:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def compare(self, first: SketchT, second: SketchT, /) -> float:
+        """Get the similarity ratio of two sketches.
+
+        Returns
+        -------
+        float
+            A ratio between `0.0` and `1.0` where `1.0` is only returned for identical content.
+        """
+        raise NotImplementedError
+
+
+class SequenceMatcherBackend(AbstractSimilarityBackend[str]):
+    """Similarity backend which compares content using `difflib.SequenceMatcher`.
+
+    This is exact but O(n²) per comparison.
+    """
+
+    __slots__: typing.Sequence[str] = ()
+
+    def sketch(self, content: str, /) -> str:
+        return content
+
+    def compare(self, first: str, second: str, /) -> float:
+        return difflib.SequenceMatcher(a=first, b=second).ratio()
+
+
+class _MinHashSketch:
+    __slots__: typing.Sequence[str] = ("digest", "hashes", "length", "ordered_hashes", "threshold")
+
+    def __init__(self, digest: bytes, hashes: typing.Sequence[int], length: int, threshold: float) -> None:
+        self.digest = digest
+        self.hashes = frozenset(hashes)
+        self.length = length
+        self.ordered_hashes = hashes
+        # The largest hash this sketch has seen every shingle for, this is infinite for sketches which were small
+        # enough to hold every shingle.
+        self.threshold = threshold
+
+
+class MinHashBackend(AbstractSimilarityBackend[_MinHashSketch]):
+    """Similarity backend which compares bottom-k MinHash sketches of content's character shingles.
+
+    Identical content is detected through an exact hash and always scores `1.0`, otherwise the Jaccard similarity of
+    the two shingle sets is estimated from their sketches in O(k) time and converted to a Dice coefficient, which
+    tracks `difflib.SequenceMatcher`'s ratio more closely than the raw Jaccard index. As only identical content can
+    score `1.0`, non-identical content is capped just below it.
+
+    Other Parameters
+    ----------------
+    sketch_size : int
+        The maximum amount of hashes to keep per sketch. Defaults to `64`.
+    shingle_size : int
+        The amount of characters per shingle. Defaults to `3`.
+    """
+
+    __slots__: typing.Sequence[str] = ("_shingle_size", "_sketch_size")
+
+    def __init__(self, *, sketch_size: int = 64, shingle_size: int = 3) -> None:
+        if sketch_size < 1 or shingle_size < 1:
+            raise ValueError("sketch_size and shingle_size must be greater than 0")
+
+        self._shingle_size = shingle_size
+        self._sketch_size = sketch_size
+
+    def sketch(self, content: str, /) -> _MinHashSketch:
+        size = self._shingle_size
+        shingles = {content[index : index + size] for index in range(max(1, len(content) - size + 1))}
+        # Python's string hash is randomised per-process but that's fine as sketches are never persisted.
+        hashes = heapq.nsmallest(self._sketch_size, {hash(shingle) for shingle in shingles})
+        threshold = hashes[-1] if len(hashes) == self._sketch_size else math.inf
+        digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        return _MinHashSketch(digest, hashes, len(content), threshold)
+
+    def compare(self, first: _MinHashSketch, second: _MinHashSketch, /) -> float:
+        if first.length == second.length and first.digest == second.digest:
+            return 1.0
+
+        # Every shared hash is under both sketches' thresholds as each sketch holds all its hashes up to its threshold.
+        if not (shared := len(first.hashes & second.hashes)):
+            return 0.0
+
+        # Both sketches hold every hash up to the lower threshold, so the hashes under it are a uniform sample of the
+        # union and the fraction of them which are in both sketches estimates the Jaccard index.
+        threshold = min(first.threshold, second.threshold)
+        union = (
+            bisect.bisect_right(first.ordered_hashes, threshold)
+            + bisect.bisect_right(second.ordered_hashes, threshold)
+            - shared
+        )
+        jaccard = shared / union
+        return min(2 * jaccard / (1 + jaccard), 0.99)
+
+
+DEFAULT_BACKEND: typing.Final[AbstractSimilarityBackend[typing.Any]] = MinHashBackend()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ["SingleFlight"]
+
+import asyncio
+import typing
+
+KeyT = typing.TypeVar("KeyT", bound=typing.Hashable)
+ValueT = typing.TypeVar("ValueT")
+
+
+def _consume_exception(task: asyncio.Task[typing.Any]) -> None:
+    # All the callers may have been cancelled before the call finished, in which case nothing else will retrieve
+    # this and asyncio would log it as never being retrieved.
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight(typing.Generic[KeyT, ValueT]):
+    """A table of in-flight calls which lets concurrent identical calls share one execution.
+
+    The call is run as its own task so cancelling one of the callers waiting on it won't cancel the call for the
+    others.
+    """
+
+    __slots__: typing.Sequence[str] = ("_calls",)
+
+    def __init__(self) -> None:
+        self._calls: typing.Dict[KeyT, asyncio.Task[ValueT]] = {}
+
+    def __contains__(self, key: typing.Any, /) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _remove(self, key: KeyT, task: asyncio.Task[ValueT], /) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        _consume_exception(task)
+
+    async def run(self, key: KeyT, callback: typing.Callable[[], typing.Awaitable[ValueT]], /) -> ValueT:
+        """Run a call or wait for the result of an identical call which is already running.
+
+        Parameters
+        ----------
+        key : KeyT
+            The key which identifies identical calls.
+        callback : typing.Callable[[], typing.Awaitable[ValueT]]
+            The callback to call if there isn't already a call running for this key.
+
+        Returns
+        -------
+        ValueT
+            The result of the shared call. Any exception raised by the call is raised for every caller.
+        """
+        if (task := self._calls.get(key)) is None:
+
+            async def call() -> ValueT:
+                return await callback()
+
+            task = asyncio.create_task(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._remove(key, done))
+
+        return await asyncio.shield(task)
@@ -0,0 +1,62 @@
+import time
+from unittest import mock
+
+import pytest
+
+from reinhard.util import cache
+
+
+class TestExpiringDict:
+    def test_items_on_lru_dict(self) -> None:
+        data = cache.ExpiringDict(100, lru=True)
+        data["a"] = 1
+        data["b"] = 2
+        data["c"] = 3
+
+        assert list(data.items()) == [("a", 1), ("b", 2), ("c", 3)]
+        assert list(data.values()) == [1, 2, 3]
+
+    def test_iteration_does_not_reorder_lru_dict(self) -> None:
+        data = cache.ExpiringDict(100, lru=True, max_length=2)
+        data["a"] = 1
+        data["b"] = 2
+        list(data.items())
+
+        data["c"] = 3
+
+        assert list(data) == ["b", "c"]
+
+    def test_read_reorders_lru_dict(self) -> None:
+        data = cache.ExpiringDict(100, lru=True, max_length=2)
+        data["a"] = 1
+        data["b"] = 2
+        assert data["a"] == 1
+
+        data["c"] = 3
+
+        assert list(data) == ["a", "c"]
+
+    def test_gc_drops_expired_entries_behind_recently_used_entries(self) -> None:
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            data = cache.ExpiringDict(10, lru=True)
+            data["a"] = 1
+            monotonic.return_value = 5.0
+            data["b"] = 2
+            # This moves "a" behind "b" in LRU order while "a" is still the first to expire.
+            assert data["a"] == 1
+
+            monotonic.return_value = 12.0
+
+            assert len(data) == 1
+            assert list(data.items()) == [("b", 2)]
+
+    def test_popitem(self) -> None:
+        data = cache.ExpiringDict(100, lru=True)
+        data["a"] = 1
+        data["b"] = 2
+        assert data["a"] == 1
+
+        assert data.popitem() == ("b", 2)
+        assert data.popitem() == ("a", 1)
+        with pytest.raises(KeyError):
+            data.popitem()
@@ -0,0 +1,42 @@
+import asyncio
+import pathlib
+
+from reinhard.util import disk_cache
+
+
+class TestDiskCache:
+    def test_set_enforces_max_bytes(self, tmp_path: pathlib.Path) -> None:
+        async def run() -> None:
+            cache = disk_cache.DiskCache(tmp_path / "cache.sqlite3", max_bytes=100)
+            await cache.open()
+            try:
+                for index in range(10):
+                    cache.set(str(index), index, size=30)
+
+                entries = await cache.load()
+
+            finally:
+                await cache.close()
+
+            assert [entry.key for entry in entries] == ["7", "8", "9"]
+            assert all(entry.size == 30 for entry in entries)
+
+        asyncio.run(run())
+
+    def test_set_drops_expired_entries(self, tmp_path: pathlib.Path) -> None:
+        async def run() -> None:
+            cache = disk_cache.DiskCache(tmp_path / "cache.sqlite3", expire_after=0)
+            await cache.open()
+            try:
+                cache.set("a", "b")
+                cache.set("c", "d")
+                await cache.load()
+                # Expired entries are filtered out by load so the table has to be checked directly.
+                count = cache._get_connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+            finally:
+                await cache.close()
+
+            assert count == 0
+
+        asyncio.run(run())
@@ -0,0 +1,28 @@
+import asyncio
+from unittest import mock
+
+from reinhard.components import external
+
+
+class TestYoutubePaginator:
+    def test_aclose_cancels_prefetch(self) -> None:
+        async def load_page(_: external.YoutubePaginator) -> None:
+            await asyncio.sleep(60)
+
+        async def run() -> None:
+            paginator = external.YoutubePaginator(mock.Mock(), {})
+            paginator.next_page_token = "a"
+            with mock.patch.object(external.YoutubePaginator, "_load_page", new=load_page):
+                paginator._maybe_prefetch()
+                prefetch = paginator._prefetch
+                assert prefetch is not None
+                await asyncio.sleep(0)
+
+                await paginator.aclose()
+
+            assert prefetch.cancelled()
+            assert paginator.next_page_token is None
+            paginator._maybe_prefetch()
+            assert paginator._prefetch is None
+
+        asyncio.run(run())
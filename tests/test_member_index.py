@@ -0,0 +1,28 @@
+import types
+
+from reinhard.util import member_index
+
+
+def _member(user_id: int, username: str, nickname: object = None) -> types.SimpleNamespace:
+    return types.SimpleNamespace(user=types.SimpleNamespace(id=user_id, username=username), nickname=nickname)
+
+
+class TestGuildMemberIndex:
+    def test_search_returns_ids(self) -> None:
+        index = member_index.GuildMemberIndex()
+        index.add(_member(1, "Reinhard"))  # type: ignore[arg-type]
+        index.add(_member(2, "Rein", "Lohengramm"))  # type: ignore[arg-type]
+
+        assert index.search("rein", limit=2) == [2, 1]
+        assert index.search("lohen") == [2]
+        assert index.search("reinhart", fuzzy=False) == []
+        assert index.search("reinhart") == [1]
+
+    def test_remove(self) -> None:
+        index = member_index.GuildMemberIndex()
+        index.add(_member(1, "Reinhard"))  # type: ignore[arg-type]
+
+        index.remove(1)  # type: ignore[arg-type]
+
+        assert 1 not in index
+        assert index.search("reinhard") == []
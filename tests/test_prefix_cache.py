@@ -0,0 +1,74 @@
+import asyncio
+import typing
+
+from reinhard.util import prefix_cache
+
+
+class _Connection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.listeners: typing.List[typing.Any] = []
+
+    async def add_listener(self, _: str, callback: typing.Any) -> None:
+        self.listeners.append(callback)
+
+    async def remove_listener(self, _: str, callback: typing.Any) -> None:
+        self.listeners.remove(callback)
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+
+class _Pool:
+    def __init__(self) -> None:
+        self.acquired: typing.List[_Connection] = []
+        self.released: typing.List[_Connection] = []
+
+    async def acquire(self) -> _Connection:
+        conn = _Connection()
+        self.acquired.append(conn)
+        return conn
+
+    async def release(self, conn: _Connection) -> None:
+        self.released.append(conn)
+
+
+class _PreparedScripts:
+    def __init__(self, records: typing.List[typing.Dict[str, typing.Any]]) -> None:
+        self.records = records
+
+    async def find_guild_prefixes(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        return self.records
+
+
+class _Scripts:
+    def __init__(self) -> None:
+        self.records = [{"guild_id": 123, "prefix": "a."}]
+
+    async def prepare(self, _: _Connection) -> _PreparedScripts:
+        return _PreparedScripts(self.records)
+
+
+class TestPrefixCache:
+    def test_check_connection_reloads_after_connection_lost(self) -> None:
+        async def run() -> None:
+            cache = prefix_cache.PrefixCache()
+            pool = _Pool()
+            scripts = _Scripts()
+            await cache.open(pool, scripts)  # type: ignore[arg-type]
+            cache.check_connection()
+            assert len(pool.acquired) == 1
+
+            scripts.records = [{"guild_id": 123, "prefix": "b."}]
+            pool.acquired[0].closed = True
+            cache.check_connection()
+            await asyncio.sleep(0)
+
+            assert len(pool.acquired) == 2
+            assert pool.released == [pool.acquired[0]]
+            assert cache.get(123) == "b."  # type: ignore[arg-type]
+
+            await cache.close()
+            assert pool.released == pool.acquired
+
+        asyncio.run(run())
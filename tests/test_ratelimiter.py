@@ -0,0 +1,113 @@
+import datetime
+import time
+from unittest import mock
+
+from reinhard.util import ratelimiter
+
+
+class _Message:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+class TestSimpleBucket:
+    def test_copy_tracks_level_separately(self) -> None:
+        bucket = ratelimiter.SimpleBucket(datetime.timedelta(seconds=60))
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            for content in ("a", "b", "c"):
+                bucket.add_call(ratelimiter.MessageCall(_Message(content)))  # type: ignore[arg-type]
+
+            copy = bucket.copy()
+            assert copy.level == bucket.level
+            copy.add_call(ratelimiter.MessageCall(_Message("d")))  # type: ignore[arg-type]
+
+            monotonic.return_value = 1000.0
+
+            assert copy.level == 0
+            assert bucket.level == 0
+            assert copy.calls == []
+            assert bucket.calls == []
+
+    def test_calls_is_a_snapshot(self) -> None:
+        bucket = ratelimiter.SimpleBucket(datetime.timedelta(seconds=60))
+        bucket.add_call(ratelimiter.MessageCall(_Message("a")))  # type: ignore[arg-type]
+        calls = bucket.calls
+
+        bucket.add_call(ratelimiter.MessageCall(_Message("b")))  # type: ignore[arg-type]
+
+        assert len(calls) == 1
+        assert len(bucket.calls) == 2
+
+
+class TestBucketPool:
+    def test_garbage_collect_sweeps_in_chunks(self) -> None:
+        rate = ratelimiter.GCRARate(5, datetime.timedelta(seconds=60))
+        pool = ratelimiter.BucketPool(
+            ratelimiter.Affinity.USER, datetime.timedelta(seconds=60), bucket_factory=rate.create_bucket
+        )
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            for entity in range(10):
+                pool.get_or_create_bucket(entity).add_call()  # type: ignore[arg-type, call-arg]
+
+            monotonic.return_value = 1000.0
+            pool.get_or_create_bucket(3).add_call()  # type: ignore[arg-type, call-arg]
+
+            assert pool.garbage_collect(max_buckets=4) == 3
+            assert pool.garbage_collect(max_buckets=4) == 4
+            assert pool.garbage_collect(max_buckets=4) == 2
+            assert list(pool.buckets) == [3]
+
+
+class TestComplexBucketPool:
+    def test_garbage_collect_drops_emptied_pools(self) -> None:
+        rate = ratelimiter.GCRARate(5, datetime.timedelta(seconds=60))
+        pools = ratelimiter.ComplexBucketPool(
+            ratelimiter.Affinity.USER, datetime.timedelta(seconds=60), bucket_factory=rate.create_bucket
+        )
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            for guild in range(3):
+                pool = pools.get_or_create_pool(guild)  # type: ignore[arg-type]
+                for entity in range(3):
+                    pool.get_or_create_bucket(entity).add_call()  # type: ignore[arg-type, call-arg]
+
+            monotonic.return_value = 1000.0
+
+            # The first pool and its 3 buckets are dropped then 1 bucket from the second pool.
+            assert pools.garbage_collect(max_buckets=4) == 5
+            assert len(pools.pools) == 2
+            assert pools.garbage_collect(max_buckets=100) == 7
+            assert not pools.pools
+
+
+class TestCompactGCRAPool:
+    def test_garbage_collect_sweeps_in_chunks(self) -> None:
+        pool = ratelimiter.CompactGCRAPool(ratelimiter.GCRARate(5, datetime.timedelta(seconds=60)), capacity=64)
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            for entity in range(1, 21):
+                pool.add_call(entity)  # type: ignore[arg-type]
+
+            monotonic.return_value = 1000.0
+            counts = [pool.garbage_collect(max_slots=16) for _ in range(4)]
+
+            assert sum(counts) == 20
+            assert pool.is_empty
+            # The sweep wraps back around to the start of the table.
+            assert pool.garbage_collect(max_slots=16) == 0
+
+    def test_add_call_shrinks_table_of_deleted_entries(self) -> None:
+        pool = ratelimiter.CompactGCRAPool(ratelimiter.GCRARate(5, datetime.timedelta(seconds=60)), capacity=256)
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            # Fill the table right up to its load limit.
+            for entity in range(1, 129):
+                pool.add_call(entity)  # type: ignore[arg-type]
+
+            assert pool.capacity == 256
+            monotonic.return_value = 1000.0
+            assert pool.garbage_collect(max_slots=256) == 128
+
+            pool.add_call(129)  # type: ignore[arg-type]
+
+            assert pool.capacity < 256
+            assert len(pool) == 1
+            assert 129 in pool
+            assert 1 not in pool
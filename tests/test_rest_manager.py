@@ -0,0 +1,29 @@
+import time
+from unittest import mock
+
+import pytest
+from tanjun import errors as tanjun_errors
+from yuyo import backoff
+
+from reinhard.util import rest_manager
+from reinhard.util import sessions
+
+
+class TestAIOHTTPStatusHandler:
+    def test_throttled_probe_does_not_close_circuit(self) -> None:
+        host = "throttled-probe.example.com"
+        breaker = rest_manager.get_circuit_breaker(host)
+        with mock.patch.object(time, "monotonic", return_value=0.0) as monotonic:
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+
+            monotonic.return_value = breaker.reset_timeout
+            assert breaker.state is rest_manager.CircuitState.HALF_OPEN
+
+            with pytest.raises(tanjun_errors.CommandError):
+                with rest_manager.AIOHTTPStatusHandler(backoff.Backoff(), host=host):
+                    raise sessions.ThrottledError(host, 60.0)
+
+            assert breaker.state is rest_manager.CircuitState.HALF_OPEN
+            # The probe was given back so the next request can claim it.
+            assert breaker.allow_request()
@@ -0,0 +1,37 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+from multidict import CIMultiDict
+from multidict import CIMultiDictProxy
+
+from reinhard.util import sessions
+
+
+class TestHostThrottle:
+    def test_acquire_when_rejected_does_not_extend_delay(self) -> None:
+        throttle = sessions.HostThrottle(max_delay=30.0)
+        with mock.patch.object(time, "monotonic", return_value=0.0):
+            # 2 requests left in a 60 second window paces requests 30 seconds apart.
+            headers = CIMultiDictProxy(CIMultiDict({"X-RateLimit-Remaining": "2", "X-RateLimit-Reset-After": "60"}))
+            throttle.update(200, headers)
+            assert throttle.reserve() == 0.0
+            assert throttle.reserve() == 30.0
+
+            for _ in range(10):
+                with pytest.raises(sessions.ThrottledError) as exc_info:
+                    asyncio.run(throttle.acquire("example.com"))
+
+                assert exc_info.value.retry_after == 60.0
+
+    def test_reserve_with_max_delay_only_reserves_allowed_slots(self) -> None:
+        throttle = sessions.HostThrottle()
+        with mock.patch.object(time, "monotonic", return_value=0.0):
+            headers = CIMultiDictProxy(CIMultiDict({"X-RateLimit-Remaining": "1", "X-RateLimit-Reset-After": "10"}))
+            throttle.update(200, headers)
+            assert throttle.reserve(max_delay=5.0) == 0.0
+            assert throttle.reserve(max_delay=5.0) == 10.0
+            assert throttle.reserve(max_delay=5.0) == 10.0
+            assert throttle.reserve() == 10.0
+            assert throttle.reserve() == 20.0
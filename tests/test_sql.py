@@ -0,0 +1,43 @@
+import asyncio
+import typing
+from unittest import mock
+
+import pytest
+
+from reinhard import sql
+
+
+class _Proxy:
+    # A stand-in for asyncpg's pool connection proxy which forwards attribute access.
+    def __init__(self, conn: typing.Any) -> None:
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self._conn, name)
+
+
+class TestCachedScripts:
+    def test_prepare_uses_scripts_attached_by_init_connection(self) -> None:
+        async def prepare(_: sql.ScriptConnection, script: str) -> str:
+            return f"prepared {script}"
+
+        async def run() -> None:
+            scripts = sql.CachedScripts(root_dir=None)
+            scripts.scripts.update({"find_guild_prefixes": "SELECT 1;", "schema": "CREATE ...;"})
+            conn = sql.ScriptConnection.__new__(sql.ScriptConnection)
+            conn.prepared_scripts = None
+            # This stops asyncpg's finaliser from trying to close the connection.
+            conn._aborted = True  # type: ignore[attr-defined]
+            with mock.patch.object(sql.ScriptConnection, "prepare", new=prepare):
+                await scripts.init_connection(conn)
+
+            prepared = await scripts.prepare(_Proxy(conn))  # type: ignore[arg-type]
+
+            assert prepared is conn.prepared_scripts
+            assert prepared._statements == {"find_guild_prefixes": "prepared SELECT 1;"}
+
+        asyncio.run(run())
+
+    def test_init_connection_rejects_other_connections(self) -> None:
+        with pytest.raises(TypeError):
+            asyncio.run(sql.CachedScripts(root_dir=None).init_connection(mock.Mock()))